@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cohort analytics throughput and memory.
+
+Writes a synthetic cohort of progress files (one seat directory per
+learner, like files collected after a class) and streams them through
+cyoa.analytics with plain Python and with NumPy aggregation. Reports
+files/second and peak traced memory for cohorts of growing size, which
+should stay flat.
+
+Run with: python benchmarks/bench_analytics.py [--learners N]
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cyoa.analytics import analyze, np
+from cyoa.index import ContentIndex
+from cyoa.scenarios.registry import load_all
+
+
+def synthetic_document(rng: random.Random, exercises) -> dict:
+    """A progress document for a learner who got part way through the course."""
+    data = {"session_id": "bench", "created": "", "last_updated": "", "exercises": {}}
+    for exercise in exercises[:rng.randint(1, len(exercises))]:
+        ex = data["exercises"][exercise.id] = {
+            "exercise_id": exercise.id, "started": True, "completed": True, "scenarios": {}
+        }
+        for scenario in exercise.scenarios:
+            answered = rng.randint(0, len(scenario.questions))
+            sc = ex["scenarios"][scenario.id] = {
+                "scenario_id": scenario.id, "started": True,
+                "completed": answered == len(scenario.questions), "questions": {}
+            }
+            ex["completed"] = ex["completed"] and sc["completed"]
+            for question in scenario.questions[:answered]:
+                correct = rng.random() < 0.7
+                sc["questions"][question.id] = {
+                    "question_id": question.id, "answered": True, "correct": correct,
+                    "score": question.points if correct else rng.random() * question.points,
+                    "attempts": rng.randint(1, 3), "user_answer": "A", "timestamp": ""
+                }
+    return data
+
+
+def write_cohort(root: str, learners: int, exercises):
+    rng = random.Random(42)
+    for n in range(learners):
+        seat = os.path.join(root, f"seat{n:05d}")
+        os.makedirs(seat)
+        with open(os.path.join(seat, "progress.json"), 'w') as f:
+            json.dump(synthetic_document(rng, exercises), f)
+
+
+def run(root: str, index: ContentIndex, use_numpy: bool):
+    tracemalloc.start()
+    start = time.perf_counter()
+    report = analyze(root, index=index, use_numpy=use_numpy)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return report, report["files"] / elapsed, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--learners", type=int, default=2000,
+                        help="learners in the largest cohort (default: 2000)")
+    args = parser.parse_args()
+
+    exercises = load_all()
+    index = ContentIndex(exercises)
+    modes = [("python", False)] + ([("numpy", True)] if np is not None else [])
+
+    print(f"{'learners':>8} {'mode':<7} {'files/sec':>10} {'peak KiB':>9}")
+    for learners in (args.learners // 4, args.learners):
+        root = tempfile.mkdtemp()
+        try:
+            write_cohort(root, learners, exercises)
+            reports = []
+            for label, use_numpy in modes:
+                report, rate, peak = run(root, index, use_numpy)
+                reports.append(report)
+                print(f"{learners:>8} {label:<7} {rate:>10.0f} {peak:>9.0f}")
+            for report in reports[1:]:
+                for ex_id, ex in report["exercises"].items():
+                    assert abs(ex["mean_score"] - reports[0]["exercises"][ex_id]["mean_score"]) < 1e-9
+        finally:
+            shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
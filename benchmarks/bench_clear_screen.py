@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cost of clearing and redrawing the screen.
+
+Compares the old os.system('clear') call with the in-process ANSI
+controller, then counts bytes sent per question screen for full
+repaints versus differential redraws (header and scenario text are
+left in place when only the question changes).
+
+Run with: python benchmarks/bench_clear_screen.py [--spawns N]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cyoa import ui
+from cyoa.engine import GameEngine
+from cyoa.feedback import display_feedback
+from cyoa.render import AnsiRenderer
+from cyoa.scenarios import (
+    get_exercise1,
+    get_exercise2,
+    get_exercise3,
+    get_exercise4,
+    get_exercise5,
+)
+
+
+class DevNullRenderer(AnsiRenderer):
+    """ANSI renderer for a fixed-size terminal that writes to /dev/null."""
+
+    def __init__(self, differential: bool, columns: int = 100, rows: int = 60):
+        super().__init__(differential=differential)
+        self.columns = columns
+        self.rows = rows
+        self.fd = os.open(os.devnull, os.O_WRONLY)
+        self.bytes = 0
+
+    def size(self):
+        return self.columns, self.rows
+
+    def emit(self, frame: str):
+        data = frame.encode("utf-8")
+        os.write(self.fd, data)
+        self.bytes += len(data)
+
+
+def time_clear_spawn(spawns: int) -> float:
+    """Seconds per os.system('clear') with output discarded."""
+    start = time.perf_counter()
+    for _ in range(spawns):
+        os.system("clear > /dev/null 2>&1")
+    return (time.perf_counter() - start) / spawns
+
+
+def time_clear_ansi(clears: int) -> float:
+    """Seconds per in-process clear and redraw of a one-line screen."""
+    renderer = DevNullRenderer(differential=False)
+    start = time.perf_counter()
+    for _ in range(clears):
+        renderer.clear()
+        renderer.write("> ")
+        renderer.flush()
+    return (time.perf_counter() - start) / clears
+
+
+def redraw_bytes(differential: bool, exercises) -> dict:
+    """Bytes written per screen while answering every question once."""
+    renderer = DevNullRenderer(differential=differential)
+    token = ui.current_io.set(ui.TerminalIO(renderer))
+    try:
+        engine = GameEngine(data_dir=os.devnull)
+        screens = 0
+        start = time.perf_counter()
+        for exercise in exercises:
+            for scenario in exercise.scenarios:
+                for number, question in enumerate(scenario.questions, 1):
+                    engine.render_question(exercise, scenario, question, number)
+                    renderer.write("Your answer: ")
+                    renderer.flush()
+                    renderer.echo("A\n")
+                    display_feedback(False, 1, question.feedback_incorrect, question.model_answer)
+                    renderer.flush()
+                    screens += 1
+        elapsed = time.perf_counter() - start
+    finally:
+        ui.current_io.reset(token)
+
+    return {
+        "bytes_per_screen": renderer.bytes / screens,
+        "us_per_screen": elapsed / screens * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--spawns", type=int, default=50,
+                        help="os.system('clear') calls to time (default: 50)")
+    args = parser.parse_args()
+
+    print("Clearing the screen")
+    if os.name != "nt" and shutil.which("clear"):
+        print(f"  os.system('clear'): {time_clear_spawn(args.spawns) * 1e6:10.1f} us")
+    else:
+        print("  os.system('clear'): (clear not available)")
+    print(f"  ANSI in-process:    {time_clear_ansi(10000) * 1e6:10.1f} us")
+    print()
+
+    exercises = [get_exercise1(), get_exercise2(), get_exercise3(),
+                 get_exercise4(), get_exercise5()]
+
+    print("Redrawing question screens (100x60 terminal)")
+    for label, differential in (("full repaint", False), ("differential", True)):
+        result = redraw_bytes(differential, exercises)
+        print(
+            f"  {label:<13} {result['bytes_per_screen']:8.0f} bytes/screen "
+            f"{result['us_per_screen']:8.1f} us/screen"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark: loading JSON content with and without the compiled cache.
+
+Exports the built-in exercises, copies them into banks of increasing
+size, and times:
+
+  parse all   json.load + build every Exercise (no cache)
+  compile     first start: parse everything and write the cache
+  warm start  later start: read the cache header for the manifest
+  enter one   unpickle a single exercise from the cache
+
+Run with: python benchmarks/bench_content.py [--sizes 5,50,500]
+"""
+
+import argparse
+import copy
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cyoa.content import ContentLibrary, exercise_from_dict, exercise_to_dict
+from cyoa.scenarios.registry import load_all
+
+
+def make_bank(directory: str, size: int, templates):
+    """Write `size` exercise files cycling through the built-in exercises."""
+    for n in range(size):
+        data = copy.deepcopy(templates[n % len(templates)])
+        data["id"] = f"bank{n:05d}"
+        data["number"] = n + 1
+        with open(os.path.join(directory, f"bank{n:05d}.json"), 'w') as f:
+            json.dump(data, f)
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1e3
+
+
+def parse_all(directory: str):
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".json"):
+            with open(os.path.join(directory, name)) as f:
+                exercise_from_dict(json.load(f))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="5,50,500",
+                        help="comma-separated exercise counts (default: 5,50,500)")
+    args = parser.parse_args()
+
+    templates = [exercise_to_dict(exercise) for exercise in load_all()]
+
+    print(f"{'exercises':>10} {'parse all':>10} {'compile':>10} {'warm start':>11} {'enter one':>10}  (ms)")
+    for size in (int(s) for s in args.sizes.split(",")):
+        with tempfile.TemporaryDirectory() as directory:
+            make_bank(directory, size, templates)
+
+            parse = timed(lambda: parse_all(directory))
+            compile_ms = timed(lambda: ContentLibrary(directory).manifest())
+
+            library = ContentLibrary(directory)
+            warm = timed(library.manifest)
+            enter = timed(lambda: library.load("bank00000"))
+
+            print(f"{size:>10} {parse:>10.1f} {compile_ms:>10.1f} {warm:>11.1f} {enter:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark: regrading a cohort's answers per answer vs with grade_batch.
+
+Generates random answers to one multiple-choice, checklist and ranking
+question from the exercises and grades them with evaluate_answer one at
+a time, then with grade_batch (pure Python, and NumPy if installed).
+
+Run with: python benchmarks/bench_grade_batch.py [--answers N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cyoa.feedback import evaluate_answer
+from cyoa.grading import grade_batch, numpy_available
+from cyoa.scenarios import get_exercise1, get_exercise2, get_exercise3, get_exercise4, get_exercise5
+from cyoa.scenarios.base import MultipleChoiceQuestion, ChecklistQuestion, RankingQuestion
+
+
+def random_answer(rng: random.Random, question):
+    """A plausible answer to a question."""
+    if isinstance(question, MultipleChoiceQuestion):
+        return rng.choice(question.options)[0]
+    if isinstance(question, ChecklistQuestion):
+        keys = [key for key, _ in question.options]
+        return rng.sample(keys, rng.randint(1, len(keys)))
+    return rng.sample(range(1, len(question.items) + 1), question.num_ranks)
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--answers", type=int, default=50000,
+                        help="answers per question (default: 50000)")
+    args = parser.parse_args()
+
+    questions = {}
+    for exercise in (get_exercise1(), get_exercise2(), get_exercise3(),
+                     get_exercise4(), get_exercise5()):
+        for scenario in exercise.scenarios:
+            for question in scenario.questions:
+                questions.setdefault(type(question), question)
+
+    rng = random.Random(42)
+    print(f"{args.answers} answers per question")
+    print(f"{'question':<24} {'per-answer':>12} {'batch':>10} {'batch+numpy':>13}  (ms)")
+    for kind in (MultipleChoiceQuestion, ChecklistQuestion, RankingQuestion):
+        question = questions.get(kind)
+        if question is None:
+            continue
+        answers = [random_answer(rng, question) for _ in range(args.answers)]
+
+        single = timed(lambda: [evaluate_answer(question, answer) for answer in answers])
+        batch = timed(lambda: grade_batch(question, answers, use_numpy=False))
+        if numpy_available():
+            vectorized = f"{timed(lambda: grade_batch(question, answers, use_numpy=True)) * 1e3:>13.1f}"
+        else:
+            vectorized = f"{'(no numpy)':>13}"
+
+        print(f"{kind.__name__:<24} {single * 1e3:>12.1f} {batch * 1e3:>10.1f} {vectorized}")
+
+
+if __name__ == "__main__":
+    main()
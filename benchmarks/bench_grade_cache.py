@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark: grading and feedback cache for repeated answers.
+
+Simulates a class answering every question, with answers skewed towards
+a few popular choices, and times evaluate_answer plus display_feedback
+with the cache cleared before every answer (no reuse) and left warm.
+
+Run with: python benchmarks/bench_grade_cache.py [--learners N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cyoa import ui
+from cyoa.feedback import clear_grade_cache, display_feedback, evaluate_answer, grade_cache_info
+from cyoa.render import NullRenderer
+from cyoa.scenarios import get_exercise1, get_exercise2, get_exercise3, get_exercise4, get_exercise5
+from cyoa.scenarios.base import MultipleChoiceQuestion, ChecklistQuestion, RankingQuestion
+
+
+def popular_answer(rng: random.Random, question):
+    """An answer drawn mostly from a handful of common responses."""
+    if isinstance(question, MultipleChoiceQuestion):
+        keys = [key for key, _ in question.options]
+        return rng.choices(keys, weights=range(len(keys), 0, -1))[0]
+    if isinstance(question, ChecklistQuestion):
+        if rng.random() < 0.6:
+            return question.correct_mask
+        keys = [key for key, _ in question.options]
+        return question.mask_of(rng.sample(keys, rng.randint(1, 3)))[0]
+    if rng.random() < 0.6:
+        return list(question.correct_answer)
+    return rng.sample(range(1, len(question.items) + 1), question.num_ranks)
+
+
+def run(answers, warm: bool) -> float:
+    """Grade and show feedback for every answer; returns µs per answer."""
+    clear_grade_cache()
+    start = time.perf_counter()
+    for question, answer in answers:
+        if not warm:
+            clear_grade_cache()
+        is_correct, score, feedback = evaluate_answer(question, answer)
+        display_feedback(is_correct, score, feedback, question.model_answer)
+        ui.flush()
+    return (time.perf_counter() - start) / len(answers) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--learners", type=int, default=200,
+                        help="learners in the class (default: 200)")
+    args = parser.parse_args()
+
+    questions = [
+        question
+        for exercise in (get_exercise1(), get_exercise2(), get_exercise3(),
+                         get_exercise4(), get_exercise5())
+        for scenario in exercise.scenarios
+        for question in scenario.questions
+        if isinstance(question, (MultipleChoiceQuestion, ChecklistQuestion, RankingQuestion))
+    ]
+    rng = random.Random(42)
+    answers = [
+        (question, popular_answer(rng, question))
+        for _ in range(args.learners)
+        for question in questions
+    ]
+
+    ui.current_io.set(ui.TerminalIO(NullRenderer()))
+    cold = run(answers, warm=False)
+    warm = run(answers, warm=True)
+    info = grade_cache_info()
+
+    print(f"{len(answers)} answers from {args.learners} learners")
+    print(f"  no reuse: {cold:8.1f} us/answer")
+    print(f"  cached:   {warm:8.1f} us/answer ({cold / warm:.1f}x)")
+    for name, stats in info.items():
+        print(f"  {name:<7} hit rate {stats['hit_rate']:6.1%} "
+              f"({stats['hits']} hits, {stats['misses']} misses, {stats['size']} entries)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark: content index lookups versus scans of the exercise tree.
+
+Times finding a question's exercise and scenario by id, and an
+exercise's point total, by walking the exercises as the engine and
+batch runner used to and through a ContentIndex. The content can be
+replicated to mimic a larger course.
+
+Run with: python benchmarks/bench_index.py [--copies N] [--lookups N]
+"""
+
+import argparse
+import copy
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cyoa.index import ContentIndex
+from cyoa.scenarios.registry import load_all
+
+
+def replicate(exercises, copies: int):
+    """Copies of the exercises with distinct exercise and question ids."""
+    result = []
+    for n in range(copies):
+        for exercise in exercises:
+            clone = copy.deepcopy(exercise)
+            clone.id = f"{exercise.id}-{n}"
+            clone.number = exercise.number + n * len(exercises)
+            for scenario in clone.scenarios:
+                for question in scenario.questions:
+                    question.id = f"{question.id}-{n}"
+            result.append(clone)
+    return result
+
+
+def scan_locate(exercises, question_id: str):
+    for exercise in exercises:
+        for scenario in exercise.scenarios:
+            for question in scenario.questions:
+                if question.id == question_id:
+                    return exercise, scenario, question
+    raise KeyError(question_id)
+
+
+def timed(fn, items) -> float:
+    """Call fn on every item; returns µs per call."""
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    return (time.perf_counter() - start) / len(items) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--copies", type=int, default=20,
+                        help="copies of the bundled exercises (default: 20)")
+    parser.add_argument("--lookups", type=int, default=20000,
+                        help="lookups to time (default: 20000)")
+    args = parser.parse_args()
+
+    exercises = replicate(load_all(), args.copies)
+    by_id = {exercise.id: exercise for exercise in exercises}
+    question_ids = [q.id for e in exercises for s in e.scenarios for q in s.questions]
+
+    start = time.perf_counter()
+    index = ContentIndex(exercises)
+    build = (time.perf_counter() - start) * 1e3
+
+    rng = random.Random(42)
+    lookups = [rng.choice(question_ids) for _ in range(args.lookups)]
+    exercise_ids = [rng.choice(list(by_id)) for _ in range(args.lookups)]
+
+    for question_id in lookups[:100]:
+        assert scan_locate(exercises, question_id)[2] is index.question(question_id)
+    for exercise_id in exercise_ids[:100]:
+        assert by_id[exercise_id].get_total_points() == index.exercise_points(exercise_id)
+
+    print(f"{len(exercises)} exercises, {len(question_ids)} questions "
+          f"(index built in {build:.2f} ms)")
+    scan = timed(lambda qid: scan_locate(exercises, qid), lookups)
+    indexed = timed(index.locate, lookups)
+    print(f"  locate question  scan {scan:8.2f} us  index {indexed:6.3f} us ({scan / indexed:.0f}x)")
+    summed = timed(lambda eid: by_id[eid].get_total_points(), exercise_ids)
+    indexed = timed(index.exercise_points, exercise_ids)
+    print(f"  exercise points  sum  {summed:8.2f} us  index {indexed:6.3f} us ({summed / indexed:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark: item analysis for a large cohort.
+
+Fills an ItemMatrix with simulated learners of varying ability (a
+block of distinct learners, repeated to reach the cohort size) and
+times analyze_items with NumPy and with plain Python loops, checking
+that both agree.
+
+Run with: python benchmarks/bench_items.py [--learners N] [--skip-python]
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cyoa.index import ContentIndex
+from cyoa.items import ItemMatrix, analyze_items, np
+from cyoa.scenarios.base import MultipleChoiceQuestion, ChecklistQuestion
+from cyoa.scenarios.registry import load_all
+
+
+def simulate(matrix: ItemMatrix, learners: int, rng: random.Random):
+    """Add learners who answer correctly with probability equal to their ability."""
+    for _ in range(learners):
+        row = matrix.new_learner()
+        ability = rng.random()
+        for question in matrix.questions:
+            if rng.random() < 0.1:
+                continue
+            right = rng.random() < ability
+            if isinstance(question, MultipleChoiceQuestion):
+                answer = question.correct_answer if right else rng.choice(question.options)[0]
+                score = question.points if answer == question.correct_answer else 0
+            elif isinstance(question, ChecklistQuestion):
+                answer = question.correct_mask if right else rng.randrange(1, question.options_mask + 1)
+                score = question.check_answer(answer)[1]
+            else:
+                answer = None
+                score = question.points * (ability + rng.random()) / 2
+            matrix.record(row, question.id, score, answer)
+
+
+def same(a, b) -> bool:
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(same(a[k], b[k]) for k in a)
+    if a is None or b is None:
+        return a is b
+    return math.isclose(a, b, rel_tol=1e-6, abs_tol=1e-9)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--learners", type=int, default=100000,
+                        help="learners in the cohort (default: 100000)")
+    parser.add_argument("--skip-python", action="store_true",
+                        help="only time the NumPy path")
+    args = parser.parse_args()
+
+    matrix = ItemMatrix(ContentIndex(load_all()))
+    block = min(args.learners, 5000)
+    start = time.perf_counter()
+    simulate(matrix, block, random.Random(42))
+    fill = time.perf_counter() - start
+    repeats, extra = divmod(args.learners, block)
+    width = len(matrix.questions)
+    matrix.scores = matrix.scores * repeats + matrix.scores[:extra * width]
+    matrix.choices = matrix.choices * repeats + matrix.choices[:extra * width]
+    matrix.learners = args.learners
+
+    print(f"{matrix.learners} learners x {width} questions "
+          f"(recording answers: {fill / (block * width) * 1e6:.2f} us each)")
+
+    results = {}
+    for label, use_numpy in (("numpy", True), ("python", False)):
+        if use_numpy and np is None:
+            print("  numpy   not installed")
+            continue
+        if not use_numpy and args.skip_python:
+            continue
+        start = time.perf_counter()
+        results[label] = analyze_items(matrix, use_numpy=use_numpy)
+        print(f"  {label:<7} {time.perf_counter() - start:8.2f} s")
+
+    if len(results) == 2:
+        assert all(same(results["numpy"][q], results["python"][q]) for q in results["numpy"])
+        print("  results agree")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark: keyword matching for free-text answers.
+
+Compares the old per-keyword scan (a substring test, then a fresh regex
+for each miss) with the compiled KeywordMatcher, which finds every
+keyword in one pass over the answer.
+
+Run with: python benchmarks/bench_keywords.py [--essays N]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cyoa.keywords import KeywordMatcher
+
+
+WORDS = (
+    "attacker network firewall patch phishing credential server backup "
+    "incident response alert endpoint vulnerability exploit malware log "
+    "policy user access control segmentation monitoring review the a of "
+    "and to in with for is that on as risk asset threat detection"
+).split()
+
+KEYWORDS = [
+    "multi-factor authentication", "least privilege", "network segmentation",
+    "incident response plan", "patch management", "encryption at rest",
+    "security awareness training", "zero trust", "defense in depth",
+    "threat intelligence", "vulnerability scanning", "access review",
+    "backup verification", "log retention", "endpoint detection",
+    "data classification", "tabletop exercise", "change management",
+    "vendor risk", "privileged access", "phishing simulation",
+    "key rotation", "asset inventory", "configuration baseline",
+]
+
+
+def make_essay(rng: random.Random, words: int) -> str:
+    """Random essay mentioning a few of the keywords."""
+    text = [rng.choice(WORDS) for _ in range(words)]
+    for keyword in rng.sample(KEYWORDS, 6):
+        text.insert(rng.randrange(len(text)), keyword)
+    return " ".join(text)
+
+
+def old_keyword_match(text: str, keywords) -> int:
+    """The previous keyword_match_score loop."""
+    text_lower = text.lower()
+    found = 0
+    for keyword in keywords:
+        kw_lower = keyword.lower()
+        if kw_lower in text_lower:
+            found += 1
+        elif re.search(r'\b' + re.escape(kw_lower) + r'\b', text_lower):
+            found += 1
+    return found
+
+
+def time_per_essay(func, essays) -> float:
+    start = time.perf_counter()
+    for essay in essays:
+        func(essay)
+    return (time.perf_counter() - start) / len(essays) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--essays", type=int, default=200,
+                        help="essays per length (default: 200)")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    matcher = KeywordMatcher(KEYWORDS)
+    word_matcher = KeywordMatcher(KEYWORDS, whole_words=True)
+
+    print(f"{len(KEYWORDS)} keywords, {args.essays} essays per length")
+    print(f"{'words':>7} {'per-keyword':>13} {'matcher':>10} {'whole words':>13}  (us/essay)")
+    for words in (50, 500, 5000):
+        essays = [make_essay(rng, words) for _ in range(args.essays)]
+        for essay in essays[:20]:
+            assert len(matcher.find(essay)) == old_keyword_match(essay, KEYWORDS)
+
+        old = time_per_essay(lambda e: old_keyword_match(e, KEYWORDS), essays)
+        new = time_per_essay(matcher.find, essays)
+        whole = time_per_essay(word_matcher.find, essays)
+        print(f"{words:>7} {old:>13.1f} {new:>10.1f} {whole:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark: latency sketches versus keeping every sample.
+
+Simulates think times (log-normal, seconds to minutes) for every
+question across a cohort of seats. Each seat keeps its own
+LatencyStats; the seats are then merged. Compares the merged p50, p95
+and p99 with exact quantiles of all samples, and reports sketch size,
+cost per recorded timing and merge time.
+
+Run with: python benchmarks/bench_latency.py [--seats N] [--answers N]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cyoa.latency import LatencyStats
+from cyoa.scenarios.registry import load_all
+
+
+def exact_quantile(samples, q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seats", type=int, default=500,
+                        help="seats in the cohort (default: 500)")
+    parser.add_argument("--answers", type=int, default=3,
+                        help="attempts per question per seat (default: 3)")
+    args = parser.parse_args()
+
+    question_ids = [q.id for e in load_all() for s in e.scenarios for q in s.questions]
+    rng = random.Random(42)
+    # Some questions take longer than others
+    medians = {qid: rng.uniform(10, 90) for qid in question_ids}
+
+    samples = {qid: [] for qid in question_ids}
+    seats = []
+    recorded = 0
+    record_time = 0.0
+    for _ in range(args.seats):
+        stats = LatencyStats()
+        for qid in question_ids:
+            for _ in range(args.answers):
+                value = rng.lognormvariate(0, 0.8) * medians[qid]
+                samples[qid].append(value)
+                start = time.perf_counter()
+                stats.add(qid, "think", value)
+                record_time += time.perf_counter() - start
+                recorded += 1
+        seats.append(stats)
+
+    start = time.perf_counter()
+    cohort = LatencyStats()
+    for stats in seats:
+        cohort.merge(LatencyStats.from_dict(json.loads(json.dumps(stats.to_dict()))))
+    merge_time = time.perf_counter() - start
+
+    worst = {0.5: 0.0, 0.95: 0.0, 0.99: 0.0}
+    for qid in question_ids:
+        sketch = cohort.sketches[(qid, "think")]
+        for q in worst:
+            exact = exact_quantile(samples[qid], q)
+            worst[q] = max(worst[q], abs(sketch.quantile(q) - exact) / exact)
+
+    seat_bytes = sum(len(json.dumps(s.to_dict())) for s in seats) / len(seats)
+    cohort_bytes = len(json.dumps(cohort.to_dict()))
+    raw_bytes = len(json.dumps(samples))
+
+    print(f"{args.seats} seats x {len(question_ids)} questions x {args.answers} attempts "
+          f"= {recorded} timings")
+    print(f"  record:  {record_time / recorded * 1e6:.2f} us per timing")
+    print(f"  merge:   {merge_time * 1e3:.1f} ms for all seats (including JSON round trip)")
+    print(f"  size:    {seat_bytes / 1024:.1f} KiB per seat, {cohort_bytes / 1024:.1f} KiB merged, "
+          f"{raw_bytes / 1024:.0f} KiB of raw samples")
+    for q, error in worst.items():
+        print(f"  p{q * 100:g}: worst relative error {error:.2%} across questions")
+
+
+if __name__ == "__main__":
+    main()
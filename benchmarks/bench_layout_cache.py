@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark: layout cache for wrap_text, print_box and print_model_answer.
+
+Renders every question screen and its feedback for a number of
+simulated sessions, once with the layout cache cleared before every
+screen (the old behaviour) and once with it shared across sessions, as
+in server mode.
+
+Run with: python benchmarks/bench_layout_cache.py [--sessions N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cyoa import ui
+from cyoa.engine import GameEngine
+from cyoa.feedback import display_feedback
+from cyoa.render import NullRenderer
+from cyoa.scenarios import (
+    get_exercise1,
+    get_exercise2,
+    get_exercise3,
+    get_exercise4,
+    get_exercise5,
+)
+
+
+def render_sessions(sessions: int, exercises, cached: bool) -> float:
+    """Render every screen once per session; returns µs per screen."""
+    ui.clear_layout_cache()
+    engine = GameEngine(data_dir=os.devnull)
+    screens = 0
+
+    start = time.perf_counter()
+    for _ in range(sessions):
+        for exercise in exercises:
+            for scenario in exercise.scenarios:
+                for number, question in enumerate(scenario.questions, 1):
+                    if not cached:
+                        ui.clear_layout_cache()
+                    engine.render_question(exercise, scenario, question, number)
+                    display_feedback(False, 1, question.feedback_incorrect, question.model_answer)
+                    ui.flush()
+                    screens += 1
+    return (time.perf_counter() - start) / screens * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=20,
+                        help="simulated sessions (default: 20)")
+    args = parser.parse_args()
+
+    exercises = [get_exercise1(), get_exercise2(), get_exercise3(),
+                 get_exercise4(), get_exercise5()]
+    ui.current_io.set(ui.TerminalIO(NullRenderer()))
+    ui.install_resize_handler()  # cache the width, as main() does
+
+    uncached = render_sessions(args.sessions, exercises, cached=False)
+    cached = render_sessions(args.sessions, exercises, cached=True)
+    info = ui.layout_cache_info()
+
+    print(f"Sessions: {args.sessions}")
+    print(f"  no cache:     {uncached:8.1f} us/screen")
+    print(f"  layout cache: {cached:8.1f} us/screen ({uncached / cached:.1f}x)")
+    print(f"  hit rate:     {info['hit_rate']:8.1%} ({info['hits']} hits, "
+          f"{info['misses']} misses, {info['size']} layouts)")
+
+
+if __name__ == "__main__":
+    main()
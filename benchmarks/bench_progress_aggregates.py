@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark: progress summaries with maintained vs recomputed aggregates.
+
+Builds a synthetic session with ~10k answered questions and times the
+summary reads used by the exercise and progress menus, against a full
+recomputation of the same counters (the cost every read used to pay).
+
+Run with: python benchmarks/bench_progress_aggregates.py [--questions N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cyoa.progress import ProgressManager, check_aggregates
+from cyoa.storage import ProgressStore
+
+
+class NullStore(ProgressStore):
+    """Store that persists nothing, so only in-memory work is timed."""
+
+    def load(self):
+        return None
+
+    def save(self, data):
+        pass
+
+    def reset(self):
+        pass
+
+    def write_changes(self, session_id, changes, snapshot):
+        pass
+
+
+def build_session(questions: int) -> ProgressManager:
+    """Answer `questions` questions spread over 5 exercises."""
+    manager = ProgressManager(tempfile.gettempdir(), store=NullStore())
+    manager.new_session()
+
+    per_scenario = 50
+    scenarios = max(1, questions // per_scenario)
+    for n in range(scenarios):
+        ex_id = f"exercise{n % 5 + 1}"
+        sc_id = f"sc{n}"
+        for q in range(per_scenario):
+            manager.record_answer(ex_id, sc_id, f"{sc_id}_q{q}", "A", q % 3 == 0, q % 4)
+        manager.mark_scenario_complete(ex_id, sc_id)
+
+    check_aggregates(manager.session)
+    return manager
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--questions", type=int, default=10000,
+                        help="answered questions in the session (default: 10000)")
+    parser.add_argument("--number", type=int, default=200,
+                        help="timed repetitions (default: 200)")
+    args = parser.parse_args()
+
+    manager = build_session(args.questions)
+    session = manager.session
+
+    def menu_redraw():
+        session.get_overall_completion()
+        for ex in session.exercises.values():
+            ex.get_completion_pct()
+            ex.get_score()
+
+    maintained = timeit.timeit(menu_redraw, number=args.number) / args.number
+    recomputed = timeit.timeit(
+        lambda: (session.recompute_aggregates(), menu_redraw()), number=args.number
+    ) / args.number
+
+    print(f"session questions: {session.question_count}")
+    print(f"maintained counters: {maintained * 1e6:10.1f} us per menu redraw")
+    print(f"full recomputation:  {recomputed * 1e6:10.1f} us per menu redraw")
+    print(f"speedup:             {recomputed / maintained:10.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-answer persistence cost, snapshot vs journal.
+
+Answers every question of all five exercises through
+ProgressManager.record_answer and reports the mean write latency and
+bytes written per answer for the default full-snapshot mode and the
+append-only journal mode.
+
+Run with: python benchmarks/bench_progress_journal.py [--rounds N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cyoa.progress import ProgressManager
+from cyoa.scenarios import (
+    get_exercise1,
+    get_exercise2,
+    get_exercise3,
+    get_exercise4,
+    get_exercise5,
+)
+
+
+def all_questions():
+    """Yield (exercise_id, scenario_id, question) for every question."""
+    for get_exercise in (get_exercise1, get_exercise2, get_exercise3,
+                         get_exercise4, get_exercise5):
+        exercise = get_exercise()
+        for scenario in exercise.scenarios:
+            for question in scenario.questions:
+                yield exercise.id, scenario.id, question
+
+
+def dir_bytes(path: str) -> int:
+    """Total size of the progress snapshot and journal in a directory."""
+    # The previous-generation .bak file is renamed, not written
+    return sum(
+        os.path.getsize(os.path.join(path, name))
+        for name in os.listdir(path)
+        if not name.endswith(".bak")
+    )
+
+
+def run(journal: bool, rounds: int) -> dict:
+    """Answer every question `rounds` times and measure persistence cost."""
+    questions = list(all_questions())
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        manager = ProgressManager(data_dir, journal=journal)
+        manager.new_session()
+        manager.save_session()
+
+        elapsed = 0.0
+        written = 0
+        answers = 0
+        for _ in range(rounds):
+            for ex_id, sc_id, question in questions:
+                before = dir_bytes(data_dir)
+                start = time.perf_counter()
+                manager.record_answer(
+                    ex_id, sc_id, question.id, "A", True, question.points
+                )
+                elapsed += time.perf_counter() - start
+                after = dir_bytes(data_dir)
+                if journal and after >= before:
+                    written += after - before  # appended record
+                else:
+                    written += after  # full snapshot rewrite
+                answers += 1
+
+    return {
+        "answers": answers,
+        "latency_us": elapsed / answers * 1e6,
+        "bytes_per_answer": written / answers,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=5,
+                        help="times to answer every question (default: 5)")
+    args = parser.parse_args()
+
+    print(f"{'mode':<10} {'answers':>8} {'us/answer':>12} {'bytes/answer':>14}")
+    for label, journal in (("snapshot", False), ("journal", True)):
+        result = run(journal, args.rounds)
+        print(
+            f"{label:<10} {result['answers']:>8} "
+            f"{result['latency_us']:>12.1f} {result['bytes_per_answer']:>14.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
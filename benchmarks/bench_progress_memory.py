@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memory held per answered question when loading a cohort.
+
+Loads N synthetic answers the way ProgressManager does and measures the
+retained memory with tracemalloc, for the slotted QuestionProgress and
+for the plain dataclass layout it replaced.
+
+Run with: python benchmarks/bench_progress_memory.py [--answers N]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cyoa.progress import QuestionProgress
+
+
+@dataclass
+class DataclassQuestionProgress:
+    """The previous QuestionProgress layout, kept for comparison."""
+
+    question_id: str
+    answered: bool = False
+    correct: bool = False
+    score: float = 0.0
+    attempts: int = 0
+    user_answer: Any = None
+    timestamp: Optional[str] = None
+
+
+def synthetic_records(answers: int):
+    """Yield question dicts shaped like a parsed progress.json."""
+    start = datetime(2025, 12, 9, 14, 0, 0)
+    for n in range(answers):
+        yield {
+            # Fresh strings, as json.load produces for every file
+            "question_id": "".join(["3b_q", str(n % 60)]),
+            "answered": True,
+            "correct": n % 3 == 0,
+            "score": float(n % 4),
+            "attempts": 1,
+            "user_answer": "B",
+            "timestamp": (start + timedelta(seconds=n, microseconds=n)).isoformat(),
+        }
+
+
+def measure(cls, answers: int) -> int:
+    """Bytes retained by `answers` records of the given class."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+
+    records = [cls(**data) for data in synthetic_records(answers)]
+
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del records
+    return retained
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--answers", type=int, default=100000,
+                        help="answered questions to load (default: 100000)")
+    args = parser.parse_args()
+
+    print(f"{'layout':<12} {'MiB':>8} {'bytes/answer':>14}")
+    for label, cls in (("dataclass", DataclassQuestionProgress), ("slotted", QuestionProgress)):
+        retained = measure(cls, args.answers)
+        print(f"{label:<12} {retained / 2**20:>8.1f} {retained / args.answers:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark: ranking comparison and partial-credit scorers.
+
+Times the old compare_rankings loop (list.index per item, O(n^2))
+against the inverse-permutation version, and each scoring policy of
+RankingQuestion, for rankings of increasing length.
+
+Run with: python benchmarks/bench_ranking.py [--answers N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cyoa.feedback import compare_rankings
+from cyoa.ranking import RANKING_SCORERS, inverse_permutation
+
+
+def old_compare_rankings(user_ranking, correct_ranking) -> dict:
+    """The previous compare_rankings position-error loop."""
+    total = len(correct_ranking)
+    position_errors = 0
+    for i, val in enumerate(user_ranking):
+        if val in correct_ranking:
+            correct_pos = correct_ranking.index(val)
+            position_errors += abs(i - correct_pos)
+    max_errors = total * (total - 1)
+    return {"order_score": 1 - (position_errors / max_errors) if max_errors > 0 else 1}
+
+
+def us_per_answer(func, answers) -> float:
+    start = time.perf_counter()
+    for answer in answers:
+        func(answer)
+    return (time.perf_counter() - start) / len(answers) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--answers", type=int, default=200,
+                        help="answers per ranking length (default: 200)")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    policies = list(RANKING_SCORERS)
+    header = "".join(f"{name:>10}" for name in policies)
+    print(f"{'items':>6} {'old cmp':>10} {'new cmp':>10}{header}  (us/answer)")
+
+    for size in (3, 10, 20, 100, 1000):
+        correct = list(range(1, size + 1))
+        inverse = inverse_permutation(correct)
+        answers = [rng.sample(correct, size) for _ in range(args.answers)]
+
+        row = [
+            us_per_answer(lambda a: old_compare_rankings(a, correct), answers),
+            us_per_answer(lambda a: compare_rankings(a, correct), answers),
+        ]
+        for name in policies:
+            scorer = RANKING_SCORERS[name]
+            row.append(us_per_answer(lambda a: scorer(a, correct, inverse), answers))
+
+        print(f"{size:>6} " + "".join(f"{value:>10.1f}" for value in row))
+
+
+if __name__ == "__main__":
+    main()
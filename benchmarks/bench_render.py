@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark: write syscalls and wall time per rendered question screen.
+
+Renders every question screen (plus its feedback box) of all five
+exercises through three backends:
+
+  per-call  writes each piece as soon as it is drawn, like the old
+            print()-per-line code on an unbuffered terminal
+  frame     buffers the whole screen and writes it once
+  null      lays the screen out and discards it (layout cost only)
+
+Writes go to /dev/null with os.write, so the syscall counts are real.
+
+Run with: python benchmarks/bench_render.py [--rounds N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cyoa import ui
+from cyoa.engine import GameEngine
+from cyoa.feedback import display_feedback
+from cyoa.render import NullRenderer, Renderer
+from cyoa.scenarios import (
+    get_exercise1,
+    get_exercise2,
+    get_exercise3,
+    get_exercise4,
+    get_exercise5,
+)
+
+
+class DevNullRenderer(Renderer):
+    """Emits frames to /dev/null with os.write, counting the syscalls."""
+
+    def __init__(self, per_call: bool):
+        super().__init__()
+        self.per_call = per_call
+        self.fd = os.open(os.devnull, os.O_WRONLY)
+        self.syscalls = 0
+
+    def write(self, text: str):
+        super().write(text)
+        if self.per_call:
+            self.flush()
+
+    def clear(self):
+        pass
+
+    def emit(self, frame: str):
+        os.write(self.fd, frame.encode("utf-8"))
+        self.syscalls += 1
+
+
+def render_all(engine: GameEngine, exercises) -> int:
+    """Render every question screen and its feedback once."""
+    screens = 0
+    for exercise in exercises:
+        for scenario in exercise.scenarios:
+            for number, question in enumerate(scenario.questions, 1):
+                engine.render_question(exercise, scenario, question, number)
+                display_feedback(False, 1, question.feedback_incorrect, question.model_answer)
+                ui.flush()
+                screens += 1
+    return screens
+
+
+def run(renderer: Renderer, rounds: int, exercises) -> dict:
+    """Render all screens `rounds` times through one renderer."""
+    token = ui.current_io.set(ui.TerminalIO(renderer))
+    try:
+        engine = GameEngine(data_dir=os.devnull)
+        screens = 0
+        start = time.perf_counter()
+        for _ in range(rounds):
+            screens += render_all(engine, exercises)
+        elapsed = time.perf_counter() - start
+    finally:
+        ui.current_io.reset(token)
+
+    return {
+        "screens": screens,
+        "us_per_screen": elapsed / screens * 1e6,
+        "syscalls_per_screen": getattr(renderer, "syscalls", 0) / screens,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=20,
+                        help="times to render every screen (default: 20)")
+    args = parser.parse_args()
+
+    exercises = [get_exercise1(), get_exercise2(), get_exercise3(),
+                 get_exercise4(), get_exercise5()]
+
+    print(f"{'backend':<10} {'screens':>8} {'us/screen':>11} {'writes/screen':>15}")
+    for label, renderer in (
+        ("per-call", DevNullRenderer(per_call=True)),
+        ("frame", DevNullRenderer(per_call=False)),
+        ("null", NullRenderer()),
+    ):
+        result = run(renderer, args.rounds, exercises)
+        print(
+            f"{label:<10} {result['screens']:>8} {result['us_per_screen']:>11.1f} "
+            f"{result['syscalls_per_screen']:>15.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
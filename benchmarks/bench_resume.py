@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark: screens a learner sits through to finish after a quit.
+
+For every exercise and every quit point, a learner answers questions up
+to the quit point, leaves, and comes back to finish the exercise. The
+comeback is played two ways:
+
+  replay  enter the exercise from the top: the intro, a redo/skip
+          prompt for each completed scenario (answered "skip") and the
+          interrupted scenario from its first question
+  resume  Continue Session: straight to the next unanswered question
+
+Counts question screens and other prompts, and times resume_point().
+
+Run with: python benchmarks/bench_resume.py
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cyoa import ui
+from cyoa.engine import GameEngine
+from cyoa.progress import ProgressManager
+from cyoa.render import NullRenderer
+from cyoa.scenarios.registry import load_all
+
+
+class ScriptedIO(ui.TerminalIO):
+    """Presses Enter at pauses and answers "S" (skip) to menus, counting prompts."""
+
+    def __init__(self):
+        super().__init__(NullRenderer())
+        self.prompts = 0
+
+    async def readline(self, prompt: str = "") -> str:
+        self.prompts += 1
+        return "" if "Enter" in prompt else "S"
+
+
+class ScriptedEngine(GameEngine):
+    """Answers every question correctly, quitting at one chosen question."""
+
+    quit_at = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.questions = 0
+
+    async def run_question(self, exercise, scenario, question, number):
+        if question.id == self.quit_at:
+            self.quit_at = None
+            return False
+        self.questions += 1
+        self.progress.record_answer(
+            exercise.id, scenario.id, question.id, question.correct_answer, True, question.points
+        )
+        return True
+
+
+def comeback(exercise, quit_at: str, resume: bool, data_dir: str) -> int:
+    """Screens (questions plus other prompts) needed to finish after quitting at quit_at."""
+    progress = ProgressManager(data_dir, store=None)
+    progress.reset_progress()
+    progress.new_session()
+    engine = ScriptedEngine(progress=progress)
+    engine.register_exercise(exercise)
+    io = ScriptedIO()
+    token = ui.current_io.set(io)
+    try:
+        engine.quit_at = quit_at
+        ui.run_blocking(engine.run_exercise(exercise))
+
+        engine.questions = 0
+        io.prompts = 0
+        if resume:
+            point = engine.resume_point()
+            ui.run_blocking(engine.run_exercise(point[0], start=point[1:]))
+        else:
+            ui.run_blocking(engine.run_exercise(exercise))
+        return engine.questions + io.prompts
+    finally:
+        ui.current_io.reset(token)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lookups", type=int, default=10000,
+                        help="resume_point() calls to time (default: 10000)")
+    args = parser.parse_args()
+
+    exercises = load_all()
+    data_dir = tempfile.mkdtemp()
+
+    print(f"{'exercise':<12} {'quits':>6} {'replay':>8} {'resume':>8}")
+    total_replay = total_resume = 0
+    for exercise in exercises:
+        # Quit points: every question after the first
+        quit_points = [q.id for s in exercise.scenarios for q in s.questions][1:]
+        replay = sum(comeback(exercise, q, False, data_dir) for q in quit_points)
+        resume = sum(comeback(exercise, q, True, data_dir) for q in quit_points)
+        total_replay += replay
+        total_resume += resume
+        print(f"{exercise.id:<12} {len(quit_points):>6} {replay:>8} {resume:>8}")
+    print(f"{'total':<12} {'':>6} {total_replay:>8} {total_resume:>8} "
+          f"({1 - total_resume / total_replay:.0%} fewer screens)")
+
+    # Cost of finding the resume point in a session halfway through everything
+    progress = ProgressManager(data_dir, store=None)
+    progress.new_session()
+    engine = GameEngine(progress=progress)
+    for exercise in exercises:
+        engine.register_exercise(exercise)
+        for scenario in exercise.scenarios[:len(exercise.scenarios) // 2]:
+            for question in scenario.questions:
+                progress._apply_answer(exercise.id, scenario.id, question.id, None, True, 1)
+    start = time.perf_counter()
+    for _ in range(args.lookups):
+        engine.resume_point()
+    elapsed = (time.perf_counter() - start) / args.lookups * 1e6
+    print(f"resume_point(): {elapsed:.2f} us")
+
+
+if __name__ == "__main__":
+    main()
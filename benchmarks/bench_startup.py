@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark: startup cost with lazy vs eager exercise loading.
+
+Runs fresh interpreters that import main.py and draw the main menu,
+either registering the manifest (exercises built on first entry) or
+building all five exercises up front as main.py used to. Reports the
+time until the first menu is ready, and the import time of the cyoa
+modules from -X importtime.
+
+Run with: python benchmarks/bench_startup.py [--runs N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import sys
+sys.path.insert(0, {root!r})
+import main
+from cyoa import ui
+from cyoa.engine import GameEngine
+from cyoa.render import NullRenderer
+from cyoa.scenarios.registry import MANIFEST, load_all
+
+class FirstMenu(Exception):
+    pass
+
+class MenuIO:
+    renderer = NullRenderer()
+    async def readline(self, prompt=""):
+        raise FirstMenu()
+
+ui.current_io.set(MenuIO())
+engine = GameEngine(data_dir={data_dir!r})
+for exercise in (load_all() if {eager} else MANIFEST):
+    engine.register_exercise(exercise)
+try:
+    ui.run_blocking(engine.main_loop())
+except FirstMenu:
+    print("menu", flush=True)
+"""
+
+
+def time_to_menu(eager: bool, data_dir: str) -> float:
+    """Seconds from interpreter launch until the main menu waits for input."""
+    code = CHILD.format(root=ROOT, data_dir=data_dir, eager=eager)
+    start = time.perf_counter()
+    child = subprocess.Popen([sys.executable, "-c", code], stdout=subprocess.PIPE, text=True)
+    line = child.stdout.readline()
+    elapsed = time.perf_counter() - start
+    child.wait()
+    if line.strip() != "menu":
+        raise RuntimeError("child did not reach the main menu")
+    return elapsed
+
+
+def cyoa_import_us(eager: bool, data_dir: str) -> int:
+    """Total self import time (µs) of cyoa modules, from -X importtime."""
+    code = CHILD.format(root=ROOT, data_dir=data_dir, eager=eager)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True
+    )
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, _, name = [part.strip() for part in line[len("import time:"):].split("|")]
+        if name.startswith("cyoa") and self_us.isdigit():
+            total += int(self_us)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10,
+                        help="interpreter launches per mode (default: 10)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        # Warm the bytecode cache so both modes start from .pyc files
+        time_to_menu(True, data_dir)
+
+        print(f"{'mode':<8} {'first menu (ms)':>16} {'cyoa imports (ms)':>18}")
+        for label, eager in (("eager", True), ("lazy", False)):
+            menu = statistics.median(time_to_menu(eager, data_dir) for _ in range(args.runs))
+            imports = statistics.median(cyoa_import_us(eager, data_dir) for _ in range(args.runs))
+            print(f"{label:<8} {menu * 1e3:>16.1f} {imports / 1e3:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
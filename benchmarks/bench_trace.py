@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cost of hot-path tracing, off and on.
+
+Renders and grades every question of all five exercises (question
+screen, grading, feedback box) three ways:
+
+  off       before tracing is enabled (functions are not wrapped)
+  on        with tracing enabled (every hot path is a timed span)
+  disabled  after tracing is disabled again (originals restored)
+
+Prints the time per screen for each, then the span report and the size
+of the Chrome trace written from the traced rounds.
+
+Run with: python benchmarks/bench_trace.py [--rounds N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cyoa import tracing, ui
+from cyoa import feedback
+from cyoa.engine import GameEngine
+from cyoa.render import NullRenderer
+from cyoa.scenarios.base import (
+    ChecklistQuestion,
+    FreeTextQuestion,
+)
+from cyoa.scenarios.registry import load_all
+
+
+def sample_answer(question):
+    """A correct answer for any question type."""
+    if isinstance(question, ChecklistQuestion):
+        return question.correct_mask
+    if isinstance(question, FreeTextQuestion):
+        return " ".join(question.required_keywords + question.bonus_keywords)
+    return question.correct_answer
+
+
+def play(engine: GameEngine, exercises, rounds: int) -> float:
+    """Render, grade and show feedback for every question; seconds per screen."""
+    screens = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for exercise in exercises:
+            for scenario in exercise.scenarios:
+                for number, question in enumerate(scenario.questions, 1):
+                    engine.render_question(exercise, scenario, question, number)
+                    correct, points, text = feedback.evaluate_answer(question, sample_answer(question))
+                    feedback.display_feedback(correct, points, text, question.model_answer)
+                    ui.flush()
+                    screens += 1
+    return (time.perf_counter() - start) / screens
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=20,
+                        help="times to play every question (default: 20)")
+    args = parser.parse_args()
+
+    exercises = load_all()
+    ui.current_io.set(ui.TerminalIO(NullRenderer()))
+    engine = GameEngine(data_dir=os.devnull)
+    play(engine, exercises, 1)  # warm the layout and grade caches
+
+    with tempfile.TemporaryDirectory() as tmp:
+        trace_path = os.path.join(tmp, "trace.json")
+        results = {"off": play(engine, exercises, args.rounds)}
+        tracing.enable(trace_path, dump_at_exit=False)
+        results["on"] = play(engine, exercises, args.rounds)
+        tracer = tracing.get_tracer()
+        tracing.dump(sys.stdout)
+        size = os.path.getsize(trace_path)
+        tracing.disable()
+        results["disabled"] = play(engine, exercises, args.rounds)
+
+    print(f"\nTrace file: {len(tracer.events)} events, {size / 1024:.0f} KiB")
+    print(f"\n{'tracing':<10} {'us/screen':>10} {'overhead':>9}")
+    for label, seconds in results.items():
+        print(f"{label:<10} {seconds * 1e6:>10.1f} {seconds / results['off'] - 1:>9.1%}")
+
+
+if __name__ == "__main__":
+    main()
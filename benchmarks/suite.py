@@ -0,0 +1,525 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: grading, persistence, rendering and full exercise runs.
+
+Times each benchmark as a series of samples, each sample repeating the
+operation enough times to last --min-time seconds, and reports the
+median time per operation. Runs offline against temporary directories.
+
+  check_answer.*      Question.check_answer for each question type
+  progress.*          save_session and a cold load_session, for a session
+                      with every built-in question answered (small) and a
+                      synthetic session of --large-answers answers (large)
+  render.*            wrap_text and print_box over every question text,
+                      with a cold and a warm layout cache
+  e2e.all_exercises   all five exercises played headlessly through the
+                      engine with canned correct answers, from a fresh
+                      progress file
+
+--output writes the samples and environment metadata as JSON. With
+--compare BASELINE, each benchmark is checked against a stored
+baseline with a Mann-Whitney U test; a benchmark regresses when its
+median is slower by more than --threshold and the difference is
+significant at --alpha. The exit status is 1 if anything regressed.
+
+Run with: python benchmarks/suite.py [--output FILE] [--compare BASELINE] [--filter TEXT] [--quick]
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cyoa import ui
+from cyoa.engine import GameEngine
+from cyoa.progress import ProgressManager
+from cyoa.render import NullRenderer
+from cyoa.scenarios.base import (
+    ChecklistQuestion,
+    FreeTextQuestion,
+    MultipleChoiceQuestion,
+    RankingQuestion,
+)
+from cyoa.scenarios.registry import load_all
+
+
+RESULTS_FORMAT = 1
+
+# name -> factory returning the operation to time
+BENCHMARKS: Dict[str, Callable[[argparse.Namespace], Callable[[], None]]] = {}
+
+
+def benchmark(name: str):
+    """Register a benchmark factory under name."""
+    def register(factory):
+        BENCHMARKS[name] = factory
+        return factory
+    return register
+
+
+def all_questions():
+    """Yield (exercise, scenario, question) for every built-in question."""
+    for exercise in load_all():
+        for scenario in exercise.scenarios:
+            for question in scenario.questions:
+                yield exercise, scenario, question
+
+
+def first_question(question_type):
+    """The first built-in question of a type."""
+    return next(q for _, _, q in all_questions() if isinstance(q, question_type))
+
+
+def canned_lines(question) -> List[str]:
+    """Input lines that answer a question correctly at the prompts."""
+    if isinstance(question, MultipleChoiceQuestion):
+        return [question.correct_answer]
+    if isinstance(question, RankingQuestion):
+        return [str(item) for item in question.correct_answer[:question.num_ranks]]
+    if isinstance(question, ChecklistQuestion):
+        return [",".join(question.correct_answers)]
+    if isinstance(question, FreeTextQuestion):
+        text = " ".join(question.required_keywords + question.bonus_keywords)
+        return [f"My answer covers {text}.", "DONE"]
+    raise ValueError(f"no canned answer for {type(question).__name__}")
+
+
+# --- Grading -----------------------------------------------------------------
+
+@benchmark("check_answer.multiple_choice")
+def bench_check_multiple_choice(args):
+    question = first_question(MultipleChoiceQuestion)
+    wrong = next(key for key, _ in question.options if key != question.correct_answer)
+    return lambda: (question.check_answer(question.correct_answer), question.check_answer(wrong))
+
+
+@benchmark("check_answer.ranking")
+def bench_check_ranking(args):
+    question = first_question(RankingQuestion)
+    swapped = list(question.correct_answer)
+    swapped[0], swapped[-1] = swapped[-1], swapped[0]
+    return lambda: (question.check_answer(question.correct_answer), question.check_answer(swapped))
+
+
+@benchmark("check_answer.free_text")
+def bench_check_free_text(args):
+    # The built-in exercises have no free-text questions
+    question = FreeTextQuestion(
+        id="bench_free_text",
+        text="Explain how defense in depth protects a network.",
+        feedback_correct="Good explanation.",
+        feedback_incorrect="Consider the layers of controls.",
+        model_answer=(
+            "Defense in depth layers physical, technical and administrative controls "
+            "so that no single failure exposes the network: firewalls and segmentation "
+            "at the perimeter, least privilege and monitoring inside."
+        ),
+        required_keywords=["layer", "firewall", "segmentation", "least privilege"],
+        bonus_keywords=["monitoring", "administrative", "physical"],
+        points=10,
+    )
+    answer = question.model_answer * 4
+    return lambda: question.check_answer(answer)
+
+
+@benchmark("check_answer.checklist")
+def bench_check_checklist(args):
+    question = first_question(ChecklistQuestion)
+    partial = [key for key, _ in question.options][::2]
+    return lambda: (question.check_answer(list(question.correct_answers)), question.check_answer(partial))
+
+
+# --- Persistence -------------------------------------------------------------
+
+def _session_dir(tmp: str, size: str, large_answers: int) -> str:
+    """Write a session of the given size to a new directory under tmp."""
+    data_dir = os.path.join(tmp, size)
+    manager = ProgressManager(data_dir, coalesce=True, max_pending=math.inf, max_delay=math.inf)
+    manager.new_session()
+    if size == "small":
+        for exercise, scenario, question in all_questions():
+            manager.record_answer(exercise.id, scenario.id, question.id, "A", True, question.points)
+    else:
+        answer = "A synthetic free-text answer about defense in depth and least privilege. " * 3
+        for n in range(large_answers):
+            exercise, rest = divmod(n, 500)
+            manager.record_answer(
+                f"ex{exercise}", f"ex{exercise}_sc{rest // 25}", f"ex{exercise}_q{rest}",
+                answer, n % 3 != 0, 5.0 if n % 3 else 0.0
+            )
+    manager.save_session()
+    return data_dir
+
+
+def _progress_benchmark(size: str, operation: str):
+    def factory(args):
+        data_dir = _session_dir(args.tmp, size, args.large_answers)
+        if operation == "save":
+            manager = ProgressManager(data_dir)
+            manager.load_session()
+            return manager.save_session
+        # A new manager each time, so the session is really read and rebuilt
+        return lambda: ProgressManager(data_dir).load_session()
+    return factory
+
+
+for _size in ("small", "large"):
+    for _operation in ("save", "load"):
+        benchmark(f"progress.{_operation}_session.{_size}")(_progress_benchmark(_size, _operation))
+
+
+# --- Rendering ---------------------------------------------------------------
+
+def _texts() -> List[str]:
+    return [question.text for _, _, question in all_questions()]
+
+
+@benchmark("render.wrap_text.cold")
+def bench_wrap_text_cold(args):
+    texts = _texts()
+
+    def run():
+        ui.clear_layout_cache()
+        for text in texts:
+            ui.wrap_text(text, width=70, indent=2)
+    return run
+
+
+@benchmark("render.wrap_text.warm")
+def bench_wrap_text_warm(args):
+    texts = _texts()
+
+    def run():
+        for text in texts:
+            ui.wrap_text(text, width=70, indent=2)
+    return run
+
+
+@benchmark("render.print_box.cold")
+def bench_print_box_cold(args):
+    texts = _texts()
+
+    def run():
+        ui.clear_layout_cache()
+        for text in texts:
+            ui.print_box(text, width=66)
+        ui.flush()
+    return run
+
+
+@benchmark("render.print_box.warm")
+def bench_print_box_warm(args):
+    texts = _texts()
+
+    def run():
+        for text in texts:
+            ui.print_box(text, width=66)
+        ui.flush()
+    return run
+
+
+# --- End to end --------------------------------------------------------------
+
+class CannedIO(ui.TerminalIO):
+    """Answers each question with its canned lines and presses Enter at pauses."""
+
+    def __init__(self):
+        super().__init__(NullRenderer())
+        self.lines: List[str] = []
+
+    async def readline(self, prompt: str = "") -> str:
+        if self.lines:
+            return self.lines.pop(0)
+        if "Enter" in prompt:
+            return ""
+        raise RuntimeError(f"unexpected prompt {prompt!r}")
+
+
+class CannedEngine(GameEngine):
+    """Queues the canned answer for each question as it is shown."""
+
+    def __init__(self, io: CannedIO, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.io = io
+
+    def render_question(self, exercise, scenario, question, number):
+        super().render_question(exercise, scenario, question, number)
+        self.io.lines.extend(canned_lines(question))
+
+
+@benchmark("e2e.all_exercises")
+def bench_all_exercises(args):
+    exercises = load_all()
+    data_dir = os.path.join(args.tmp, "e2e")
+
+    async def play(engine):
+        for exercise in exercises:
+            await engine.run_exercise(exercise)
+
+    def run():
+        progress = ProgressManager(data_dir, coalesce=True)
+        progress.reset_progress()
+        progress.new_session()
+        io = CannedIO()
+        engine = CannedEngine(io, data_dir=data_dir, progress=progress)
+        for exercise in exercises:
+            engine.register_exercise(exercise)
+        token = ui.current_io.set(io)
+        try:
+            asyncio.run(play(engine))
+        finally:
+            ui.current_io.reset(token)
+        progress.flush()
+        if progress.session.answered_count != len(list(all_questions())):
+            raise RuntimeError("headless run did not answer every question")
+    return run
+
+
+# --- Timing and statistics ---------------------------------------------------
+
+def measure(operation: Callable[[], None], samples: int, min_time: float) -> dict:
+    """
+    Time an operation.
+
+    The number of calls per sample is doubled until a sample lasts
+    min_time (which also warms caches up); then samples are taken with
+    garbage collection paused, as timeit does.
+
+    Returns:
+        {"number": calls per sample, "samples": seconds per call, ...}
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            operation()
+        if time.perf_counter() - start >= min_time:
+            break
+        number *= 2
+
+    times = []
+    for _ in range(samples):
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            for _ in range(number):
+                operation()
+            times.append((time.perf_counter() - start) / number)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+    return {
+        "number": number,
+        "samples": times,
+        "median": statistics.median(times),
+        "mean": statistics.mean(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "min": min(times),
+    }
+
+
+def mann_whitney_p(a: List[float], b: List[float]) -> float:
+    """
+    Two-sided p-value of a Mann-Whitney U test (normal approximation).
+
+    Makes no assumption about the shape of the timing distributions,
+    which are usually skewed by outliers.
+    """
+    n1, n2 = len(a), len(b)
+    if n1 < 2 or n2 < 2:
+        return 1.0
+    values = sorted([(v, 0) for v in a] + [(v, 1) for v in b])
+    n = n1 + n2
+    rank_sum = 0.0
+    ties = 0.0
+    i = 0
+    while i < n:
+        j = i
+        while j + 1 < n and values[j + 1][0] == values[i][0]:
+            j += 1
+        group = j - i + 1
+        rank = (i + j) / 2 + 1  # average rank of the tied group
+        rank_sum += rank * sum(1 for k in range(i, j + 1) if values[k][1] == 0)
+        ties += group ** 3 - group
+        i = j + 1
+    u = rank_sum - n1 * (n1 + 1) / 2
+    mean = n1 * n2 / 2
+    sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1))))
+    if sigma == 0:
+        return 1.0
+    z = (abs(u - mean) - 0.5) / sigma  # continuity correction
+    return min(1.0, 2 * (1 - statistics.NormalDist().cdf(max(z, 0.0))))
+
+
+def compare(current: dict, baseline: dict, alpha: float, threshold: float) -> List[str]:
+    """
+    Print current results against a baseline.
+
+    Returns:
+        Names of the benchmarks that regressed
+    """
+    regressions = []
+    both = list(current["benchmarks"].values()) + list(baseline["benchmarks"].values())
+    samples = min((len(result["samples"]) for result in both), default=0)
+    if mann_whitney_p([0.0] * samples, [1.0] * samples) >= alpha:
+        print(f"Warning: {samples} samples are too few to show a difference significant at {alpha}; "
+              f"use more --samples")
+    for key in ("python", "machine", "processor"):
+        was, now = baseline["environment"].get(key), current["environment"].get(key)
+        if was != now:
+            print(f"Warning: baseline was recorded with {key} {was!r}, not {now!r}")
+
+    width = max([9] + [len(name) for name in current["benchmarks"]])
+    print(f"\n{'benchmark':<{width}} {'baseline':>10} {'current':>10} {'change':>8} {'p':>7}")
+    for name, result in current["benchmarks"].items():
+        old = baseline["benchmarks"].get(name)
+        if old is None:
+            print(f"{name:<{width}} {'-':>10} {format_time(result['median']):>10}   (new)")
+            continue
+        change = result["median"] / old["median"] - 1
+        p = mann_whitney_p(old["samples"], result["samples"])
+        verdict = ""
+        if p < alpha and change > threshold:
+            verdict = "REGRESSION"
+            regressions.append(name)
+        elif p < alpha and change < -threshold:
+            verdict = "faster"
+        print(
+            f"{name:<{width}} {format_time(old['median']):>10} {format_time(result['median']):>10} "
+            f"{change:>+8.1%} {p:>7.3f} {verdict}"
+        )
+    return regressions
+
+
+def format_time(seconds: float) -> str:
+    """Format a duration with a readable unit."""
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def environment(args: argparse.Namespace) -> dict:
+    """Metadata describing where the results were measured."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=root, capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+        dirty = bool(subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=root, capture_output=True, text=True, timeout=10
+        ).stdout.strip()) if commit else None
+    except (OSError, subprocess.SubprocessError):
+        commit, dirty = None, None
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "numpy": numpy_version,
+        "git_commit": commit,
+        "git_dirty": dirty,
+        "samples": args.samples,
+        "min_time": args.min_time,
+        "large_answers": args.large_answers,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--output", metavar="FILE",
+                        help="write results (samples and environment) to FILE as JSON")
+    parser.add_argument("--compare", metavar="BASELINE",
+                        help="compare with results saved by --output and flag regressions")
+    parser.add_argument("--filter", metavar="TEXT", action="append",
+                        help="only run benchmarks whose name contains TEXT (repeatable)")
+    parser.add_argument("--list", action="store_true",
+                        help="list the benchmarks and exit")
+    parser.add_argument("--samples", type=int, default=20,
+                        help="samples per benchmark (default: 20)")
+    parser.add_argument("--min-time", type=float, default=0.05,
+                        help="seconds each sample should last (default: 0.05)")
+    parser.add_argument("--quick", action="store_true",
+                        help="5 samples of 0.01 s each, for a smoke run")
+    parser.add_argument("--large-answers", type=int, default=5000,
+                        help="answers in the synthetic large session (default: 5000)")
+    parser.add_argument("--alpha", type=float, default=0.01,
+                        help="significance level for --compare (default: 0.01)")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="slowdown of the median ignored by --compare (default: 0.10)")
+    args = parser.parse_args()
+    if args.quick:
+        args.samples, args.min_time = 5, 0.01
+
+    names = [
+        name for name in BENCHMARKS
+        if not args.filter or any(text in name for text in args.filter)
+    ]
+    if args.list:
+        print("\n".join(names))
+        return
+
+    baseline = None
+    if args.compare:
+        try:
+            with open(args.compare) as f:
+                baseline = json.load(f)
+            if baseline.get("format") != RESULTS_FORMAT:
+                raise ValueError("unsupported results format")
+        except (OSError, ValueError) as e:
+            print(f"Error: Could not read baseline {args.compare}: {e}")
+            sys.exit(2)
+
+    results = {"format": RESULTS_FORMAT, "environment": environment(args), "benchmarks": {}}
+    # Everything drawn goes nowhere; writes still go through a renderer
+    ui.current_io.set(ui.TerminalIO(NullRenderer()))
+    ui.install_resize_handler()  # cache the width, as main() does
+    width = max([9] + [len(name) for name in names])
+    print(f"{'benchmark':<{width}} {'median':>10} {'stdev':>10} {'calls':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        args.tmp = tmp
+        for name in names:
+            result = measure(BENCHMARKS[name](args), args.samples, args.min_time)
+            results["benchmarks"][name] = result
+            print(
+                f"{name:<{width}} {format_time(result['median']):>10} "
+                f"{format_time(result['stdev']):>10} {result['number']:>8}"
+            )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.alpha, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+        print("\nNo significant regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,413 @@
+"""Cohort analytics: score and completion statistics over many learners' progress."""
+
+import json
+import math
+import os
+import re
+import sqlite3
+import time
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+from .index import ContentIndex
+from .latency import LatencyStats, format_ms, phase_table
+from .storage import JsonFileStore, ProgressStore, SQLiteStore, StoreError
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Snapshots written by JsonFileStore: progress.json and progress_<learner>.json
+_PROGRESS_FILE = re.compile(r"^progress(?:_(.+))?\.json$")
+
+# Rows extracted from one learner's document, before aggregation
+QuestionRow = Tuple[Tuple[str, str, str], float, bool, int]
+ScenarioRow = Tuple[Tuple[str, str], float, bool]
+ExerciseRow = Tuple[str, float, bool]
+
+
+def find_progress(path: str) -> Iterator[Tuple[str, ProgressStore]]:
+    """
+    Find learner progress under a path.
+
+    Walks a directory tree for JSON progress snapshots (with their
+    journals) and SQLite progress databases; a path to a single
+    snapshot or database also works. Stores are yielded one at a time
+    as they are found; JSON stores are opened read-only, so scanning
+    never rewrites a journal a live session is appending to.
+
+    Yields:
+        Tuples of (label, store), one per learner
+    """
+    if os.path.isfile(path):
+        yield from _stores_in_file(path)
+        return
+
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames.sort()
+        for name in sorted(filenames):
+            yield from _stores_in_file(os.path.join(dirpath, name))
+
+
+def _stores_in_file(path: str) -> Iterator[Tuple[str, ProgressStore]]:
+    directory, name = os.path.split(path)
+    match = _PROGRESS_FILE.match(name)
+    if match:
+        # Read-only: a live session may be appending to the journal
+        yield path, JsonFileStore(directory, learner_id=match.group(1), read_only=True)
+    elif name.endswith(".db"):
+        conn = sqlite3.connect(path, timeout=30)
+        try:
+            learners = [row[0] for row in conn.execute("SELECT learner_id FROM sessions")]
+            for learner_id in learners:
+                yield f"{path}:{learner_id}", SQLiteStore(path, learner_id=learner_id, conn=conn)
+        except sqlite3.DatabaseError:
+            # Not a progress database
+            return
+        finally:
+            conn.close()
+
+
+def extract_rows(
+    document: Dict[str, Any]
+) -> Tuple[List[QuestionRow], List[ScenarioRow], List[ExerciseRow]]:
+    """
+    Flatten one learner's progress document into statistic rows.
+
+    Question rows are (key, score, correct, attempts) for answered
+    questions; scenario and exercise rows are (key, learner's score,
+    completed) for every scenario and exercise the learner started.
+
+    Raises:
+        ValueError: If the document is not in the progress.json layout
+    """
+    questions: List[QuestionRow] = []
+    scenarios: List[ScenarioRow] = []
+    exercises: List[ExerciseRow] = []
+    try:
+        for ex_id, ex in document["exercises"].items():
+            ex_score = 0.0
+            for sc_id, sc in ex["scenarios"].items():
+                sc_score = 0.0
+                for q_id, q in sc["questions"].items():
+                    if not q.get("answered"):
+                        continue
+                    score = float(q.get("score") or 0.0)
+                    questions.append(
+                        ((ex_id, sc_id, q_id), score, bool(q.get("correct")), int(q.get("attempts") or 0))
+                    )
+                    sc_score += score
+                scenarios.append(((ex_id, sc_id), sc_score, bool(sc.get("completed"))))
+                ex_score += sc_score
+            exercises.append((ex_id, ex_score, bool(ex.get("completed"))))
+    except (KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"not a progress document ({type(e).__name__}: {e})") from e
+    return questions, scenarios, exercises
+
+
+class _GroupedSums:
+    """
+    Per-key row counts and column sums, fed one row at a time.
+
+    With NumPy, rows are buffered and folded in with bincount every
+    chunk_size rows; memory holds one chunk plus one row of sums per
+    key, whatever the number of rows.
+    """
+
+    def __init__(self, columns: int, use_numpy: bool, chunk_size: int):
+        self.columns = columns
+        self.use_numpy = use_numpy
+        self.chunk_size = chunk_size
+        self.codes: Dict[Hashable, int] = {}
+        if use_numpy:
+            self.sums = np.zeros((0, columns + 1))
+            self._codes: List[int] = []
+            self._rows: List[Tuple[float, ...]] = []
+        else:
+            self.sums: List[List[float]] = []
+
+    def add(self, key: Hashable, *values: float):
+        code = self.codes.get(key)
+        if code is None:
+            code = self.codes[key] = len(self.codes)
+            if not self.use_numpy:
+                self.sums.append([0] * (self.columns + 1))
+
+        if self.use_numpy:
+            self._codes.append(code)
+            self._rows.append(values)
+            if len(self._codes) >= self.chunk_size:
+                self.flush()
+        else:
+            sums = self.sums[code]
+            sums[0] += 1
+            for column, value in enumerate(values, 1):
+                sums[column] += value
+
+    def flush(self):
+        """Fold buffered rows into the sums."""
+        if not self.use_numpy or not self._codes:
+            return
+        keys = len(self.codes)
+        codes = np.array(self._codes, dtype=np.intp)
+        rows = np.array(self._rows, dtype=float).reshape(len(codes), self.columns)
+        if self.sums.shape[0] < keys:
+            self.sums = np.vstack([self.sums, np.zeros((keys - self.sums.shape[0], self.columns + 1))])
+
+        self.sums[:, 0] += np.bincount(codes, minlength=keys)
+        for column in range(self.columns):
+            self.sums[:, column + 1] += np.bincount(codes, weights=rows[:, column], minlength=keys)
+        self._codes = []
+        self._rows = []
+
+    def totals(self) -> Dict[Hashable, List[float]]:
+        """Map each key to [count, column sums...], in first-seen order."""
+        self.flush()
+        return {key: [float(x) for x in self.sums[code]] for key, code in self.codes.items()}
+
+
+def _score_stats(count: float, total: float, squares: float) -> Dict[str, float]:
+    mean = total / count if count else 0.0
+    variance = max(0.0, squares / count - mean * mean) if count else 0.0
+    return {"mean_score": mean, "std_score": math.sqrt(variance)}
+
+
+class CohortStats:
+    """
+    Streaming score and completion statistics for a cohort.
+
+    Each learner's progress document is reduced to rows and folded into
+    running sums per question, scenario and exercise as it arrives, so
+    memory depends on the size of the content, not of the cohort.
+    """
+
+    def __init__(
+        self,
+        index: Optional[ContentIndex] = None,
+        use_numpy: Optional[bool] = None,
+        chunk_size: int = 4096
+    ):
+        """
+        Initialize the statistics.
+
+        Args:
+            index: Content to order the report by and take question
+                points from (default: ids in the order first seen)
+            use_numpy: Aggregate with NumPy (default: when installed)
+            chunk_size: Rows NumPy aggregates at a time
+        """
+        if use_numpy is None:
+            use_numpy = np is not None
+        elif use_numpy and np is None:
+            raise ImportError("NumPy is not installed")
+
+        self.index = index
+        self.learners = 0
+        # Question columns: score, score², correct, attempts
+        self._questions = _GroupedSums(4, use_numpy, chunk_size)
+        # Scenario and exercise columns: score, score², completed
+        self._scenarios = _GroupedSums(3, use_numpy, chunk_size)
+        self._exercises = _GroupedSums(3, use_numpy, chunk_size)
+
+    def add(self, document: Dict[str, Any]):
+        """
+        Add one learner's progress document.
+
+        Raises:
+            ValueError: If the document is not in the progress.json layout
+                (nothing is added)
+        """
+        questions, scenarios, exercises = extract_rows(document)
+        self.learners += 1
+        for key, score, correct, attempts in questions:
+            self._questions.add(key, score, score * score, correct, attempts)
+        for key, score, completed in scenarios:
+            self._scenarios.add(key, score, score * score, completed)
+        for key, score, completed in exercises:
+            self._exercises.add(key, score, score * score, completed)
+
+    def _content_order(self) -> Dict[Hashable, int]:
+        """Rank of every exercise, scenario and question key in the content."""
+        rank: Dict[Hashable, int] = {}
+        if self.index is None:
+            return rank
+        for entry in self.index.entries():
+            exercise = self.index.exercise(entry.id)
+            rank[exercise.id] = len(rank)
+            for scenario in exercise.scenarios:
+                rank[(exercise.id, scenario.id)] = len(rank)
+                for question in scenario.questions:
+                    rank[(exercise.id, scenario.id, question.id)] = len(rank)
+        return rank
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Build the statistics report.
+
+        Returns:
+            Dict with the learner count and nested exercises -> scenarios
+            -> questions statistics. Scores are averaged over learners
+            who started the item; completion percentages are of the
+            whole cohort.
+        """
+        rank = self._content_order()
+
+        def ordered(totals: Dict[Hashable, List[float]]) -> List[Hashable]:
+            return sorted(totals, key=lambda key: rank.get(key, len(rank)))
+
+        cohort = self.learners
+
+        def pct(count: float) -> float:
+            return count / cohort * 100 if cohort else 0.0
+
+        exercises: Dict[str, Any] = {}
+        ex_totals = self._exercises.totals()
+        for ex_id in ordered(ex_totals):
+            count, total, squares, completed = ex_totals[ex_id]
+            exercises[ex_id] = {
+                "learners": int(count),
+                "completed": int(completed),
+                "completion_pct": pct(completed),
+                **_score_stats(count, total, squares),
+                "scenarios": {},
+            }
+
+        sc_totals = self._scenarios.totals()
+        for ex_id, sc_id in ordered(sc_totals):
+            count, total, squares, completed = sc_totals[(ex_id, sc_id)]
+            exercises[ex_id]["scenarios"][sc_id] = {
+                "learners": int(count),
+                "completed": int(completed),
+                "completion_pct": pct(completed),
+                **_score_stats(count, total, squares),
+                "questions": {},
+            }
+
+        q_totals = self._questions.totals()
+        for key in ordered(q_totals):
+            ex_id, sc_id, q_id = key
+            count, total, squares, correct, attempts = q_totals[key]
+            stats = {
+                "answered": int(count),
+                "answered_pct": pct(count),
+                "correct": int(correct),
+                "correct_pct": correct / count * 100 if count else 0.0,
+                **_score_stats(count, total, squares),
+                "mean_attempts": attempts / count if count else 0.0,
+            }
+            if key in rank:
+                stats["points"] = self.index.question(q_id).points
+            exercises[ex_id]["scenarios"][sc_id]["questions"][q_id] = stats
+
+        return {"learners": cohort, "exercises": exercises}
+
+
+def analyze(
+    path: str,
+    index: Optional[ContentIndex] = None,
+    use_numpy: Optional[bool] = None
+) -> Dict[str, Any]:
+    """
+    Stream every learner's progress under a path into cohort statistics.
+
+    Files are found, parsed and folded in one at a time; unreadable or
+    malformed ones are reported and skipped.
+
+    Each learner's latency sketches are merged into cohort sketches
+    along the way.
+
+    Returns:
+        CohortStats.report() plus latency (phase and per-question
+        quantiles of the merged sketches, in seconds), files (learner documents read), errors,
+        elapsed seconds and files_per_sec
+    """
+    stats = CohortStats(index=index, use_numpy=use_numpy)
+    latency = LatencyStats()
+    files = 0
+    errors = []
+
+    start = time.perf_counter()
+    for label, store in find_progress(path):
+        files += 1
+        try:
+            document = store.load()
+            if document is None:
+                errors.append(f"{label}: no readable progress snapshot")
+                continue
+            # Read everything before folding anything in, so a learner
+            # is either counted or skipped, never both
+            timings = store.load_timings()
+            sketches = LatencyStats.from_dict(timings) if timings is not None else None
+            stats.add(document)
+            if sketches is not None:
+                latency.merge(sketches)
+        except (OSError, ValueError, StoreError, sqlite3.DatabaseError) as e:
+            errors.append(f"{label}: {e}")
+    report = stats.report()
+    report["latency"] = {"phases": latency.phase_summary(), "questions": latency.summary()}
+    elapsed = time.perf_counter() - start
+
+    report.update({
+        "files": files,
+        "errors": errors,
+        "elapsed": elapsed,
+        "files_per_sec": files / elapsed if elapsed > 0 else 0.0,
+    })
+    return report
+
+
+def run_analytics(
+    path: str,
+    index: Optional[ContentIndex] = None,
+    output: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Analyze a cohort's progress and print a report.
+
+    Args:
+        path: Directory tree, progress file or database to analyze
+        index: Content to order the report by
+        output: Also write the full report to this JSON file
+
+    Returns:
+        Dictionary from analyze
+    """
+    report = analyze(path, index=index)
+
+    for ex_id, ex in report["exercises"].items():
+        print(f"{ex_id}: {ex['learners']} learners, {ex['completion_pct']:.0f}% complete, "
+              f"score {ex['mean_score']:.1f} ± {ex['std_score']:.1f}")
+        for sc_id, sc in ex["scenarios"].items():
+            print(f"  {sc_id}: {sc['completion_pct']:.0f}% complete, "
+                  f"score {sc['mean_score']:.1f} ± {sc['std_score']:.1f}")
+            for q_id, q in sc["questions"].items():
+                think = report["latency"]["questions"].get(q_id, {}).get("think")
+                timing = ""
+                if think:
+                    timing = (f", think p50 {format_ms(think['p50'])} / "
+                              f"p95 {format_ms(think['p95'])} ms")
+                print(f"    {q_id}: {q['answered']} answered, {q['correct_pct']:.0f}% correct, "
+                      f"score {q['mean_score']:.2f} ± {q['std_score']:.2f}, "
+                      f"{q['mean_attempts']:.1f} attempts{timing}")
+
+    if report["latency"]["phases"]:
+        print()
+        for line in phase_table(report["latency"]["phases"]):
+            print(line)
+        print()
+
+    for error in report["errors"]:
+        print(f"Skipped {error}")
+    print(
+        f"Analyzed {report['files']} progress files ({report['learners']} learners) "
+        f"in {report['elapsed']:.2f}s ({report['files_per_sec']:.0f} files/sec)"
+    )
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"Wrote {output}")
+
+    return report
@@ -0,0 +1,265 @@
+"""Headless batch grading of scripted answer files."""
+
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .feedback import evaluate_answer
+from .index import ContentIndex
+from .progress import ProgressManager
+from .storage import SQLiteStore, create_store
+from .scenarios.base import (
+    Exercise,
+    Question,
+    MultipleChoiceQuestion,
+    RankingQuestion,
+    ChecklistQuestion,
+)
+
+
+class BatchError(ValueError):
+    """Raised for an answer record that cannot be graded."""
+
+
+def read_answers(path: str) -> Iterator[Tuple[int, Any]]:
+    """
+    Read an answers file.
+
+    Each line is one JSON object::
+
+        {"learner": "alice", "question": "1a_q1", "answer": "C"}
+
+    Blank lines and lines starting with # are skipped.
+
+    Yields:
+        Tuples of (line_number, record), where record is a BatchError
+        for lines that are not valid JSON
+    """
+    with open(path, 'r') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, BatchError(f"invalid JSON: {e}")
+
+
+def normalize_answer(question: Question, answer: Any) -> Any:
+    """
+    Convert a scripted answer into what the interactive prompt would return.
+
+    Raises:
+        BatchError: If the answer is not valid for the question
+    """
+    if isinstance(question, MultipleChoiceQuestion):
+        valid_keys = [opt[0].upper() for opt in question.options]
+        if not isinstance(answer, str) or answer.strip().upper() not in valid_keys:
+            raise BatchError(f"expected one of {', '.join(valid_keys)}, got {answer!r}")
+        return answer.strip().upper()
+
+    if isinstance(question, ChecklistQuestion):
+        if isinstance(answer, str):
+            answer = answer.split(",")
+        if not isinstance(answer, list):
+            raise BatchError(f"expected a list of selections, got {answer!r}")
+        selections = [str(s).strip().upper() for s in answer if str(s).strip()]
+        valid_keys = [opt[0].upper() for opt in question.options]
+        if not selections or not all(s in valid_keys for s in selections):
+            raise BatchError(f"expected selections from {', '.join(valid_keys)}, got {answer!r}")
+        return question.mask_of(selections)[0]
+
+    if isinstance(question, RankingQuestion):
+        if not isinstance(answer, list):
+            raise BatchError(f"expected a list of item numbers, got {answer!r}")
+        try:
+            ranking = [int(choice) for choice in answer]
+        except (TypeError, ValueError):
+            raise BatchError(f"expected a list of item numbers, got {answer!r}")
+        if (
+            len(ranking) != question.num_ranks
+            or len(set(ranking)) != len(ranking)
+            or not all(1 <= idx <= len(question.items) for idx in ranking)
+        ):
+            raise BatchError(
+                f"expected {question.num_ranks} distinct item numbers "
+                f"between 1 and {len(question.items)}, got {answer!r}"
+            )
+        return ranking
+
+    if not isinstance(answer, str) or not answer.strip():
+        raise BatchError(f"expected a text answer, got {answer!r}")
+    return answer.strip()
+
+
+class BatchRunner:
+    """
+    Grade scripted answers for many learners without a terminal.
+
+    Answers go through the same evaluate_answer and ProgressManager path
+    as interactive play, minus all screen output, prompts and waits.
+    """
+
+    def __init__(
+        self,
+        exercises: List[Exercise],
+        data_dir: str = "data",
+        store: str = "json",
+        max_open: int = 256
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            exercises: Exercises whose questions may be answered
+            data_dir: Directory holding progress files
+            store: Progress storage backend ("json" or "sqlite")
+            max_open: Learner sessions to keep in memory at once
+        """
+        self.data_dir = data_dir
+        self.store = store
+        self.max_open = max_open
+        self._managers: "OrderedDict[Optional[str], ProgressManager]" = OrderedDict()
+
+        # One connection shared by every learner in the database
+        self._conn = None
+        if store == "sqlite":
+            self._conn = SQLiteStore.connect(os.path.join(data_dir, "progress.db"))
+
+        self.index = ContentIndex(exercises)
+
+    def _manager(self, learner_id: Optional[str]) -> ProgressManager:
+        """Get the progress manager for a learner, loading or creating it."""
+        manager = self._managers.get(learner_id)
+        if manager is not None:
+            self._managers.move_to_end(learner_id)
+            return manager
+
+        kwargs = {"conn": self._conn} if self._conn is not None else {}
+        manager = ProgressManager(
+            self.data_dir,
+            learner_id=learner_id,
+            store=create_store(self.store, self.data_dir, learner_id=learner_id, **kwargs),
+            coalesce=True,
+            max_pending=1000,
+            max_delay=float("inf")
+        )
+        if manager.load_session() is None:
+            manager.new_session()
+
+        self._managers[learner_id] = manager
+        if len(self._managers) > self.max_open:
+            _, evicted = self._managers.popitem(last=False)
+            evicted.flush()
+
+        return manager
+
+    def grade(self, record: Dict[str, Any]) -> Tuple[bool, float]:
+        """
+        Grade one answer record and record it in the learner's progress.
+
+        Returns:
+            Tuple of (is_correct, score)
+
+        Raises:
+            BatchError: If the record is malformed or the answer invalid
+        """
+        if not isinstance(record, dict) or "question" not in record or "answer" not in record:
+            raise BatchError("record needs 'question' and 'answer'")
+        question_id = record["question"]
+        answer = record["answer"]
+
+        try:
+            exercise, scenario, question = self.index.locate(question_id)[:3]
+        except KeyError:
+            raise BatchError(f"unknown question {question_id!r}") from None
+
+        answer = normalize_answer(question, answer)
+        is_correct, score, _ = evaluate_answer(question, answer)
+
+        manager = self._manager(record.get("learner"))
+        manager.record_answer(
+            exercise.id, scenario.id, question.id, answer, is_correct, score
+        )
+
+        # Complete the scenario once every question in it has an answer
+        sc_progress = manager.get_scenario_progress(exercise.id, scenario.id)
+        if not sc_progress.completed and all(
+            q.id in sc_progress.questions for q in scenario.questions
+        ):
+            manager.mark_scenario_complete(exercise.id, scenario.id)
+
+        return is_correct, score
+
+    def close(self):
+        """Write out every learner's held progress."""
+        for manager in self._managers.values():
+            manager.flush()
+        self._managers.clear()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def run(self, path: str) -> dict:
+        """
+        Grade every record in an answers file.
+
+        Returns:
+            Dictionary with counts, errors and throughput
+        """
+        learners = set()
+        answers = 0
+        errors = []
+
+        start = time.perf_counter()
+        try:
+            for line_number, record in read_answers(path):
+                try:
+                    if isinstance(record, BatchError):
+                        raise record
+                    self.grade(record)
+                except BatchError as e:
+                    errors.append(f"line {line_number}: {e}")
+                    continue
+                learners.add(record.get("learner"))
+                answers += 1
+        finally:
+            self.close()
+        elapsed = time.perf_counter() - start
+
+        return {
+            "learners": len(learners),
+            "answers": answers,
+            "errors": errors,
+            "elapsed": elapsed,
+            "answers_per_sec": answers / elapsed if elapsed > 0 else 0.0,
+        }
+
+
+def run_batch(
+    exercises: List[Exercise],
+    path: str,
+    data_dir: str = "data",
+    store: str = "json"
+) -> dict:
+    """
+    Grade an answers file and print a report.
+
+    Returns:
+        Dictionary from BatchRunner.run
+    """
+    report = BatchRunner(exercises, data_dir=data_dir, store=store).run(path)
+
+    for error in report["errors"]:
+        print(f"Skipped {error}")
+    print(
+        f"Graded {report['answers']} answers for {report['learners']} learners "
+        f"in {report['elapsed']:.2f}s ({report['answers_per_sec']:.0f} answers/sec)"
+    )
+    if report["errors"]:
+        print(f"{len(report['errors'])} records skipped")
+
+    return report
@@ -0,0 +1,379 @@
+"""Declarative exercise content: JSON files compiled into a binary cache."""
+
+import dataclasses
+import hashlib
+import json
+import os
+import pickle
+import struct
+import sys
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from . import __version__
+from .scenarios.base import (
+    Exercise,
+    Scenario,
+    Question,
+    MultipleChoiceQuestion,
+    RankingQuestion,
+    FreeTextQuestion,
+    ChecklistQuestion,
+    QuestionType,
+)
+from .scenarios.registry import ExerciseInfo, describe
+
+
+# Version of the JSON content format
+CONTENT_FORMAT = 1
+
+# Bump whenever the cache layout or the pickled classes change
+CACHE_VERSION = 1
+CACHE_NAME = ".content-cache"
+
+QUESTION_CLASSES = {
+    QuestionType.MULTIPLE_CHOICE.value: MultipleChoiceQuestion,
+    QuestionType.RANKING.value: RankingQuestion,
+    QuestionType.FREE_TEXT.value: FreeTextQuestion,
+    QuestionType.CHECKLIST.value: ChecklistQuestion,
+}
+
+# Header length prefix of the cache file
+_HEADER_SIZE = struct.Struct("<Q")
+
+
+class ContentError(ValueError):
+    """Raised for content files that do not describe a valid exercise."""
+
+
+def question_from_dict(data: Dict[str, Any]) -> Question:
+    """
+    Build a question from its JSON form.
+
+    The "type" key picks the class (multiple_choice, ranking, free_text
+    or checklist); every other key is passed to the constructor.
+    """
+    fields = dict(data)
+    kind = fields.pop("type", None)
+    cls = QUESTION_CLASSES.get(kind)
+    if cls is None:
+        raise ContentError(f"question {fields.get('id')!r}: unknown type {kind!r}")
+    if "options" in fields:
+        fields["options"] = [tuple(option) for option in fields["options"]]
+    try:
+        return cls(**fields)
+    except (TypeError, ValueError) as e:
+        raise ContentError(f"question {fields.get('id')!r}: {e}") from e
+
+
+def exercise_from_dict(data: Dict[str, Any]) -> Exercise:
+    """Build an exercise, its scenarios and questions from their JSON form."""
+    if data.get("format") != CONTENT_FORMAT:
+        raise ContentError(
+            f"unsupported content format {data.get('format')!r} (expected {CONTENT_FORMAT})"
+        )
+    fields = {key: value for key, value in data.items() if key != "format"}
+    try:
+        fields["scenarios"] = [
+            Scenario(
+                id=scenario["id"],
+                title=scenario["title"],
+                description=scenario["description"],
+                questions=[question_from_dict(q) for q in scenario.get("questions", [])],
+            )
+            for scenario in fields.get("scenarios", [])
+        ]
+        return Exercise(**fields)
+    except (KeyError, TypeError) as e:
+        raise ContentError(f"exercise {data.get('id')!r}: missing or invalid field {e}") from e
+
+
+def _question_to_dict(question: Question) -> Dict[str, Any]:
+    data = {"type": question.question_type.value}
+    for f in dataclasses.fields(question):
+        if not f.init or f.name == "question_type":
+            continue
+        value = getattr(question, f.name)
+        if f.name == "options":
+            value = [list(option) for option in value]
+        data[f.name] = value
+    return data
+
+
+def exercise_to_dict(exercise: Exercise) -> Dict[str, Any]:
+    """Convert an exercise to its JSON form."""
+    return {
+        "format": CONTENT_FORMAT,
+        "id": exercise.id,
+        "number": exercise.number,
+        "title": exercise.title,
+        "description": exercise.description,
+        "estimated_time": exercise.estimated_time,
+        "objectives": list(exercise.objectives),
+        "scenarios": [
+            {
+                "id": scenario.id,
+                "title": scenario.title,
+                "description": scenario.description,
+                "questions": [_question_to_dict(q) for q in scenario.questions],
+            }
+            for scenario in exercise.scenarios
+        ],
+    }
+
+
+def export_exercises(exercises: List[Exercise], content_dir: str) -> List[str]:
+    """
+    Write exercises as JSON content files, one per exercise.
+
+    Returns:
+        Paths of the files written
+    """
+    os.makedirs(content_dir, exist_ok=True)
+    paths = []
+    for exercise in exercises:
+        path = os.path.join(content_dir, f"{exercise.id}.json")
+        with open(path, 'w') as f:
+            json.dump(exercise_to_dict(exercise), f, indent=2)
+            f.write("\n")
+        paths.append(path)
+    return paths
+
+
+class ContentLibrary:
+    """
+    Exercises defined by the JSON files in a content directory.
+
+    The first load parses every file and compiles the exercises into a
+    binary cache next to them: a small pickled header (manifest, source
+    file stats and hashes, blob offsets) followed by one pickled blob
+    per exercise. Later startups read only the header; an exercise's
+    blob is unpickled when the learner enters it. When a file changes,
+    only that file is parsed again and the other blobs are copied over.
+
+    The cache is pickle, so it must be as trusted as the content
+    directory itself.
+    """
+
+    def __init__(
+        self,
+        content_dir: str,
+        cache_path: Optional[str] = None,
+        warn: Callable[[str], None] = print
+    ):
+        """
+        Initialize the library.
+
+        Args:
+            content_dir: Directory holding *.json exercise files
+            cache_path: Compiled cache (default: .content-cache in content_dir)
+            warn: Called with warnings about the cache (default: print;
+                pass ui.warn once exercises load during a rendered session)
+        """
+        self.content_dir = content_dir
+        self.cache_path = cache_path or os.path.join(content_dir, CACHE_NAME)
+        self.warn = warn
+        self._header: Optional[Dict[str, Any]] = None
+        self._loaded: Dict[str, Exercise] = {}
+        self._blobs: Dict[str, bytes] = {}  # blobs compiled this run, if not written
+
+    def _sources(self) -> Dict[str, Tuple[int, int]]:
+        """Content files and their (size, mtime_ns)."""
+        sources = {}
+        with os.scandir(self.content_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json") and entry.is_file():
+                    stat = entry.stat()
+                    sources[entry.name] = (stat.st_size, stat.st_mtime_ns)
+        if not sources:
+            raise ContentError(f"no *.json content files in {self.content_dir}")
+        return sources
+
+    def _read_header(self) -> Optional[Dict[str, Any]]:
+        """Read the cache header, or None if there is no usable cache."""
+        try:
+            with open(self.cache_path, 'rb') as f:
+                (size,) = _HEADER_SIZE.unpack(f.read(_HEADER_SIZE.size))
+                if size > os.fstat(f.fileno()).st_size:
+                    return None
+                header_bytes = f.read(size)
+        except (OSError, struct.error):
+            return None
+        try:
+            header = pickle.loads(header_bytes)
+        except Exception:
+            # Damaged pickle data can fail in any constructor it names
+            return None
+        if (
+            not isinstance(header, dict)
+            or header.get("version") != (CACHE_VERSION, __version__, sys.version_info[:2])
+        ):
+            return None
+        return header
+
+    def _read_blob(self, offset: int, length: int) -> bytes:
+        with open(self.cache_path, 'rb') as f:
+            f.seek(offset)
+            return f.read(length)
+
+    def header(self) -> Dict[str, Any]:
+        """The cache header, compiling or refreshing the cache if needed."""
+        if self._header is None:
+            sources = self._sources()
+            header = self._read_header()
+            if header is None or {
+                name: tuple(entry["stat"]) for name, entry in header["sources"].items()
+            } != sources:
+                header = self.compile(sources, header)
+            self._header = header
+        return self._header
+
+    def compile(
+        self,
+        sources: Optional[Dict[str, Tuple[int, int]]] = None,
+        previous: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Parse changed content files and write a fresh cache.
+
+        Files whose stats or content hash match the previous cache keep
+        their compiled blob.
+
+        Returns:
+            The new cache header
+        """
+        sources = sources if sources is not None else self._sources()
+        old_sources = previous["sources"] if previous else {}
+
+        blobs: List[Tuple[str, Dict[str, Any], bytes]] = []
+        for name in sorted(sources):
+            path = os.path.join(self.content_dir, name)
+            old = old_sources.get(name)
+            if old is not None and tuple(old["stat"]) != sources[name]:
+                # Touched but maybe not edited: compare content hashes
+                with open(path, 'rb') as f:
+                    raw = f.read()
+                digest = hashlib.sha1(raw).hexdigest()
+                if digest != old["sha1"]:
+                    old = None
+            elif old is None:
+                with open(path, 'rb') as f:
+                    raw = f.read()
+                digest = hashlib.sha1(raw).hexdigest()
+
+            if old is not None:
+                source = {"sha1": old["sha1"], "entry": old["entry"]}
+                blob = self._blobs.get(name) or self._read_blob(old["offset"], old["length"])
+            else:
+                try:
+                    exercise = exercise_from_dict(json.loads(raw))
+                except json.JSONDecodeError as e:
+                    raise ContentError(f"{path}: invalid JSON: {e}") from e
+                except ContentError as e:
+                    raise ContentError(f"{path}: {e}") from e
+                info = describe(exercise, name)
+                source = {
+                    "sha1": digest,
+                    "entry": (info.id, info.number, info.title,
+                              info.question_count, info.total_points, name),
+                }
+                blob = pickle.dumps(exercise, protocol=pickle.HIGHEST_PROTOCOL)
+                self._loaded.setdefault(exercise.id, exercise)
+            source["stat"] = list(sources[name])
+            blobs.append((name, source, blob))
+
+        ids = [source["entry"][0] for _, source, _ in blobs]
+        duplicates = sorted({i for i in ids if ids.count(i) > 1})
+        if duplicates:
+            raise ContentError(f"duplicate exercise ids in {self.content_dir}: {', '.join(duplicates)}")
+
+        return self._write(blobs)
+
+    def _write(self, blobs: List[Tuple[str, Dict[str, Any], bytes]]) -> Dict[str, Any]:
+        """Write the cache file; offsets depend on the header size, so lay it out twice."""
+        def layout(header_size: int) -> Dict[str, Any]:
+            offset = _HEADER_SIZE.size + header_size
+            sources = {}
+            for name, source, blob in blobs:
+                sources[name] = dict(source, offset=offset, length=len(blob))
+                offset += len(blob)
+            return {
+                "version": (CACHE_VERSION, __version__, sys.version_info[:2]),
+                "sources": sources,
+            }
+
+        size = 0
+        while True:
+            header_bytes = pickle.dumps(layout(size), protocol=pickle.HIGHEST_PROTOCOL)
+            if len(header_bytes) == size:
+                break
+            size = len(header_bytes)
+        header = layout(size)
+
+        tmp_path = self.cache_path + ".tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(_HEADER_SIZE.pack(size))
+                f.write(header_bytes)
+                for _, _, blob in blobs:
+                    f.write(blob)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            # Read-only content: keep the compiled blobs for this run only
+            self.warn(f"Warning: Could not write content cache {self.cache_path}: {e}")
+            self._blobs = {name: blob for name, _, blob in blobs}
+        return header
+
+    def manifest(self) -> List[ExerciseInfo]:
+        """Manifest entries for every exercise, ordered by number."""
+        infos = []
+        for source in self.header()["sources"].values():
+            exercise_id, number, title, questions, points, name = source["entry"]
+            infos.append(ExerciseInfo(
+                exercise_id, number, title, questions, points, name,
+                loader=partial(self.load, exercise_id)
+            ))
+        infos.sort(key=lambda info: info.number)
+        return infos
+
+    def load(self, exercise_id: str) -> Exercise:
+        """Get an exercise, unpickling it from the cache on first use."""
+        exercise = self._loaded.get(exercise_id)
+        if exercise is None:
+            for name, source in self.header()["sources"].items():
+                if source["entry"][0] == exercise_id:
+                    break
+            else:
+                raise KeyError(exercise_id)
+            if name in self._blobs:
+                blob = self._blobs[name]
+            else:
+                blob = self._read_blob(source["offset"], source["length"])
+            try:
+                exercise = pickle.loads(blob)
+            except Exception:
+                # As in _read_header: any failure means a damaged entry
+                exercise = None
+            if not isinstance(exercise, Exercise):
+                return self._recompile(name, exercise_id)
+            self._loaded[exercise_id] = exercise
+        return exercise
+
+    def _recompile(self, name: str, exercise_id: str) -> Exercise:
+        """Rebuild a corrupt cache entry from its content file."""
+        self.warn(f"Warning: Content cache entry for {name} is corrupt; recompiling it")
+        header = self.header()
+        previous = dict(header, sources={
+            other: source for other, source in header["sources"].items() if other != name
+        })
+        self._header = self.compile(previous=previous)
+        exercise = self._loaded.get(exercise_id)
+        if exercise is None:
+            raise KeyError(exercise_id)
+        return exercise
+
+    def load_all(self) -> List[Exercise]:
+        """Get every exercise, ordered by number."""
+        return [info.load() for info in self.manifest()]
@@ -1,11 +1,13 @@
 """Core game engine for the CYOA application."""
 
-from typing import List, Optional, Callable
+import time
+from typing import List, Optional, Callable, Tuple, Union
 from datetime import datetime
 
 from . import ui
 from .progress import ProgressManager
 from .feedback import evaluate_answer, display_feedback
+from .index import ContentIndex
 from .scenarios.base import (
     Exercise,
     Scenario,
@@ -16,33 +18,60 @@ from .scenarios.base import (
     ChecklistQuestion,
     QuestionType,
 )
+from .scenarios.registry import ExerciseInfo
 
 
 class GameEngine:
     """Main game engine handling navigation and flow."""
 
-    def __init__(self, data_dir: str = "data"):
-        """Initialize the game engine."""
-        self.progress = ProgressManager(data_dir)
-        self.exercises: List[Exercise] = []
+    def __init__(
+        self,
+        data_dir: str = "data",
+        progress: Optional[ProgressManager] = None,
+        index: Optional[ContentIndex] = None
+    ):
+        """
+        Initialize the game engine.
+
+        Args:
+            data_dir: Directory holding progress files
+            progress: Progress manager to use (defaults to the
+                single-learner JSON file in data_dir)
+            index: Content index whose exercises are already registered
+                (shared by the server's sessions)
+        """
+        self.progress = progress or ProgressManager(data_dir)
+        self.index = index or ContentIndex()
+        self.exercises: List[Union[Exercise, ExerciseInfo]] = self.index.entries()
         self.current_exercise: Optional[Exercise] = None
         self.current_scenario: Optional[Scenario] = None
         self.running = True
 
-    def register_exercise(self, exercise: Exercise):
-        """Register an exercise with the engine."""
-        self.exercises.append(exercise)
-        # Sort by exercise number
-        self.exercises.sort(key=lambda e: e.number)
+    def register_exercise(self, exercise: Union[Exercise, ExerciseInfo]):
+        """
+        Register an exercise with the engine.
+
+        A manifest entry (ExerciseInfo) is enough for the menus; the
+        full exercise is built when the learner enters it.
+        """
+        self.index.add(exercise)
+        self.exercises = self.index.entries()
 
     def run(self):
+        """Run the main game loop on the local terminal."""
+        try:
+            ui.run_blocking(self.main_loop())
+        finally:
+            ui.flush()
+
+    async def main_loop(self):
         """Main game loop."""
         self.running = True
 
         while self.running:
-            self.show_main_menu()
+            await self.show_main_menu()
 
-    def show_main_menu(self):
+    async def show_main_menu(self):
         """Display the main menu."""
         ui.clear_screen()
         ui.print_header(
@@ -67,43 +96,93 @@ class GameEngine:
         ui.print_menu(options)
 
         if existing:
-            choice = ui.get_input("> ", ["1", "2", "3", "Q"])
+            choice = await ui.get_input("> ", ["1", "2", "3", "Q"])
             if choice == "1":
-                self.show_exercise_menu()
+                await self.continue_session()
             elif choice == "2":
-                self.confirm_new_session()
+                await self.confirm_new_session()
             elif choice == "3":
-                self.show_progress()
+                await self.show_progress()
             elif choice == "Q":
                 self.exit_game()
         else:
-            choice = ui.get_input("> ", ["1", "Q"])
+            choice = await ui.get_input("> ", ["1", "Q"])
             if choice == "1":
                 self.progress.new_session()
                 self.progress.save_session()
-                self.show_exercise_menu()
+                await self.show_exercise_menu()
             elif choice == "Q":
                 self.exit_game()
 
-    def confirm_new_session(self):
+    async def continue_session(self):
+        """Go straight to the next unanswered question, then the exercise menu."""
+        point = self.resume_point()
+        if point is not None:
+            exercise, scenario_pos, question_pos = point
+            await self.run_exercise(exercise, start=(scenario_pos, question_pos))
+        if self.running:
+            await self.show_exercise_menu()
+
+    def resume_point(self) -> Optional[Tuple[Exercise, int, int]]:
+        """
+        Find where the learner left off.
+
+        Starts from the session's resume cursor (the last answer
+        recorded) and moves past questions that already have answers.
+
+        Returns:
+            Tuple of (exercise, scenario index, question index) of the
+            next unanswered question, or None if there is no cursor or
+            the rest of its exercise is answered
+        """
+        session = self.progress.session
+        if session is None or session.resume is None:
+            return None
+
+        exercise_id, _, question_id = session.resume
+        try:
+            exercise = self.index.exercise(exercise_id)
+            location = self.index.locate(question_id)
+        except KeyError:
+            # Content changed since the answer was recorded
+            return None
+        if location.exercise is not exercise:
+            return None
+
+        ex_progress = session.exercises.get(exercise_id)
+        scenario_pos = location.scenario_position
+        question_pos = location.position + 1
+        while scenario_pos < len(exercise.scenarios):
+            scenario = exercise.scenarios[scenario_pos]
+            sc_progress = ex_progress.scenarios.get(scenario.id) if ex_progress else None
+            answered = sc_progress.questions if sc_progress else {}
+            for position in range(question_pos, len(scenario.questions)):
+                q_progress = answered.get(scenario.questions[position].id)
+                if q_progress is None or not q_progress.answered:
+                    return exercise, scenario_pos, position
+            scenario_pos += 1
+            question_pos = 0
+        return None
+
+    async def confirm_new_session(self):
         """Confirm starting a new session (losing existing progress)."""
         ui.clear_screen()
         ui.print_header("START NEW SESSION")
 
-        print(f"{ui.Colors.YELLOW}Warning: This will erase your existing progress.{ui.Colors.RESET}")
-        print()
+        ui.out(f"{ui.Colors.YELLOW}Warning: This will erase your existing progress.{ui.Colors.RESET}")
+        ui.out()
 
         options = [("Y", "Yes, start fresh"), ("N", "No, go back")]
         ui.print_menu(options)
 
-        choice = ui.get_input("> ", ["Y", "N"])
+        choice = await ui.get_input("> ", ["Y", "N"])
         if choice == "Y":
             self.progress.reset_progress()
             self.progress.new_session()
             self.progress.save_session()
-            self.show_exercise_menu()
+            await self.show_exercise_menu()
 
-    def show_exercise_menu(self):
+    async def show_exercise_menu(self):
         """Display the exercise selection menu."""
         while self.running:
             ui.clear_screen()
@@ -130,18 +209,23 @@ class GameEngine:
             ui.print_menu(options)
 
             valid = [str(i) for i in range(1, len(self.exercises) + 1)] + ["P", "B"]
-            choice = ui.get_input("> ", valid)
+            choice = await ui.get_input("> ", valid)
 
             if choice == "B":
                 return
             elif choice == "P":
-                self.show_progress()
+                await self.show_progress()
             elif choice.isdigit():
                 idx = int(choice) - 1
                 if 0 <= idx < len(self.exercises):
-                    self.run_exercise(self.exercises[idx])
-
-    def show_progress(self):
+                    # Pick up an in-progress exercise where it was left
+                    point = self.resume_point()
+                    if point is not None and point[0].id == self.exercises[idx].id:
+                        await self.run_exercise(point[0], start=point[1:])
+                    else:
+                        await self.run_exercise(self.exercises[idx])
+
+    async def show_progress(self):
         """Display progress summary."""
         ui.clear_screen()
         ui.print_header("YOUR PROGRESS")
@@ -149,7 +233,7 @@ class GameEngine:
         summary = self.progress.get_summary()
 
         if not summary.get("has_progress"):
-            print("No progress recorded yet. Start an exercise to begin!")
+            ui.out("No progress recorded yet. Start an exercise to begin!")
         else:
             # Overall progress
             ui.print_progress_bar(
@@ -157,7 +241,7 @@ class GameEngine:
                 100,
                 label="Overall Progress"
             )
-            print()
+            ui.out()
 
             # Per-exercise progress
             for exercise in self.exercises:
@@ -173,45 +257,46 @@ class GameEngine:
                 pct = ex_data.get("completion_pct", 0)
                 score = ex_data.get("score", 0)
 
-                print(f"\n{ui.Colors.BOLD}Exercise {exercise.number}: {exercise.title}{ui.Colors.RESET}")
-                print(f"  Status: {status}")
+                ui.out(f"\n{ui.Colors.BOLD}Exercise {exercise.number}: {exercise.title}{ui.Colors.RESET}")
+                ui.out(f"  Status: {status}")
                 if ex_data.get("started"):
                     ui.print_progress_bar(int(pct), 100, width=25, label="  Progress")
-                    print(f"  Score: {score:.1f} points")
+                    ui.out(f"  Score: {score:.1f} points")
 
-            print()
-            print(f"{ui.Colors.DIM}Session started: {summary.get('created', 'Unknown')}{ui.Colors.RESET}")
-            print(f"{ui.Colors.DIM}Last updated: {summary.get('last_updated', 'Unknown')}{ui.Colors.RESET}")
+            ui.out()
+            ui.out(f"{ui.Colors.DIM}Session started: {summary.get('created', 'Unknown')}{ui.Colors.RESET}")
+            ui.out(f"{ui.Colors.DIM}Last updated: {summary.get('last_updated', 'Unknown')}{ui.Colors.RESET}")
 
-        ui.wait_for_enter()
+        await ui.wait_for_enter()
 
-    def run_exercise(self, exercise: Exercise):
-        """Run through an exercise."""
+    async def run_exercise(
+        self,
+        exercise: Union[Exercise, ExerciseInfo],
+        start: Optional[Tuple[int, int]] = None
+    ):
+        """
+        Run through an exercise.
+
+        Args:
+            exercise: Exercise to run
+            start: (scenario index, question index) to resume at; the
+                intro and everything before that question are skipped
+        """
+        if isinstance(exercise, ExerciseInfo):
+            exercise = exercise.load()
+        self.index.add(exercise)
         self.current_exercise = exercise
+        start_scenario, start_question = start or (0, 0)
 
-        # Show exercise intro
-        ui.clear_screen()
-        ui.print_header(
-            f"EXERCISE {exercise.number}: {exercise.title.upper()}",
-            f"Estimated Time: {exercise.estimated_time}"
-        )
-
-        print(ui.wrap_text(exercise.description))
-        print()
-
-        if exercise.objectives:
-            print(f"{ui.Colors.BOLD}Objectives:{ui.Colors.RESET}")
-            for obj in exercise.objectives:
-                print(f"  • {obj}")
-            print()
-
-        ui.wait_for_enter("Press Enter to begin...")
+        if start is None:
+            await self.show_exercise_intro(exercise)
 
         # Run each scenario
-        for scenario in exercise.scenarios:
+        for position in range(start_scenario, len(exercise.scenarios)):
             if not self.running:
                 break
-            completed = self.run_scenario(exercise, scenario)
+            first = start_question if position == start_scenario else 0
+            completed = await self.run_scenario(exercise, exercise.scenarios[position], first)
             if not completed:
                 # User quit mid-exercise, return to menu
                 self.current_exercise = None
@@ -231,33 +316,57 @@ class GameEngine:
             ui.print_header("EXERCISE COMPLETE!")
 
             score = ex_progress.get_score()
-            total = exercise.get_total_points()
+            total = self.index.exercise_points(exercise.id)
 
-            print(f"{ui.Colors.GREEN}Congratulations!{ui.Colors.RESET}")
-            print(f"\nYou've completed Exercise {exercise.number}: {exercise.title}")
-            print(f"\nYour score: {score:.1f} / {total} points ({score/total*100:.0f}%)")
+            ui.out(f"{ui.Colors.GREEN}Congratulations!{ui.Colors.RESET}")
+            ui.out(f"\nYou've completed Exercise {exercise.number}: {exercise.title}")
+            ui.out(f"\nYour score: {score:.1f} / {total} points ({score/total*100:.0f}%)")
 
-            ui.wait_for_enter()
+            await ui.wait_for_enter()
 
         self.current_exercise = None
 
-    def run_scenario(self, exercise: Exercise, scenario: Scenario) -> bool:
-        """Run through a scenario. Returns False if user quit mid-scenario."""
+    async def show_exercise_intro(self, exercise: Exercise):
+        """Show an exercise's description and objectives."""
+        ui.clear_screen()
+        ui.print_header(
+            f"EXERCISE {exercise.number}: {exercise.title.upper()}",
+            f"Estimated Time: {exercise.estimated_time}"
+        )
+
+        ui.out(ui.wrap_text(exercise.description))
+        ui.out()
+
+        if exercise.objectives:
+            ui.out(f"{ui.Colors.BOLD}Objectives:{ui.Colors.RESET}")
+            for obj in exercise.objectives:
+                ui.out(f"  • {obj}")
+            ui.out()
+
+        await ui.wait_for_enter("Press Enter to begin...")
+
+    async def run_scenario(self, exercise: Exercise, scenario: Scenario, start: int = 0) -> bool:
+        """
+        Run through a scenario from question index start.
+
+        Returns:
+            False if the user quit mid-scenario
+        """
         self.current_scenario = scenario
 
-        # Check if already completed
+        # Check if already completed (a resumed scenario never asks)
         sc_progress = self.progress.get_scenario_progress(exercise.id, scenario.id)
-        if sc_progress.completed:
+        if sc_progress.completed and start == 0:
             # Ask if user wants to redo
             ui.clear_screen()
             ui.print_scenario_title(scenario.title)
-            print(f"{ui.Colors.GREEN}You've already completed this scenario.{ui.Colors.RESET}")
-            print()
+            ui.out(f"{ui.Colors.GREEN}You've already completed this scenario.{ui.Colors.RESET}")
+            ui.out()
 
             options = [("R", "Redo scenario"), ("S", "Skip to next"), ("B", "Back to menu")]
             ui.print_menu(options)
 
-            choice = ui.get_input("> ", ["R", "S", "B"])
+            choice = await ui.get_input("> ", ["R", "S", "B"])
             if choice == "S":
                 return True
             elif choice == "B":
@@ -265,10 +374,10 @@ class GameEngine:
                 return False
 
         # Run each question
-        for i, question in enumerate(scenario.questions, 1):
+        for i, question in enumerate(scenario.questions[start:], start + 1):
             if not self.running:
                 break
-            completed = self.run_question(exercise, scenario, question, i)
+            completed = await self.run_question(exercise, scenario, question, i)
             if not completed:
                 # User quit mid-scenario
                 self.current_scenario = None
@@ -280,50 +389,78 @@ class GameEngine:
         self.current_scenario = None
         return True
 
-    def run_question(
+    def render_question(
         self,
         exercise: Exercise,
         scenario: Scenario,
         question: Question,
         number: int
-    ) -> bool:
-        """Run a single question. Returns False if user quit."""
+    ):
+        """Draw the question screen up to the answer prompt."""
         # Clear screen and reprint scenario context for each question
         ui.clear_screen()
         ui.print_header(f"EXERCISE {exercise.number}: {exercise.title.upper()}")
         ui.print_scenario_title(scenario.title)
-        print(ui.wrap_text(scenario.description))
-        print()
+        ui.out(ui.wrap_text(scenario.description))
+        ui.out()
         ui.print_divider()
 
         ui.print_question(number, question.text)
-        print(f"{ui.Colors.DIM}(Enter Q to quit to menu){ui.Colors.RESET}")
-        print()
+        ui.out(f"{ui.Colors.DIM}(Enter Q to quit to menu){ui.Colors.RESET}")
+        ui.out()
+
+    async def run_question(
+        self,
+        exercise: Exercise,
+        scenario: Scenario,
+        question: Question,
+        number: int
+    ) -> bool:
+        """
+        Run a single question. Returns False if user quit.
+
+        Records four timings per answer in the learner's latency
+        sketches: render (laying out the question screen), think
+        (prompt to submitted answer), grade and persist.
+        """
+        timing = self.progress.record_timing
+        started = time.perf_counter()
+        self.render_question(exercise, scenario, question, number)
+        rendered = time.perf_counter()
+        timing(question.id, "render", rendered - started)
 
         # Get answer based on question type
         if isinstance(question, MultipleChoiceQuestion):
-            answer = self.get_multiple_choice_answer(question)
+            answer = await self.get_multiple_choice_answer(question)
         elif isinstance(question, RankingQuestion):
-            answer = self.get_ranking_answer(question)
+            answer = await self.get_ranking_answer(question)
         elif isinstance(question, FreeTextQuestion):
-            answer = self.get_free_text_answer(question)
+            answer = await self.get_free_text_answer(question)
         elif isinstance(question, ChecklistQuestion):
-            answer = self.get_checklist_answer(question)
+            answer = await self.get_checklist_answer(question)
         else:
             # Default to text input
-            answer = ui.get_text_input("Your answer:", min_length=5)
+            answer = await ui.get_text_input("Your answer:", min_length=5)
+
+        answered = time.perf_counter()
 
         # Check if user quit
         if answer == "Q":
+            # Write out any answers held since the last scenario boundary
+            self.progress.flush()
             return False
+        timing(question.id, "think", answered - rendered)
 
         # Evaluate answer
         is_correct, score, feedback = evaluate_answer(question, answer)
+        graded = time.perf_counter()
+        timing(question.id, "grade", graded - answered)
 
         # Display feedback
         display_feedback(is_correct, score, feedback, question.model_answer)
 
         # Record progress
+        saving = time.perf_counter()
         self.progress.record_answer(
             exercise.id,
             scenario.id,
@@ -332,65 +469,75 @@ class GameEngine:
             is_correct,
             score
         )
+        timing(question.id, "persist", time.perf_counter() - saving)
 
-        ui.wait_for_enter()
+        await ui.wait_for_enter()
         return True
 
-    def get_multiple_choice_answer(self, question: MultipleChoiceQuestion) -> str:
+    async def get_multiple_choice_answer(self, question: MultipleChoiceQuestion) -> str:
         """Get answer for multiple choice question. Returns 'Q' if user quit."""
         ui.print_options(question.options)
 
         valid_keys = [opt[0].upper() for opt in question.options] + ["Q"]
-        return ui.get_input("Your answer: ", valid_keys)
+        return await ui.get_input("Your answer: ", valid_keys)
 
-    def get_ranking_answer(self, question: RankingQuestion) -> List[int]:
+    async def get_ranking_answer(self, question: RankingQuestion) -> List[int]:
         """Get answer for ranking question."""
-        return ui.get_ranking_input(question.items, question.num_ranks)
+        return await ui.get_ranking_input(question.items, question.num_ranks)
 
-    def get_free_text_answer(self, question: FreeTextQuestion) -> str:
+    async def get_free_text_answer(self, question: FreeTextQuestion) -> str:
         """Get answer for free text question."""
         if question.hint:
-            print(f"{ui.Colors.DIM}Hint: {question.hint}{ui.Colors.RESET}")
-            print()
+            ui.out(f"{ui.Colors.DIM}Hint: {question.hint}{ui.Colors.RESET}")
+            ui.out()
 
-        return ui.get_text_input("Your answer:", min_length=20)
+        return await ui.get_text_input("Your answer:", min_length=20)
 
-    def get_checklist_answer(self, question: ChecklistQuestion):
-        """Get answer for checklist question. Returns 'Q' if user quit."""
-        print(f"{ui.Colors.DIM}(Enter letters separated by commas, e.g., A,B,D){ui.Colors.RESET}")
-        print()
+    async def get_checklist_answer(self, question: ChecklistQuestion):
+        """Get answer for checklist question as a selection mask. Returns 'Q' if user quit."""
+        ui.out(f"{ui.Colors.DIM}(Enter letters separated by commas, e.g., A,B,D){ui.Colors.RESET}")
+        ui.out()
 
         for key, text in question.options:
-            print(f"  {ui.Colors.CYAN}[{key}]{ui.Colors.RESET} {text}")
-        print()
+            ui.out(f"  {ui.Colors.CYAN}[{key}]{ui.Colors.RESET} {text}")
+        ui.out()
 
         while True:
-            response = ui.get_input("Your selections: ")
+            response = await ui.get_input("Your selections: ")
 
             # Check for quit
             if response.strip().upper() == "Q":
                 return "Q"
 
-            # Parse comma-separated values
-            selections = [s.strip().upper() for s in response.split(",") if s.strip()]
+            # Parse comma-separated values straight into a selection mask
+            mask = 0
+            for selection in response.split(","):
+                selection = selection.strip().upper()
+                if not selection:
+                    continue
+                bit = question.option_bits.get(selection)
+                if bit is None or not bit & question.options_mask:
+                    mask = 0
+                    break
+                mask |= bit
 
-            valid_keys = [opt[0].upper() for opt in question.options]
-            if all(s in valid_keys for s in selections) and selections:
-                return selections
+            if mask:
+                return mask
 
-            print(f"{ui.Colors.YELLOW}Please enter valid options separated by commas.{ui.Colors.RESET}")
+            ui.out(f"{ui.Colors.YELLOW}Please enter valid options separated by commas.{ui.Colors.RESET}")
 
     def exit_game(self):
         """Exit the game."""
         ui.clear_screen()
-        print()
-        print(f"{ui.Colors.CYAN}Thank you for using the Cybersecurity Foundations Training Lab!{ui.Colors.RESET}")
-        print()
+        ui.out()
+        ui.out(f"{ui.Colors.CYAN}Thank you for using the Cybersecurity Foundations Training Lab!{ui.Colors.RESET}")
+        ui.out()
 
         if self.progress.session:
+            self.progress.flush()
             summary = self.progress.get_summary()
-            print(f"Your progress ({summary.get('completion_pct', 0):.0f}% complete) has been saved.")
-            print("You can continue where you left off next time.")
-            print()
+            ui.out(f"Your progress ({summary.get('completion_pct', 0):.0f}% complete) has been saved.")
+            ui.out("You can continue where you left off next time.")
+            ui.out()
 
         self.running = False
@@ -1,9 +1,13 @@
 """Feedback and answer evaluation utilities."""
 
-import re
-from typing import List, Tuple, Optional
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Hashable, List, Tuple, Optional
 from difflib import SequenceMatcher
 
+from .keywords import KeywordMatcher
+from .ranking import inverse_permutation
+
 from .scenarios.base import (
     Question,
     MultipleChoiceQuestion,
@@ -15,10 +19,89 @@ from .scenarios.base import (
 from . import ui
 
 
+class _LRUCache:
+    """Bounded mapping that evicts the least recently used entry."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Any:
+        """Get a cached value, or None on a miss."""
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        """Cache a value, evicting the oldest entry when full."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def info(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+        }
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+
+# Graded results by (question id, rubric version, canonical answer), and
+# rendered feedback frames by their content and the terminal width.
+# Large classes repeat the same few answers, so most lookups hit.
+GRADE_CACHE_SIZE = 4096
+FRAME_CACHE_SIZE = 1024
+
+_grade_cache = _LRUCache(GRADE_CACHE_SIZE)
+_frame_cache = _LRUCache(FRAME_CACHE_SIZE)
+
+
+def canonical_answer(question: Question, answer) -> Optional[Hashable]:
+    """
+    Reduce an answer to a hashable form that grades identically.
+
+    Returns:
+        Canonical answer, or None if the answer should not be cached
+        (free text, or anything check_answer treats specially)
+    """
+    if isinstance(question, MultipleChoiceQuestion):
+        return answer.upper() if isinstance(answer, str) else None
+
+    if isinstance(question, ChecklistQuestion):
+        if isinstance(answer, int):
+            return answer
+        if isinstance(answer, list) and all(isinstance(a, str) for a in answer):
+            mask, unknown = question.mask_of(answer)
+            return mask if not unknown else None
+        return None
+
+    if isinstance(question, RankingQuestion):
+        if isinstance(answer, list) and all(type(a) is int for a in answer):
+            return tuple(answer)
+        return None
+
+    return None
+
+
 def evaluate_answer(question: Question, answer) -> Tuple[bool, float, str]:
     """
     Evaluate an answer to a question.
 
+    Results for repeated answers are served from the grading cache.
+
     Args:
         question: The question being answered
         answer: The user's answer
@@ -26,7 +109,16 @@ def evaluate_answer(question: Question, answer) -> Tuple[bool, float, str]:
     Returns:
         Tuple of (is_correct, score, feedback)
     """
-    return question.check_answer(answer)
+    canonical = canonical_answer(question, answer)
+    if canonical is None:
+        return question.check_answer(answer)
+
+    key = (question.id, question.rubric_version, canonical)
+    result = _grade_cache.get(key)
+    if result is None:
+        result = question.check_answer(answer)
+        _grade_cache.put(key, result)
+    return result
 
 
 def display_feedback(
@@ -39,6 +131,9 @@ def display_feedback(
     """
     Display feedback to the user.
 
+    The rendered frame is cached, so repeated feedback is not laid out
+    again.
+
     Args:
         is_correct: Whether the answer was fully correct
         score: Score earned (0 to max points)
@@ -46,45 +141,68 @@ def display_feedback(
         model_answer: Optional model answer to show
         show_model: Whether to show the model answer
     """
-    if is_correct:
-        ui.print_success_box(feedback)
-    elif score > 0:
-        ui.print_partial_box(feedback)
-    else:
-        ui.print_incorrect_box(feedback)
+    outcome = "correct" if is_correct else "partial" if score > 0 else "incorrect"
+    model_answer = model_answer if show_model else None
+    key = (outcome, feedback, model_answer, ui.get_terminal_width())
+
+    frame = _frame_cache.get(key)
+    if frame is None:
+        with ui.capture() as buffer:
+            if outcome == "correct":
+                ui.print_success_box(feedback)
+            elif outcome == "partial":
+                ui.print_partial_box(feedback)
+            else:
+                ui.print_incorrect_box(feedback)
+
+            if model_answer:
+                ui.print_model_answer(model_answer)
+        frame = buffer.getvalue()
+        _frame_cache.put(key, frame)
 
-    if show_model and model_answer:
-        ui.print_model_answer(model_answer)
+    ui.out(frame, end="")
 
 
-def keyword_match_score(text: str, keywords: List[str]) -> Tuple[int, List[str], List[str]]:
+def grade_cache_info() -> dict:
+    """
+    Get grading cache statistics.
+
+    Returns:
+        Dictionary with "grades" and "frames" entries, each holding
+        hits, misses, hit_rate and size
+    """
+    return {"grades": _grade_cache.info(), "frames": _frame_cache.info()}
+
+
+def clear_grade_cache():
+    """Drop all cached grades and feedback frames and reset the counters."""
+    _grade_cache.clear()
+    _frame_cache.clear()
+
+
+@lru_cache(maxsize=256)
+def _keyword_matcher(keywords: Tuple[str, ...], whole_words: bool) -> KeywordMatcher:
+    """Compiled matcher for a keyword list, shared across calls."""
+    return KeywordMatcher(keywords, whole_words)
+
+
+def keyword_match_score(
+    text: str,
+    keywords: List[str],
+    whole_words: bool = False
+) -> Tuple[int, List[str], List[str]]:
     """
     Check how many keywords are present in text.
 
     Args:
         text: The text to search
         keywords: List of keywords to find
+        whole_words: Only count keywords found on word boundaries
 
     Returns:
         Tuple of (count_found, keywords_found, keywords_missing)
     """
-    text_lower = text.lower()
-    found = []
-    missing = []
-
-    for keyword in keywords:
-        # Handle multi-word keywords and variations
-        kw_lower = keyword.lower()
-
-        # Try exact match first
-        if kw_lower in text_lower:
-            found.append(keyword)
-        # Try word boundary match
-        elif re.search(r'\b' + re.escape(kw_lower) + r'\b', text_lower):
-            found.append(keyword)
-        else:
-            missing.append(keyword)
-
+    found, missing = _keyword_matcher(tuple(keywords), whole_words).split(text)
     return (len(found), found, missing)
 
 
@@ -196,24 +314,23 @@ def compare_rankings(user_ranking: List[int], correct_ranking: List[int]) -> dic
     Returns:
         Dictionary with comparison details
     """
+    # Position of each item in the correct ranking (inverse permutation)
+    correct_positions = inverse_permutation(correct_ranking)
+
     exact_matches = sum(
-        1 for i, val in enumerate(user_ranking)
-        if i < len(correct_ranking) and val == correct_ranking[i]
+        1 for mine, right in zip(user_ranking, correct_ranking) if mine == right
     )
 
     # Check if items are at least in the list (order agnostic)
-    items_included = sum(
-        1 for val in user_ranking
-        if val in correct_ranking
-    )
+    items_included = sum(1 for val in user_ranking if val in correct_positions)
 
     # Calculate order correlation (simplified)
     total = len(correct_ranking)
-    position_errors = 0
-    for i, val in enumerate(user_ranking):
-        if val in correct_ranking:
-            correct_pos = correct_ranking.index(val)
-            position_errors += abs(i - correct_pos)
+    position_errors = sum(
+        abs(i - correct_positions[val])
+        for i, val in enumerate(user_ranking)
+        if val in correct_positions
+    )
 
     max_errors = total * (total - 1)  # Maximum possible position errors
     order_score = 1 - (position_errors / max_errors) if max_errors > 0 else 1
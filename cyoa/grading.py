@@ -0,0 +1,207 @@
+"""Batch grading: score many answers to one question at once."""
+
+from typing import Any, List, Optional, Sequence, Tuple
+
+from .scenarios.base import (
+    Question,
+    MultipleChoiceQuestion,
+    RankingQuestion,
+    ChecklistQuestion,
+)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def numpy_available() -> bool:
+    """Check whether NumPy can be used for batch grading."""
+    return np is not None
+
+
+def grade_batch(
+    question: Question,
+    answers: Sequence[Any],
+    use_numpy: Optional[bool] = None
+) -> Tuple[Sequence[bool], Sequence[float]]:
+    """
+    Grade a cohort's answers to one question.
+
+    Gives the same is_correct and score as calling question.check_answer
+    on each answer, without building per-answer sets or walking lists in
+    Python for every call. Checklist answers are encoded as bitmasks and
+    rankings as an integer matrix; question types without a vectorized
+    path are graded answer by answer.
+
+    Args:
+        question: The question every answer responds to
+        answers: Answers in the form check_answer accepts
+        use_numpy: Use NumPy arrays (default: when NumPy is installed)
+
+    Returns:
+        Tuple of (is_correct, scores). These are NumPy bool and float
+        arrays when NumPy is used, otherwise lists.
+    """
+    if use_numpy is None:
+        use_numpy = np is not None
+    elif use_numpy and np is None:
+        raise ImportError("NumPy is not installed")
+
+    if isinstance(question, MultipleChoiceQuestion):
+        return _grade_multiple_choice(question, answers, use_numpy)
+    if isinstance(question, ChecklistQuestion):
+        return _grade_checklist(question, answers, use_numpy)
+    if (
+        isinstance(question, RankingQuestion)
+        and question.scoring == "position"
+        and _is_ranking(question.correct_answer)
+        and all(_is_ranking(answer) for answer in answers)
+    ):
+        return _grade_ranking(question, answers, use_numpy)
+    return _grade_each(question, answers, use_numpy)
+
+
+def _grade_each(question: Question, answers: Sequence[Any], use_numpy: bool):
+    """Fallback: grade answer by answer through check_answer."""
+    is_correct = []
+    scores = []
+    for answer in answers:
+        correct, score, _ = question.check_answer(answer)
+        is_correct.append(correct)
+        scores.append(score)
+    if use_numpy:
+        return np.array(is_correct, dtype=bool), np.array(scores, dtype=float)
+    return is_correct, scores
+
+
+def _grade_multiple_choice(question: MultipleChoiceQuestion, answers: Sequence[str], use_numpy: bool):
+    correct_key = question.correct_answer.upper()
+    is_correct = [answer.upper() == correct_key for answer in answers]
+
+    if use_numpy:
+        is_correct = np.array(is_correct, dtype=bool)
+        return is_correct, np.where(is_correct, float(question.points), 0.0)
+    return is_correct, [question.points if correct else 0 for correct in is_correct]
+
+
+def _checklist_masks(question: ChecklistQuestion, answers: Sequence[Any]) -> List[int]:
+    """
+    Encode each answer as a bitmask over the question's option bits.
+
+    Answers may already be masks. Selections that are not options get
+    further bits in the order they are first seen, so they still count
+    as incorrect selections.
+    """
+    bits = dict(question.option_bits)
+
+    def mask_of(selections) -> int:
+        if isinstance(selections, int):
+            return selections
+        mask = 0
+        for selection in selections:
+            key = selection.upper()
+            bit = bits.get(key)
+            if bit is None:
+                bit = bits[key] = 1 << len(bits)
+            mask |= bit
+        return mask
+
+    return [mask_of(answer) for answer in answers]
+
+
+def _grade_checklist(question: ChecklistQuestion, answers: Sequence[Sequence[str]], use_numpy: bool):
+    correct_mask = question.correct_mask
+    masks = _checklist_masks(question, answers)
+    total_correct = bin(correct_mask).count("1")
+    points = question.points
+    width = max([correct_mask.bit_length()] + [mask.bit_length() for mask in masks])
+
+    if use_numpy and width <= 63:
+        masks = np.array(masks, dtype=np.int64)
+        correct_selected = _popcount(masks & correct_mask, width)
+        incorrect_selected = _popcount(masks & ~correct_mask, width)
+
+        is_correct = masks == correct_mask
+        scores = np.zeros(len(masks), dtype=float)
+        if total_correct:
+            some_none_wrong = (correct_selected > 0) & (incorrect_selected == 0)
+            more_right = ~some_none_wrong & (correct_selected > incorrect_selected)
+            scores = np.where(some_none_wrong, (correct_selected / total_correct) * points, scores)
+            scores = np.where(
+                more_right,
+                np.maximum(0, (correct_selected - incorrect_selected) / total_correct) * points,
+                scores
+            )
+        scores = np.where(is_correct, float(points), scores)
+        return is_correct, scores
+
+    is_correct = []
+    scores = []
+    for mask in masks:
+        if mask == correct_mask:
+            is_correct.append(True)
+            scores.append(points)
+            continue
+        correct_selected = bin(mask & correct_mask).count("1")
+        incorrect_selected = bin(mask & ~correct_mask).count("1")
+        is_correct.append(False)
+        if correct_selected > 0 and incorrect_selected == 0:
+            scores.append((correct_selected / total_correct) * points)
+        elif correct_selected > incorrect_selected:
+            scores.append(max(0, (correct_selected - incorrect_selected) / total_correct) * points)
+        else:
+            scores.append(0)
+
+    if use_numpy:
+        return np.array(is_correct, dtype=bool), np.array(scores, dtype=float)
+    return is_correct, scores
+
+
+def _popcount(masks, width: int):
+    """Set bits per element of a non-negative int64 array."""
+    counts = np.zeros(masks.shape, dtype=np.int64)
+    for bit in range(width):
+        counts += (masks >> bit) & 1
+    return counts
+
+
+def _is_ranking(answer: Any) -> bool:
+    return isinstance(answer, list) and all(type(item) is int for item in answer)
+
+
+def _grade_ranking(question: RankingQuestion, answers: Sequence[List[int]], use_numpy: bool):
+    correct = list(question.correct_answer)
+    size = len(correct)
+    points = question.points
+
+    if use_numpy:
+        # One row per answer, truncated or zero-padded to the correct length
+        lengths = np.array([len(answer) for answer in answers], dtype=np.int64)
+        matrix = np.array(
+            [answer[:size] + [0] * (size - len(answer)) for answer in answers],
+            dtype=np.int64
+        ).reshape(len(answers), size)
+        filled = np.arange(size) < np.minimum(lengths, size)[:, None]
+
+        matches = (matrix == np.array(correct, dtype=np.int64)) & filled
+        correct_positions = matches.sum(axis=1)
+        is_correct = (lengths == size) & (correct_positions == size)
+
+        scores = np.zeros(len(answers), dtype=float)
+        if size:
+            scores = (correct_positions / size) * points
+        scores = np.where(is_correct, float(points), scores)
+        return is_correct, scores
+
+    is_correct = []
+    scores = []
+    for answer in answers:
+        if answer == correct:
+            is_correct.append(True)
+            scores.append(points)
+            continue
+        correct_positions = sum(1 for mine, right in zip(answer, correct) if mine == right)
+        is_correct.append(False)
+        scores.append((correct_positions / size) * points if correct_positions > 0 else 0)
+    return is_correct, scores
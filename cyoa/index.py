@@ -0,0 +1,161 @@
+"""Content index: id lookups and totals for registered exercises."""
+
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+from .scenarios.base import Exercise, Scenario, Question
+from .scenarios.registry import ExerciseInfo
+
+
+class QuestionLocation(NamedTuple):
+    """Where a question lives in the content."""
+
+    exercise: Exercise
+    scenario: Scenario
+    question: Question
+    scenario_position: int  # index of the scenario in the exercise
+    position: int  # index of the question in the scenario
+
+
+class ContentIndex:
+    """
+    Id-keyed maps over every registered exercise.
+
+    Exercises are indexed once, when added, so lookups by exercise,
+    scenario or question id and point/question totals are dictionary
+    reads instead of walks over the exercise and scenario lists.
+
+    Manifest entries (ExerciseInfo) can be added without building the
+    exercise: its totals come from the manifest, and it is built and
+    indexed the first time one of its scenarios or questions is looked
+    up.
+    """
+
+    def __init__(self, exercises: Optional[List[Union[Exercise, ExerciseInfo]]] = None):
+        """
+        Initialize the index.
+
+        Args:
+            exercises: Exercises or manifest entries to add
+        """
+        self._entries: Dict[str, Union[Exercise, ExerciseInfo]] = {}
+        self._exercises: Dict[str, Exercise] = {}
+        self._pending: Dict[str, ExerciseInfo] = {}
+        self._scenarios: Dict[Tuple[str, str], Scenario] = {}
+        self._questions: Dict[str, QuestionLocation] = {}
+
+        # Totals: exercise_id -> value, (exercise_id, scenario_id) -> value
+        self._exercise_points: Dict[str, int] = {}
+        self._exercise_questions: Dict[str, int] = {}
+        self._scenario_points: Dict[Tuple[str, str], int] = {}
+        self._scenario_questions: Dict[Tuple[str, str], int] = {}
+
+        for exercise in exercises or []:
+            self.add(exercise)
+
+    def add(self, exercise: Union[Exercise, ExerciseInfo]):
+        """Add an exercise, or a manifest entry to be built on demand."""
+        if isinstance(exercise, ExerciseInfo):
+            if exercise.id not in self._exercises:
+                self._entries[exercise.id] = exercise
+                self._pending[exercise.id] = exercise
+                self._exercise_points[exercise.id] = exercise.total_points
+                self._exercise_questions[exercise.id] = exercise.question_count
+            return
+
+        if self._exercises.get(exercise.id) is exercise:
+            return
+        self._pending.pop(exercise.id, None)
+        self._entries.setdefault(exercise.id, exercise)
+        self._exercises[exercise.id] = exercise
+
+        exercise_points = exercise_questions = 0
+        for scenario_position, scenario in enumerate(exercise.scenarios):
+            key = (exercise.id, scenario.id)
+            self._scenarios[key] = scenario
+            scenario_points = 0
+            for position, question in enumerate(scenario.questions):
+                self._questions[question.id] = QuestionLocation(
+                    exercise, scenario, question, scenario_position, position
+                )
+                scenario_points += question.points
+            self._scenario_points[key] = scenario_points
+            self._scenario_questions[key] = len(scenario.questions)
+            exercise_points += scenario_points
+            exercise_questions += len(scenario.questions)
+
+        self._exercise_points[exercise.id] = exercise_points
+        self._exercise_questions[exercise.id] = exercise_questions
+
+    def _build_pending(self):
+        """Build and index every exercise still known only by its manifest entry."""
+        for info in list(self._pending.values()):
+            self.add(info.load())
+
+    def entries(self) -> List[Union[Exercise, ExerciseInfo]]:
+        """Registered exercises (built or not), ordered by number."""
+        return sorted(self._entries.values(), key=lambda e: e.number)
+
+    def exercise(self, exercise_id: str) -> Exercise:
+        """Get an exercise by id, building it if needed."""
+        if exercise_id in self._pending:
+            self.add(self._pending[exercise_id].load())
+        return self._exercises[exercise_id]
+
+    def scenario(self, exercise_id: str, scenario_id: str) -> Scenario:
+        """Get a scenario by exercise and scenario id."""
+        key = (exercise_id, scenario_id)
+        if key not in self._scenarios and exercise_id in self._pending:
+            self.exercise(exercise_id)
+        return self._scenarios[key]
+
+    def locate(self, question_id: str) -> QuestionLocation:
+        """
+        Find where a question lives.
+
+        Raises:
+            KeyError: If no registered exercise has the question
+        """
+        location = self._questions.get(question_id)
+        if location is None and self._pending:
+            self._build_pending()
+            location = self._questions.get(question_id)
+        if location is None:
+            raise KeyError(question_id)
+        return location
+
+    def question(self, question_id: str) -> Question:
+        """Get a question by id."""
+        return self.locate(question_id).question
+
+    def __contains__(self, question_id: str) -> bool:
+        try:
+            self.locate(question_id)
+        except KeyError:
+            return False
+        return True
+
+    def exercise_points(self, exercise_id: str) -> int:
+        """Total points available in an exercise."""
+        return self._exercise_points[exercise_id]
+
+    def exercise_questions(self, exercise_id: str) -> int:
+        """Number of questions in an exercise."""
+        return self._exercise_questions[exercise_id]
+
+    def scenario_points(self, exercise_id: str, scenario_id: str) -> int:
+        """Total points available in a scenario."""
+        self.scenario(exercise_id, scenario_id)
+        return self._scenario_points[(exercise_id, scenario_id)]
+
+    def scenario_questions(self, exercise_id: str, scenario_id: str) -> int:
+        """Number of questions in a scenario."""
+        self.scenario(exercise_id, scenario_id)
+        return self._scenario_questions[(exercise_id, scenario_id)]
+
+    def total_points(self) -> int:
+        """Total points across all registered exercises."""
+        return sum(self._exercise_points.values())
+
+    def total_questions(self) -> int:
+        """Number of questions across all registered exercises."""
+        return sum(self._exercise_questions.values())
@@ -0,0 +1,403 @@
+"""Item analysis: classical test statistics for every question in the bank."""
+
+import json
+import math
+import sqlite3
+from array import array
+from typing import Any, Dict, List, Optional
+
+from .analytics import find_progress
+from .index import ContentIndex
+from .scenarios.base import Question, MultipleChoiceQuestion, ChecklistQuestion
+from .storage import SQLiteStore, StoreError
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Answer codes in ItemMatrix.choices
+NO_ANSWER = -1
+UNKNOWN_OPTION = -2
+
+
+class ItemMatrix:
+    """
+    A learners x questions matrix of scores and answers.
+
+    Rows are learners, columns are every question in the content index,
+    in course order. Both matrices are flat row-major arrays of machine
+    numbers, 16 bytes per learner per question (about 100 MB for 100k
+    learners and the 62 built-in questions), and convert to NumPy
+    without copying:
+
+      scores   the recorded score, NaN where the learner has no answer
+      choices  the answer as a number: the option index for multiple
+               choice, the selection mask for checklists, otherwise 0;
+               NO_ANSWER where unanswered, UNKNOWN_OPTION for a multiple
+               choice key that is not an option
+    """
+
+    def __init__(self, index: ContentIndex):
+        """
+        Initialize an empty matrix.
+
+        Args:
+            index: Content whose questions are the columns
+        """
+        self.index = index
+        self.questions: List[Question] = []
+        self.exercise_ids: List[str] = []  # Exercise of each column
+        for entry in index.entries():
+            exercise = index.exercise(entry.id)
+            for scenario in exercise.scenarios:
+                for question in scenario.questions:
+                    self.questions.append(question)
+                    self.exercise_ids.append(exercise.id)
+
+        self.columns: Dict[str, int] = {q.id: i for i, q in enumerate(self.questions)}
+        self._option_codes: List[Optional[Dict[str, int]]] = [
+            {key.upper(): i for i, (key, _) in enumerate(q.options)}
+            if isinstance(q, MultipleChoiceQuestion) else None
+            for q in self.questions
+        ]
+
+        self.learners = 0
+        self.scores = array('d')
+        self.choices = array('q')
+        self._blank_scores = array('d', [math.nan]) * len(self.questions)
+        self._blank_choices = array('q', [NO_ANSWER]) * len(self.questions)
+
+    def new_learner(self) -> int:
+        """Append an empty row; returns its row number."""
+        self.scores.extend(self._blank_scores)
+        self.choices.extend(self._blank_choices)
+        self.learners += 1
+        return self.learners - 1
+
+    def record(self, row: int, question_id: str, score: float, answer: Any):
+        """Fill in one answer; questions not in the content are ignored."""
+        column = self.columns.get(question_id)
+        if column is None:
+            return
+        cell = row * len(self.questions) + column
+        self.scores[cell] = score
+        self.choices[cell] = self._encode(column, answer)
+
+    def _encode(self, column: int, answer: Any) -> int:
+        question = self.questions[column]
+        if isinstance(question, MultipleChoiceQuestion):
+            if not isinstance(answer, str):
+                return UNKNOWN_OPTION
+            return self._option_codes[column].get(answer.upper(), UNKNOWN_OPTION)
+        if isinstance(question, ChecklistQuestion):
+            # Masks since checklist answers became bitmasks; lists of keys before
+            if isinstance(answer, int):
+                return answer & question.options_mask
+            if isinstance(answer, list):
+                return question.mask_of([a for a in answer if isinstance(a, str)])[0]
+            return 0
+        return 0
+
+    def add_document(self, document: Dict[str, Any]):
+        """
+        Add one learner's progress document as a row.
+
+        Raises:
+            ValueError: If the document is not in the progress.json layout
+                (nothing is added)
+        """
+        answers = []
+        try:
+            for ex in document["exercises"].values():
+                for sc in ex["scenarios"].values():
+                    for q_id, q in sc["questions"].items():
+                        if q.get("answered"):
+                            answers.append((q_id, float(q.get("score") or 0.0), q.get("user_answer")))
+        except (KeyError, TypeError, AttributeError) as e:
+            raise ValueError(f"not a progress document ({type(e).__name__}: {e})") from e
+
+        row = self.new_learner()
+        for q_id, score, answer in answers:
+            self.record(row, q_id, score, answer)
+
+    def add_database(self, path: str) -> int:
+        """
+        Add every learner in a SQLite progress database.
+
+        Reads the question records with one ordered query instead of
+        assembling each learner's session.
+
+        Returns:
+            Number of learners added
+        """
+        conn = sqlite3.connect(path, timeout=30)
+        try:
+            added = 0
+            current = None
+            row = 0
+            for learner_id, q_id, score, user_answer in conn.execute(
+                "SELECT learner_id, question_id, score, user_answer FROM question_progress "
+                "WHERE answered ORDER BY learner_id"
+            ):
+                if learner_id != current:
+                    current = learner_id
+                    row = self.new_learner()
+                    added += 1
+                answer = json.loads(user_answer) if user_answer is not None else None
+                self.record(row, q_id, score, answer)
+            return added
+        finally:
+            conn.close()
+
+    def load(self, path: str) -> List[str]:
+        """
+        Add every learner's progress under a path (see analytics.find_progress).
+
+        Progress is only read, never repaired: a journal a live session
+        is appending to is left as it is.
+
+        Returns:
+            Descriptions of files that were skipped
+        """
+        errors = []
+        databases = set()
+        for label, store in find_progress(path):
+            try:
+                if isinstance(store, SQLiteStore):
+                    # One query covers every learner in the database
+                    if store.path not in databases:
+                        databases.add(store.path)
+                        self.add_database(store.path)
+                    continue
+                document = store.load()
+                if document is None:
+                    errors.append(f"{label}: no readable progress snapshot")
+                    continue
+                self.add_document(document)
+            except (OSError, ValueError, StoreError, sqlite3.DatabaseError) as e:
+                errors.append(f"{label}: {e}")
+        return errors
+
+
+def analyze_items(matrix: ItemMatrix, use_numpy: Optional[bool] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Compute item statistics for every question.
+
+    For each question:
+
+      answered        learners with an answer
+      difficulty      p-value: mean score as a fraction of the points
+                      (the share answering correctly for all-or-nothing items)
+      discrimination  point-biserial (item-rest) correlation between the
+                      item score and the learner's score on the rest of
+                      the same exercise, over learners who answered it;
+                      None when it is undefined
+      options         multiple choice: learners choosing each option key
+                      (distractor frequencies); checklist: learners
+                      selecting each option
+      option_rates    options as a fraction of answered
+
+    Args:
+        matrix: Scores and answers
+        use_numpy: Use NumPy (default: when installed)
+
+    Returns:
+        Dict mapping question id to its statistics
+    """
+    if use_numpy is None:
+        use_numpy = np is not None
+    elif use_numpy and np is None:
+        raise ImportError("NumPy is not installed")
+
+    if use_numpy:
+        return _analyze_numpy(matrix)
+    return _analyze_python(matrix)
+
+
+def _option_stats(question: Question, answered: int, counts: List[int]) -> Dict[str, Any]:
+    keys = [key for key, _ in question.options]
+    return {
+        "options": dict(zip(keys, counts)),
+        "option_rates": {key: count / answered if answered else 0.0 for key, count in zip(keys, counts)},
+    }
+
+
+def _item_stats(
+    question: Question,
+    answered: int,
+    difficulty: Optional[float],
+    discrimination: Optional[float]
+) -> Dict[str, Any]:
+    return {
+        "answered": answered,
+        "points": question.points,
+        "difficulty": difficulty,
+        "discrimination": discrimination,
+    }
+
+
+def _analyze_numpy(matrix: ItemMatrix) -> Dict[str, Dict[str, Any]]:
+    width = len(matrix.questions)
+    scores = np.frombuffer(matrix.scores, dtype=np.float64).reshape(matrix.learners, width)
+    choices = np.frombuffer(matrix.choices, dtype=np.int64).reshape(matrix.learners, width)
+
+    answered = ~np.isnan(scores)
+    counts = answered.sum(axis=0)
+    filled = np.where(answered, scores, 0.0)
+    points = np.array([q.points for q in matrix.questions], dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        item = np.where(answered, filled / np.where(points > 0, points, np.nan), 0.0)
+        difficulty = item.sum(axis=0) / counts
+
+    # Rest score: the learner's total on the exercise minus this item
+    rest = np.empty_like(filled)
+    exercise_ids = np.array(matrix.exercise_ids)
+    for exercise_id in dict.fromkeys(matrix.exercise_ids):
+        columns = np.flatnonzero(exercise_ids == exercise_id)
+        totals = filled[:, columns].sum(axis=1)
+        rest[:, columns] = totals[:, None] - filled[:, columns]
+
+    # Pearson correlation over answered learners, column by column
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rest = np.where(answered, rest, 0.0)
+        mean_item = item.sum(axis=0) / counts
+        mean_rest = rest.sum(axis=0) / counts
+        covariance = (item * rest).sum(axis=0) / counts - mean_item * mean_rest
+        var_item = (item * item).sum(axis=0) / counts - mean_item ** 2
+        var_rest = (rest * rest).sum(axis=0) / counts - mean_rest ** 2
+        discrimination = covariance / np.sqrt(var_item * var_rest)
+
+    results = {}
+    for column, question in enumerate(matrix.questions):
+        n = int(counts[column])
+        p = float(difficulty[column]) if n and points[column] > 0 else None
+        r = float(discrimination[column])
+        if not n or not math.isfinite(r) or var_item[column] <= 1e-12 or var_rest[column] <= 1e-12:
+            r = None
+        stats = _item_stats(question, n, p, r)
+
+        if isinstance(question, MultipleChoiceQuestion):
+            picked = choices[:, column]
+            picked = picked[picked >= 0]
+            option_counts = np.bincount(picked, minlength=len(question.options))
+            stats.update(_option_stats(question, n, [int(c) for c in option_counts[:len(question.options)]]))
+        elif isinstance(question, ChecklistQuestion):
+            masks = choices[answered[:, column], column]
+            option_counts = [
+                int(((masks >> bit) & 1).sum()) for bit in range(len(question.options))
+            ]
+            stats.update(_option_stats(question, n, option_counts))
+
+        results[question.id] = stats
+    return results
+
+
+def _analyze_python(matrix: ItemMatrix) -> Dict[str, Dict[str, Any]]:
+    width = len(matrix.questions)
+    scores = matrix.scores
+    choices = matrix.choices
+
+    # Each learner's total on each exercise
+    exercise_totals: Dict[str, List[float]] = {
+        exercise_id: [0.0] * matrix.learners for exercise_id in matrix.exercise_ids
+    }
+    for column, exercise_id in enumerate(matrix.exercise_ids):
+        totals = exercise_totals[exercise_id]
+        for row in range(matrix.learners):
+            score = scores[row * width + column]
+            if score == score:  # not NaN
+                totals[row] += score
+
+    results = {}
+    for column, question in enumerate(matrix.questions):
+        totals = exercise_totals[matrix.exercise_ids[column]]
+        items = []
+        rests = []
+        answers = []
+        for row in range(matrix.learners):
+            score = scores[row * width + column]
+            if score != score:
+                continue
+            items.append(score / question.points if question.points > 0 else 0.0)
+            rests.append(totals[row] - score)
+            answers.append(choices[row * width + column])
+
+        n = len(items)
+        p = sum(items) / n if n and question.points > 0 else None
+        stats = _item_stats(question, n, p, _correlation(items, rests))
+
+        if isinstance(question, MultipleChoiceQuestion):
+            option_counts = [0] * len(question.options)
+            for code in answers:
+                if code >= 0:
+                    option_counts[code] += 1
+            stats.update(_option_stats(question, n, option_counts))
+        elif isinstance(question, ChecklistQuestion):
+            option_counts = [
+                sum(1 for mask in answers if mask >> bit & 1) for bit in range(len(question.options))
+            ]
+            stats.update(_option_stats(question, n, option_counts))
+
+        results[question.id] = stats
+    return results
+
+
+def _correlation(xs: List[float], ys: List[float]) -> Optional[float]:
+    """Pearson correlation, or None if either side has no variance."""
+    n = len(xs)
+    if n == 0:
+        return None
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    covariance = sum(x * y for x, y in zip(xs, ys)) / n - mean_x * mean_y
+    var_x = sum(x * x for x in xs) / n - mean_x ** 2
+    var_y = sum(y * y for y in ys) / n - mean_y ** 2
+    if var_x <= 1e-12 or var_y <= 1e-12:
+        return None
+    return covariance / math.sqrt(var_x * var_y)
+
+
+def run_item_analysis(
+    path: str,
+    index: ContentIndex,
+    output: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Run item analysis on a cohort's progress and print a report.
+
+    Args:
+        path: Directory tree, progress file or database to analyze
+        index: Content whose questions are analyzed
+        output: Also write the full report to this JSON file
+
+    Returns:
+        Dict with learners, errors and items (from analyze_items)
+    """
+    matrix = ItemMatrix(index)
+    errors = matrix.load(path)
+    items = analyze_items(matrix)
+
+    def fmt(value: Optional[float], spec: str) -> str:
+        return "-" if value is None else format(value, spec)
+
+    print(f"{'question':<10} {'n':>7} {'p':>5} {'r_pb':>6}  options")
+    for question_id, stats in items.items():
+        rates = " ".join(
+            f"{key}:{rate:.0%}" for key, rate in stats.get("option_rates", {}).items()
+        )
+        print(f"{question_id:<10} {stats['answered']:>7} {fmt(stats['difficulty'], '.2f'):>5} "
+              f"{fmt(stats['discrimination'], '.2f'):>6}  {rates}")
+
+    for error in errors:
+        print(f"Skipped {error}")
+    print(f"Analyzed {len(items)} questions for {matrix.learners} learners")
+
+    report = {"learners": matrix.learners, "errors": errors, "items": items}
+    if output:
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"Wrote {output}")
+    return report
@@ -0,0 +1,132 @@
+"""Multi-keyword matching for free-text answers."""
+
+from typing import Dict, List, Sequence, Set, Tuple
+
+
+def _is_word_char(ch: str) -> bool:
+    """Whether ch is a word character in the sense of regex \\w."""
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordMatcher:
+    """
+    Finds which of a fixed set of keywords occur in a text.
+
+    The keywords are compiled once into an Aho-Corasick automaton, so a
+    text is scanned in a single pass however many keywords there are.
+    Matching is case-insensitive. By default a keyword matches anywhere
+    (plain substring, so "encrypt" matches "encrypted"); with
+    whole_words=True it must start and end on word boundaries, like
+    re.search(r'\\b' + re.escape(keyword) + r'\\b'). Keywords must not be
+    empty.
+    """
+
+    def __init__(self, keywords: Sequence[str], whole_words: bool = False):
+        """
+        Compile the automaton.
+
+        Args:
+            keywords: Keywords to look for
+            whole_words: Only count matches on word boundaries
+
+        Raises:
+            ValueError: If a keyword is empty
+        """
+        self.keywords = list(keywords)
+        self.whole_words = whole_words
+
+        # Trie: per state, transitions and the keyword indices ending there
+        self._goto: List[Dict[str, int]] = [{}]
+        self._outputs: List[List[int]] = [[]]
+        self._lengths: List[int] = []
+
+        for index, keyword in enumerate(self.keywords):
+            pattern = keyword.lower()
+            if not pattern:
+                raise ValueError(f"empty keyword at position {index}")
+            self._lengths.append(len(pattern))
+            state = 0
+            for ch in pattern:
+                next_state = self._goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto.append({})
+                    self._outputs.append([])
+                    self._goto[state][ch] = next_state
+                state = next_state
+            self._outputs[state].append(index)
+
+        self._fail = self._build_failure_links()
+
+    def _build_failure_links(self) -> List[int]:
+        """Breadth-first failure links; outputs of suffix states are merged in."""
+        fail = [0] * len(self._goto)
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = self._goto[fallback].get(ch, 0)
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[fail[next_state]]
+        return fail
+
+    def find(self, text: str) -> Set[int]:
+        """
+        Find the keywords present in text.
+
+        Returns:
+            Set of indices into self.keywords
+        """
+        found: Set[int] = set()
+        remaining = len(self.keywords)
+        if remaining == 0:
+            return found
+
+        text = text.lower()
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        state = 0
+        for end, ch in enumerate(text, 1):
+            next_state = goto[state].get(ch)
+            while next_state is None and state:
+                state = fail[state]
+                next_state = goto[state].get(ch)
+            state = next_state or 0
+
+            if not outputs[state]:
+                continue
+            for index in outputs[state]:
+                if index in found:
+                    continue
+                if self.whole_words and not self._on_boundaries(text, end - self._lengths[index], end):
+                    continue
+                found.add(index)
+                remaining -= 1
+                if remaining == 0:
+                    return found
+
+        return found
+
+    @staticmethod
+    def _on_boundaries(text: str, start: int, end: int) -> bool:
+        """Whether text[start:end] starts and ends on word boundaries (regex \\b)."""
+        def boundary(pos: int) -> bool:
+            before = pos > 0 and _is_word_char(text[pos - 1])
+            after = pos < len(text) and _is_word_char(text[pos])
+            return before != after
+
+        return boundary(start) and boundary(end)
+
+    def split(self, text: str) -> Tuple[List[str], List[str]]:
+        """
+        Partition the keywords by whether they occur in text.
+
+        Returns:
+            Tuple of (keywords_found, keywords_missing), in keyword order
+        """
+        found = self.find(text)
+        return (
+            [kw for i, kw in enumerate(self.keywords) if i in found],
+            [kw for i, kw in enumerate(self.keywords) if i not in found],
+        )
@@ -0,0 +1,249 @@
+"""Latency statistics: mergeable streaming quantile sketches per question."""
+
+import math
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+# Timed stages of answering a question (see GameEngine.run_question)
+PHASES = ("render", "think", "grade", "persist")
+
+SKETCH_FORMAT = 1
+
+
+class QuantileSketch:
+    """
+    Streaming quantile sketch with relative-error guarantees (DDSketch).
+
+    Each positive value goes to the bucket ceil(log_gamma(value)), with
+    gamma = (1 + accuracy) / (1 - accuracy), so any quantile comes back
+    within the relative accuracy of a true sample value. Memory grows
+    with the log of the range of values, not with the number of
+    samples. Sketches with the same accuracy merge by adding bucket
+    counts, so per-seat sketches combine into exact cohort sketches.
+    """
+
+    def __init__(self, accuracy: float = 0.01, max_buckets: int = 2048):
+        """
+        Initialize an empty sketch.
+
+        Args:
+            accuracy: Relative accuracy of quantiles (0.01 = within 1%)
+            max_buckets: Bucket limit; beyond it the lowest buckets are
+                folded together, losing accuracy only at the low end
+        """
+        if not 0 < accuracy < 1:
+            raise ValueError("accuracy must be between 0 and 1")
+        self.accuracy = accuracy
+        self.max_buckets = max_buckets
+        self._gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zeros = 0  # values <= 0, reported as 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float, count: int = 1):
+        """Add a value (count times)."""
+        if value > 0:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            self.buckets[key] = self.buckets.get(key, 0) + count
+            if len(self.buckets) > self.max_buckets:
+                self._collapse()
+        else:
+            self.zeros += count
+        self.count += count
+        self.total += value * count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def _collapse(self):
+        """Fold the lowest buckets together until within max_buckets."""
+        keys = sorted(self.buckets)
+        excess = len(keys) - self.max_buckets
+        folded = sum(self.buckets.pop(key) for key in keys[:excess])
+        self.buckets[keys[excess]] += folded
+
+    def merge(self, other: "QuantileSketch"):
+        """Add another sketch's samples into this one."""
+        if not math.isclose(other.accuracy, self.accuracy):
+            raise ValueError("cannot merge sketches with different accuracy")
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+        self.zeros += other.zeros
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile.
+
+        Args:
+            q: Quantile between 0 and 1 (0.5 = median)
+
+        Returns:
+            The estimate, or None if the sketch is empty
+        """
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                estimate = 2 * self._gamma ** key / (self._gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def mean(self) -> Optional[float]:
+        """Mean of the values, or None if the sketch is empty."""
+        return self.total / self.count if self.count else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dict."""
+        return {
+            "accuracy": self.accuracy,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "zeros": self.zeros,
+            "buckets": sorted(self.buckets.items()),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QuantileSketch":
+        """Rebuild a sketch saved with to_dict."""
+        sketch = cls(accuracy=data["accuracy"])
+        sketch.buckets = {int(key): int(count) for key, count in data["buckets"]}
+        sketch.zeros = data["zeros"]
+        sketch.count = data["count"]
+        sketch.total = data["total"]
+        if sketch.count:
+            sketch.min = data["min"]
+            sketch.max = data["max"]
+        return sketch
+
+
+class LatencyStats:
+    """
+    Quantile sketches of timings, one per (question id, phase).
+
+    Timings are in seconds. A learner's stats are saved with their
+    progress; merge() combines seats into cohort stats.
+    """
+
+    def __init__(self, accuracy: float = 0.01):
+        """
+        Initialize empty stats.
+
+        Args:
+            accuracy: Relative accuracy of every sketch
+        """
+        self.accuracy = accuracy
+        self.sketches: Dict[Tuple[str, str], QuantileSketch] = {}
+
+    def add(self, question_id: str, phase: str, seconds: float):
+        """Record one timing."""
+        key = (question_id, phase)
+        sketch = self.sketches.get(key)
+        if sketch is None:
+            sketch = self.sketches[key] = QuantileSketch(self.accuracy)
+        sketch.add(seconds)
+
+    def merge(self, other: "LatencyStats"):
+        """Add another set of stats into this one."""
+        for key, sketch in other.sketches.items():
+            mine = self.sketches.get(key)
+            if mine is None:
+                mine = self.sketches[key] = QuantileSketch(sketch.accuracy)
+            mine.merge(sketch)
+
+    def phase(self, phase: str, question_ids: Optional[Iterable[str]] = None) -> QuantileSketch:
+        """One sketch of a phase across questions (all by default)."""
+        wanted = set(question_ids) if question_ids is not None else None
+        merged = QuantileSketch(self.accuracy)
+        for (question_id, key_phase), sketch in self.sketches.items():
+            if key_phase == phase and (wanted is None or question_id in wanted):
+                merged.merge(sketch)
+        return merged
+
+    def summary(self, quantiles: Iterable[float] = (0.5, 0.95, 0.99)) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Quantiles for every question and phase.
+
+        Returns:
+            Dict of question id -> phase -> {"count", "p50", "p95", ...}
+            (seconds)
+        """
+        quantiles = list(quantiles)
+        result: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (question_id, phase), sketch in self.sketches.items():
+            result.setdefault(question_id, {})[phase] = _quantile_stats(sketch, quantiles)
+        return result
+
+    def phase_summary(self, quantiles: Iterable[float] = (0.5, 0.95, 0.99)) -> Dict[str, Dict[str, Any]]:
+        """Quantiles for each phase across all questions (phases with samples only)."""
+        quantiles = list(quantiles)
+        result = {}
+        for phase in PHASES:
+            sketch = self.phase(phase)
+            if sketch.count:
+                result[phase] = _quantile_stats(sketch, quantiles)
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dict."""
+        questions: Dict[str, Dict[str, Any]] = {}
+        for (question_id, phase), sketch in self.sketches.items():
+            questions.setdefault(question_id, {})[phase] = sketch.to_dict()
+        return {"format": SKETCH_FORMAT, "accuracy": self.accuracy, "questions": questions}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyStats":
+        """
+        Rebuild stats saved with to_dict.
+
+        Raises:
+            ValueError: If the data is not in a known format
+        """
+        if not isinstance(data, dict) or data.get("format") != SKETCH_FORMAT:
+            raise ValueError("unsupported latency stats format")
+        stats = cls(accuracy=data["accuracy"])
+        try:
+            for question_id, phases in data["questions"].items():
+                for phase, sketch in phases.items():
+                    stats.sketches[(question_id, phase)] = QuantileSketch.from_dict(sketch)
+        except (KeyError, TypeError, AttributeError) as e:
+            raise ValueError(f"malformed latency stats ({type(e).__name__}: {e})") from e
+        return stats
+
+
+def _quantile_stats(sketch: QuantileSketch, quantiles: List[float]) -> Dict[str, Any]:
+    stats: Dict[str, Any] = {"count": sketch.count}
+    for q in quantiles:
+        stats[f"p{q * 100:g}"] = sketch.quantile(q)
+    return stats
+
+
+def format_ms(seconds: Optional[float]) -> str:
+    """Format a duration in seconds as milliseconds."""
+    return "-" if seconds is None else f"{seconds * 1000:.2f}"
+
+
+def phase_table(phases: Dict[str, Dict[str, Any]]) -> List[str]:
+    """Lines of count and p50/p95/p99 (ms) from LatencyStats.phase_summary()."""
+    lines = [f"{'phase':<8} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"]
+    for phase, stats in phases.items():
+        lines.append(
+            f"{phase:<8} {stats['count']:>7} {format_ms(stats['p50']):>9} "
+            f"{format_ms(stats['p95']):>9} {format_ms(stats['p99']):>9}"
+        )
+    return lines
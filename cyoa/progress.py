@@ -1,113 +1,344 @@
 """Progress tracking and persistence."""
 
 import json
-import os
-from dataclasses import dataclass, field, asdict
-from typing import Dict, List, Optional, Any
-from datetime import datetime
+import math
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple, Any
+from datetime import datetime, timedelta
+
+from .latency import LatencyStats
+from .storage import JsonFileStore, ProgressStore, StoreError
+
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+_ANSWERED = 1
+_CORRECT = 2
+
+
+def _pack_timestamp(value: Optional[str]):
+    """Pack an ISO timestamp into integer microseconds since the epoch."""
+    if value is None:
+        return None
+    try:
+        packed = (datetime.fromisoformat(value) - _EPOCH) // _MICROSECOND
+    except (TypeError, ValueError):
+        return value
+    # Keep anything that would not round-trip exactly as the original string
+    if _unpack_timestamp(packed) != value:
+        return value
+    return packed
+
+
+def _unpack_timestamp(packed) -> Optional[str]:
+    """Turn a packed timestamp back into its ISO string."""
+    if packed is None or isinstance(packed, str):
+        return packed
+    return (_EPOCH + packed * _MICROSECOND).isoformat()
 
 
-@dataclass
 class QuestionProgress:
-    """Progress for a single question."""
+    """
+    Progress for a single question.
+
+    Cohort reports hold one of these per answered question, so the
+    record is slotted: the id is interned, the answered/correct flags
+    are packed into one int and the timestamp is kept as integer
+    microseconds. The attributes read and write exactly as before.
+    """
+
+    __slots__ = ("question_id", "_flags", "score", "attempts", "user_answer", "_ts")
 
-    question_id: str
-    answered: bool = False
-    correct: bool = False
-    score: float = 0.0
-    attempts: int = 0
-    user_answer: Any = None
-    timestamp: Optional[str] = None
+    def __init__(
+        self,
+        question_id: str,
+        answered: bool = False,
+        correct: bool = False,
+        score: float = 0.0,
+        attempts: int = 0,
+        user_answer: Any = None,
+        timestamp: Optional[str] = None
+    ):
+        self.question_id = sys.intern(question_id)
+        self._flags = (_ANSWERED if answered else 0) | (_CORRECT if correct else 0)
+        self.score = score
+        self.attempts = attempts
+        self.user_answer = user_answer
+        self._ts = _pack_timestamp(timestamp)
+
+    @property
+    def answered(self) -> bool:
+        return bool(self._flags & _ANSWERED)
+
+    @answered.setter
+    def answered(self, value: bool):
+        self._flags = self._flags | _ANSWERED if value else self._flags & ~_ANSWERED
+
+    @property
+    def correct(self) -> bool:
+        return bool(self._flags & _CORRECT)
+
+    @correct.setter
+    def correct(self, value: bool):
+        self._flags = self._flags | _CORRECT if value else self._flags & ~_CORRECT
+
+    @property
+    def timestamp(self) -> Optional[str]:
+        return _unpack_timestamp(self._ts)
+
+    @timestamp.setter
+    def timestamp(self, value: Optional[str]):
+        self._ts = _pack_timestamp(value)
+
+    def _key(self) -> tuple:
+        return (self.question_id, self._flags, self.score, self.attempts,
+                self.user_answer, self._ts)
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __repr__(self) -> str:
+        return (
+            f"QuestionProgress(question_id={self.question_id!r}, "
+            f"answered={self.answered!r}, correct={self.correct!r}, "
+            f"score={self.score!r}, attempts={self.attempts!r}, "
+            f"user_answer={self.user_answer!r}, timestamp={self.timestamp!r})"
+        )
 
 
 @dataclass
 class ScenarioProgress:
-    """Progress for a scenario."""
+    """
+    Progress for a scenario.
+
+    answered_count and total_score are kept up to date by
+    ProgressManager so summaries never walk the question tree.
+    """
 
     scenario_id: str
     started: bool = False
     completed: bool = False
     questions: Dict[str, QuestionProgress] = field(default_factory=dict)
+    answered_count: int = field(default=0, init=False, repr=False, compare=False)
+    total_score: float = field(default=0.0, init=False, repr=False, compare=False)
 
     def get_score(self) -> float:
         """Get total score for this scenario."""
-        return sum(q.score for q in self.questions.values())
+        return self.total_score
 
     def get_completion_pct(self) -> float:
         """Get completion percentage."""
         if not self.questions:
             return 0.0
-        answered = sum(1 for q in self.questions.values() if q.answered)
-        return (answered / len(self.questions)) * 100
+        return (self.answered_count / len(self.questions)) * 100
 
 
 @dataclass
 class ExerciseProgress:
-    """Progress for an exercise."""
+    """
+    Progress for an exercise.
+
+    Question, answer, score and completed-scenario counters are kept up
+    to date by ProgressManager so summaries never walk the question tree.
+    """
 
     exercise_id: str
     started: bool = False
     completed: bool = False
     scenarios: Dict[str, ScenarioProgress] = field(default_factory=dict)
+    question_count: int = field(default=0, init=False, repr=False, compare=False)
+    answered_count: int = field(default=0, init=False, repr=False, compare=False)
+    total_score: float = field(default=0.0, init=False, repr=False, compare=False)
+    completed_scenarios: int = field(default=0, init=False, repr=False, compare=False)
 
     def get_score(self) -> float:
         """Get total score for this exercise."""
-        return sum(s.get_score() for s in self.scenarios.values())
+        return self.total_score
 
     def get_completion_pct(self) -> float:
         """Get completion percentage."""
-        if not self.scenarios:
+        if self.question_count == 0:
             return 0.0
-        total_questions = sum(len(s.questions) for s in self.scenarios.values())
-        if total_questions == 0:
-            return 0.0
-        answered = sum(
-            sum(1 for q in s.questions.values() if q.answered)
-            for s in self.scenarios.values()
-        )
-        return (answered / total_questions) * 100
+        return (self.answered_count / self.question_count) * 100
 
 
 @dataclass
 class SessionProgress:
-    """Overall session progress."""
+    """
+    Overall session progress.
+
+    Question, answer and score counters are kept up to date by
+    ProgressManager so summaries never walk the question tree.
+
+    resume is the (exercise_id, scenario_id, question_id) of the last
+    answer recorded; the engine continues from the question after it.
+    """
 
     session_id: str
     created: str
     last_updated: str
     exercises: Dict[str, ExerciseProgress] = field(default_factory=dict)
+    resume: Optional[Tuple[str, str, str]] = None
+    question_count: int = field(default=0, init=False, repr=False, compare=False)
+    answered_count: int = field(default=0, init=False, repr=False, compare=False)
+    total_score: float = field(default=0.0, init=False, repr=False, compare=False)
 
     def get_total_score(self) -> float:
         """Get total score across all exercises."""
-        return sum(e.get_score() for e in self.exercises.values())
+        return self.total_score
 
     def get_overall_completion(self) -> float:
         """Get overall completion percentage."""
-        if not self.exercises:
+        if self.question_count == 0:
             return 0.0
+        return self.answered_count / self.question_count * 100
+
+    def recompute_aggregates(self):
+        """Rebuild every counter in the tree from the question records."""
+        self.question_count = self.answered_count = 0
+        self.total_score = 0.0
 
-        total = 0
-        completed = 0
         for ex in self.exercises.values():
-            for sc in ex.scenarios.values():
-                total += len(sc.questions)
-                completed += sum(1 for q in sc.questions.values() if q.answered)
+            ex.question_count = ex.answered_count = ex.completed_scenarios = 0
+            ex.total_score = 0.0
 
-        return (completed / total * 100) if total > 0 else 0.0
+            for sc in ex.scenarios.values():
+                sc.answered_count = sum(1 for q in sc.questions.values() if q.answered)
+                sc.total_score = sum(q.score for q in sc.questions.values())
+
+                ex.question_count += len(sc.questions)
+                ex.answered_count += sc.answered_count
+                ex.total_score += sc.total_score
+                ex.completed_scenarios += sc.completed
+
+            self.question_count += ex.question_count
+            self.answered_count += ex.answered_count
+            self.total_score += ex.total_score
+
+
+def _latest_answer(session: SessionProgress) -> Optional[Tuple[str, str, str]]:
+    """Find the most recently answered question, for stores that keep no resume point."""
+    latest = None
+    latest_time = ""
+    for ex_id, ex in session.exercises.items():
+        for sc_id, sc in ex.scenarios.items():
+            for q_id, q in sc.questions.items():
+                if q.answered and (q.timestamp or "") >= latest_time:
+                    latest = (ex_id, sc_id, q_id)
+                    latest_time = q.timestamp or ""
+    return latest
+
+
+def check_aggregates(session: SessionProgress):
+    """
+    Verify the maintained counters against a from-scratch recomputation.
+
+    Raises:
+        AssertionError: If any counter disagrees with the question records
+    """
+    def check(label: str, kept, fresh):
+        if isinstance(fresh, float):
+            ok = math.isclose(kept, fresh, rel_tol=1e-9, abs_tol=1e-9)
+        else:
+            ok = kept == fresh
+        if not ok:
+            # Raised explicitly so the check also runs under python -O
+            raise AssertionError(f"{label}: maintained {kept!r} != recomputed {fresh!r}")
+
+    questions = answered = 0
+    score = 0.0
+    for ex_id, ex in session.exercises.items():
+        ex_questions = ex_answered = ex_completed = 0
+        ex_score = 0.0
+
+        for sc_id, sc in ex.scenarios.items():
+            sc_answered = sum(1 for q in sc.questions.values() if q.answered)
+            sc_score = sum(float(q.score) for q in sc.questions.values())
+            check(f"{ex_id}/{sc_id} answered_count", sc.answered_count, sc_answered)
+            check(f"{ex_id}/{sc_id} total_score", sc.total_score, sc_score)
+
+            ex_questions += len(sc.questions)
+            ex_answered += sc_answered
+            ex_score += sc_score
+            ex_completed += sc.completed
+
+        check(f"{ex_id} question_count", ex.question_count, ex_questions)
+        check(f"{ex_id} answered_count", ex.answered_count, ex_answered)
+        check(f"{ex_id} total_score", ex.total_score, ex_score)
+        check(f"{ex_id} completed_scenarios", ex.completed_scenarios, ex_completed)
+
+        questions += ex_questions
+        answered += ex_answered
+        score += ex_score
+
+    check("session question_count", session.question_count, questions)
+    check("session answered_count", session.answered_count, answered)
+    check("session total_score", session.total_score, score)
 
 
 class ProgressManager:
     """Manages saving and loading progress."""
 
-    def __init__(self, data_dir: str = "data"):
-        """Initialize progress manager."""
+    def __init__(
+        self,
+        data_dir: str = "data",
+        journal: bool = False,
+        compact_every: int = 50,
+        learner_id: Optional[str] = None,
+        store: Optional[ProgressStore] = None,
+        coalesce: bool = False,
+        max_pending: int = 10,
+        max_delay: float = 60.0,
+        warn: Optional[Callable[[str], None]] = None
+    ):
+        """
+        Initialize progress manager.
+
+        Args:
+            data_dir: Directory holding progress files
+            journal: Append each answer to a journal instead of
+                rewriting the whole progress file
+            compact_every: Journal entries to accumulate before folding
+                them back into the snapshot
+            learner_id: Learner whose progress is managed
+            store: Storage backend (defaults to a JSON file in data_dir)
+            coalesce: Hold answers in memory and write them together at
+                the next scenario boundary or flush()
+            max_pending: Answers to hold before writing anyway
+            max_delay: Seconds an answer may be held before writing anyway;
+                checked when the next change arrives, so held answers can
+                wait longer when none follows (call flush() to bound it)
+            warn: Where to report recoverable problems, for this manager
+                and its store (default: print)
+        """
         self.data_dir = data_dir
-        self.progress_file = os.path.join(data_dir, "progress.json")
+        self.learner_id = learner_id
+        if store is None:
+            store = JsonFileStore(
+                data_dir,
+                learner_id=learner_id,
+                journal=journal,
+                compact_every=compact_every
+            )
+        self.store = store
+        self.warn = warn or print
+        if warn is not None:
+            store.warn = warn
+        self.coalesce = coalesce
+        self.max_pending = max_pending
+        self.max_delay = max_delay
         self.session: Optional[SessionProgress] = None
-
-    def ensure_data_dir(self):
-        """Ensure data directory exists."""
-        os.makedirs(self.data_dir, exist_ok=True)
+        self._pending: List[dict] = []
+        self._pending_since = 0.0
+        # Store fingerprint the live session corresponds to
+        self._fingerprint: Optional[tuple] = None
+        self._timings: Optional[LatencyStats] = None
+        self._timings_dirty = False
 
     def new_session(self) -> SessionProgress:
         """Create a new session."""
@@ -123,74 +354,184 @@ class ProgressManager:
         return self.session
 
     def load_session(self) -> Optional[SessionProgress]:
-        """Load existing session from file."""
-        if not os.path.exists(self.progress_file):
+        """
+        Load existing session from the store.
+
+        The live session is reused as long as the store reports that
+        nothing has changed since it was last loaded or written; it is
+        only rebuilt when something else modified the stored progress.
+        """
+        # Never let a reload discard answers that are still held
+        self.flush()
+
+        fingerprint = self.store.fingerprint()
+        if (
+            self.session is not None
+            and fingerprint is not None
+            and fingerprint == self._fingerprint
+        ):
+            return self.session
+
+        try:
+            data = self.store.load()
+            if data is None:
+                return None
+
+            self.session = self._session_from_dict(data)
+            self._fingerprint = fingerprint
+            return self.session
+
+        except (json.JSONDecodeError, KeyError, TypeError, StoreError) as e:
+            self.warn(f"Warning: Could not load progress file: {e}")
             return None
 
+    def save_session(self):
+        """Save current session to the store."""
+        if not self.session:
+            return
+
+        self.session.last_updated = datetime.now().isoformat()
+        self.store.save(self._session_to_dict())
+        # The snapshot includes any held changes
+        self._pending = []
+        self._fingerprint = self.store.fingerprint()
+
+    def flush(self):
+        """Write any held changes (and new timings) to the store."""
+        self.save_timings()
+        if not self._pending or not self.session:
+            return
+
+        changes = self._pending
+        self._pending = []
+        self.store.write_changes(
+            self.session.session_id, changes, self._session_to_dict
+        )
+        self._fingerprint = self.store.fingerprint()
+
+    @property
+    def timings(self) -> LatencyStats:
+        """The learner's latency sketches, loaded from the store on first use."""
+        if self._timings is None:
+            self._timings = LatencyStats()
+            try:
+                data = self.store.load_timings()
+                if data is not None:
+                    self._timings = LatencyStats.from_dict(data)
+            except (ValueError, StoreError) as e:
+                self.warn(f"Warning: Could not load timings: {e}")
+        return self._timings
+
+    def record_timing(self, question_id: str, phase: str, seconds: float):
+        """
+        Add a timing to the latency sketches.
+
+        Timings are written with the next scenario boundary or flush(),
+        not on every answer.
+        """
+        self.timings.add(question_id, phase, seconds)
+        self._timings_dirty = True
+
+    def save_timings(self):
+        """Write the latency sketches if they changed."""
+        if not self._timings_dirty:
+            return
+        self._timings_dirty = False
         try:
-            with open(self.progress_file, 'r') as f:
-                data = json.load(f)
-
-            # Reconstruct dataclass objects
-            self.session = SessionProgress(
-                session_id=data.get("session_id", "unknown"),
-                created=data.get("created", ""),
-                last_updated=data.get("last_updated", ""),
-                exercises={}
+            self.store.save_timings(self._timings.to_dict())
+        except (OSError, StoreError) as e:
+            self.warn(f"Warning: Could not save timings: {e}")
+
+    def _write_change(self, change: dict, boundary: bool = False):
+        """
+        Hand a change record to the store, or hold it when coalescing.
+
+        Held changes are written together once the burst ends: at a
+        scenario boundary, when max_pending changes are held, or when
+        the oldest has been held for max_delay seconds.
+        """
+        if not self.coalesce:
+            self.store.write_changes(
+                self.session.session_id, [change], self._session_to_dict
             )
+            self._fingerprint = self.store.fingerprint()
+            return
 
-            for ex_id, ex_data in data.get("exercises", {}).items():
-                ex_progress = ExerciseProgress(
-                    exercise_id=ex_id,
-                    started=ex_data.get("started", False),
-                    completed=ex_data.get("completed", False),
-                    scenarios={}
-                )
+        if not self._pending:
+            self._pending_since = time.monotonic()
+        self._pending.append(change)
 
-                for sc_id, sc_data in ex_data.get("scenarios", {}).items():
-                    sc_progress = ScenarioProgress(
-                        scenario_id=sc_id,
-                        started=sc_data.get("started", False),
-                        completed=sc_data.get("completed", False),
-                        questions={}
-                    )
+        if (
+            boundary
+            or len(self._pending) >= self.max_pending
+            or time.monotonic() - self._pending_since >= self.max_delay
+        ):
+            self.flush()
 
-                    for q_id, q_data in sc_data.get("questions", {}).items():
-                        sc_progress.questions[q_id] = QuestionProgress(
-                            question_id=q_id,
-                            answered=q_data.get("answered", False),
-                            correct=q_data.get("correct", False),
-                            score=q_data.get("score", 0.0),
-                            attempts=q_data.get("attempts", 0),
-                            user_answer=q_data.get("user_answer"),
-                            timestamp=q_data.get("timestamp")
-                        )
+    def compact(self):
+        """Fold any journaled changes back into a full snapshot."""
+        self.save_session()
 
-                    ex_progress.scenarios[sc_id] = sc_progress
+    def _session_from_dict(self, data: dict) -> SessionProgress:
+        """Reconstruct dataclass objects from saved progress data."""
+        session = SessionProgress(
+            session_id=data.get("session_id", "unknown"),
+            created=data.get("created", ""),
+            last_updated=data.get("last_updated", ""),
+            exercises={}
+        )
 
-                self.session.exercises[ex_id] = ex_progress
+        for ex_id, ex_data in data.get("exercises", {}).items():
+            ex_progress = ExerciseProgress(
+                exercise_id=ex_id,
+                started=ex_data.get("started", False),
+                completed=ex_data.get("completed", False),
+                scenarios={}
+            )
 
-            return self.session
+            for sc_id, sc_data in ex_data.get("scenarios", {}).items():
+                sc_progress = ScenarioProgress(
+                    scenario_id=sc_id,
+                    started=sc_data.get("started", False),
+                    completed=sc_data.get("completed", False),
+                    questions={}
+                )
 
-        except (json.JSONDecodeError, KeyError, TypeError) as e:
-            print(f"Warning: Could not load progress file: {e}")
-            return None
+                for q_id, q_data in sc_data.get("questions", {}).items():
+                    sc_progress.questions[q_id] = QuestionProgress(
+                        question_id=q_id,
+                        answered=q_data.get("answered", False),
+                        correct=q_data.get("correct", False),
+                        score=q_data.get("score", 0.0),
+                        attempts=q_data.get("attempts", 0),
+                        user_answer=q_data.get("user_answer"),
+                        timestamp=q_data.get("timestamp")
+                    )
 
-    def save_session(self):
-        """Save current session to file."""
-        if not self.session:
-            return
+                ex_progress.scenarios[sc_id] = sc_progress
 
-        self.ensure_data_dir()
-        self.session.last_updated = datetime.now().isoformat()
+            session.exercises[ex_id] = ex_progress
 
-        # Convert to dict for JSON serialization
+        resume = data.get("resume")
+        if resume:
+            session.resume = (resume["ex"], resume["sc"], resume["q"])
+        else:
+            session.resume = _latest_answer(session)
+
+        session.recompute_aggregates()
+        return session
+
+    def _session_to_dict(self) -> dict:
+        """Convert the current session to a dict for JSON serialization."""
         data = {
             "session_id": self.session.session_id,
             "created": self.session.created,
             "last_updated": self.session.last_updated,
             "exercises": {}
         }
+        if self.session.resume:
+            ex_id, sc_id, q_id = self.session.resume
+            data["resume"] = {"ex": ex_id, "sc": sc_id, "q": q_id}
 
         for ex_id, ex in self.session.exercises.items():
             data["exercises"][ex_id] = {
@@ -219,8 +560,7 @@ class ProgressManager:
                         "timestamp": q.timestamp
                     }
 
-        with open(self.progress_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        return data
 
     def get_exercise_progress(self, exercise_id: str) -> ExerciseProgress:
         """Get or create progress for an exercise."""
@@ -259,51 +599,120 @@ class ProgressManager:
         score: float
     ):
         """Record an answer to a question."""
+        q_progress = self._apply_answer(
+            exercise_id, scenario_id, question_id, answer, correct, score
+        )
+        self.session.last_updated = q_progress.timestamp
+
+        # Auto-save after each answer
+        self._write_change({
+            "op": "answer",
+            "ex": exercise_id,
+            "sc": scenario_id,
+            "q": question_id,
+            "ans": answer,
+            "ok": correct,
+            "s": score,
+            "n": q_progress.attempts,
+            "t": q_progress.timestamp,
+        })
+
+    def mark_scenario_complete(self, exercise_id: str, scenario_id: str):
+        """Mark a scenario as completed."""
+        ex_completed = self._apply_scenario_complete(exercise_id, scenario_id)
+        self.session.last_updated = datetime.now().isoformat()
+
+        # Scenario boundaries are always written through
+        self._write_change({
+            "op": "complete",
+            "ex": exercise_id,
+            "sc": scenario_id,
+            "exc": ex_completed,
+            "t": self.session.last_updated,
+        }, boundary=True)
+        self.save_timings()
+
+    def _apply_answer(
+        self,
+        exercise_id: str,
+        scenario_id: str,
+        question_id: str,
+        answer: Any,
+        correct: bool,
+        score: float
+    ) -> QuestionProgress:
+        """Update in-memory progress and its counters for an answer."""
         sc_progress = self.get_scenario_progress(exercise_id, scenario_id)
+        ex_progress = self.session.exercises[exercise_id]
 
         # Mark exercise and scenario as started
-        self.session.exercises[exercise_id].started = True
+        ex_progress.started = True
         sc_progress.started = True
 
         if question_id not in sc_progress.questions:
             sc_progress.questions[question_id] = QuestionProgress(
                 question_id=question_id
             )
+            ex_progress.question_count += 1
+            self.session.question_count += 1
 
         q_progress = sc_progress.questions[question_id]
+        newly_answered = 0 if q_progress.answered else 1
+        score_delta = score - q_progress.score
+
         q_progress.answered = True
         q_progress.correct = correct
         q_progress.score = score
         q_progress.attempts += 1
         q_progress.user_answer = answer
         q_progress.timestamp = datetime.now().isoformat()
+        self.session.resume = (exercise_id, scenario_id, question_id)
 
-        # Auto-save after each answer
-        self.save_session()
+        for level in (sc_progress, ex_progress, self.session):
+            level.answered_count += newly_answered
+            level.total_score += score_delta
 
-    def mark_scenario_complete(self, exercise_id: str, scenario_id: str):
-        """Mark a scenario as completed."""
+        return q_progress
+
+    def _apply_scenario_complete(self, exercise_id: str, scenario_id: str) -> bool:
+        """
+        Update in-memory progress for a completed scenario.
+
+        Returns:
+            Whether the exercise is now complete
+        """
         sc_progress = self.get_scenario_progress(exercise_id, scenario_id)
-        sc_progress.completed = True
+        ex_progress = self.session.exercises[exercise_id]
+        if not sc_progress.completed:
+            sc_progress.completed = True
+            ex_progress.completed_scenarios += 1
 
         # Check if all scenarios in exercise are complete
-        ex_progress = self.get_exercise_progress(exercise_id)
-        all_complete = all(s.completed for s in ex_progress.scenarios.values())
-        if all_complete and ex_progress.scenarios:
+        if ex_progress.completed_scenarios == len(ex_progress.scenarios):
             ex_progress.completed = True
 
-        self.save_session()
+        return ex_progress.completed
 
     def get_summary(self) -> dict:
         """Get a summary of progress."""
         if not self.session:
             return {"has_progress": False}
 
-        return {
+        summary = {
             "has_progress": True,
             "session_id": self.session.session_id,
             "created": self.session.created,
             "last_updated": self.session.last_updated,
+        }
+
+        # Let the backend aggregate if it can
+        self.flush()
+        aggregates = self.store.get_summary()
+        if aggregates is not None:
+            summary.update(aggregates)
+            return summary
+
+        summary.update({
             "total_score": self.session.get_total_score(),
             "completion_pct": self.session.get_overall_completion(),
             "exercises": {
@@ -315,10 +724,12 @@ class ProgressManager:
                 }
                 for ex_id, ex in self.session.exercises.items()
             }
-        }
+        })
+        return summary
 
     def reset_progress(self):
         """Reset all progress."""
-        if os.path.exists(self.progress_file):
-            os.remove(self.progress_file)
+        self._pending = []
+        self._fingerprint = None
+        self.store.reset()
         self.session = None
@@ -0,0 +1,120 @@
+"""Partial-credit scorers for ranking answers."""
+
+import math
+from typing import Callable, Dict, Sequence
+
+
+def inverse_permutation(ranking: Sequence[int]) -> Dict[int, int]:
+    """Map each item in a ranking to its position (first occurrence wins)."""
+    positions: Dict[int, int] = {}
+    for position, item in enumerate(ranking):
+        positions.setdefault(item, position)
+    return positions
+
+
+def count_inversions(sequence: Sequence[int]) -> int:
+    """Count pairs i < j with sequence[i] > sequence[j], by merge sort in O(n log n)."""
+    values = list(sequence)
+    buffer = [0] * len(values)
+    inversions = 0
+    width = 1
+    while width < len(values):
+        for low in range(0, len(values), 2 * width):
+            mid = min(low + width, len(values))
+            high = min(low + 2 * width, len(values))
+            left, right, out = low, mid, low
+            while left < mid and right < high:
+                if values[right] < values[left]:
+                    # Everything left in the left run is greater
+                    inversions += mid - left
+                    buffer[out] = values[right]
+                    right += 1
+                else:
+                    buffer[out] = values[left]
+                    left += 1
+                out += 1
+            buffer[out:out + mid - left] = values[left:mid]
+            out += mid - left
+            buffer[out:out + high - right] = values[right:high]
+        values, buffer = buffer, values
+        width *= 2
+    return inversions
+
+
+def position_score(answer: Sequence[int], correct: Sequence[int], inverse: Dict[int, int]) -> float:
+    """Fraction of positions holding exactly the right item."""
+    if not correct:
+        return 0.0
+    return sum(1 for mine, right in zip(answer, correct) if mine == right) / len(correct)
+
+
+def kendall_score(answer: Sequence[int], correct: Sequence[int], inverse: Dict[int, int]) -> float:
+    """
+    Kendall tau similarity: the share of item pairs put in the right order.
+
+    Items missing from the answer (or not in the correct ranking) earn
+    nothing, so the similarity is scaled by how many correct items the
+    answer includes.
+    """
+    n = len(correct)
+    if n == 0:
+        return 0.0
+    seen = set()
+    sequence = []
+    for item in answer:
+        if item in inverse and item not in seen:
+            seen.add(item)
+            sequence.append(inverse[item])
+    coverage = len(sequence) / n
+    pairs = len(sequence) * (len(sequence) - 1) // 2
+    if pairs == 0:
+        return coverage
+    return coverage * (1 - count_inversions(sequence) / pairs)
+
+
+def footrule_score(answer: Sequence[int], correct: Sequence[int], inverse: Dict[int, int]) -> float:
+    """
+    Spearman footrule similarity: 1 - total displacement / maximum displacement.
+
+    An item left out of the answer is treated as ranked just past the
+    end.
+    """
+    n = len(correct)
+    if n == 0:
+        return 0.0
+    placed = inverse_permutation(answer)
+    displacement = sum(
+        abs(placed.get(item, n) - position) for item, position in inverse.items()
+    )
+    worst = max(n * n // 2, 1)
+    return max(0.0, 1 - displacement / worst)
+
+
+def weighted_topk_score(answer: Sequence[int], correct: Sequence[int], inverse: Dict[int, int]) -> float:
+    """
+    Weighted top-k similarity: near misses near the top count most.
+
+    Position i carries weight 1 / log2(i + 2), as in DCG, and earns that
+    weight scaled down by how far its item is from where it belongs.
+    """
+    n = len(correct)
+    if n == 0:
+        return 0.0
+    earned = 0.0
+    possible = 0.0
+    for position in range(n):
+        weight = 1 / math.log2(position + 2)
+        possible += weight
+        if position < len(answer) and answer[position] in inverse:
+            distance = abs(inverse[answer[position]] - position)
+            earned += weight * max(0.0, 1 - distance / n)
+    return earned / possible
+
+
+# Partial-credit policies selectable with RankingQuestion.scoring
+RANKING_SCORERS: Dict[str, Callable[[Sequence[int], Sequence[int], Dict[int, int]], float]] = {
+    "position": position_score,
+    "kendall": kendall_score,
+    "footrule": footrule_score,
+    "topk": weighted_topk_score,
+}
@@ -0,0 +1,308 @@
+"""Frame renderers: collect screen output and write it all at once."""
+
+import os
+import re
+import shutil
+import sys
+import unicodedata
+from typing import List, Optional, TextIO, Tuple
+
+
+# ANSI escape sequences (colors, cursor movement, clearing)
+ANSI_ESCAPE = re.compile(r"\033\[[0-9;?]*[A-Za-z]")
+
+# Select Graphic Rendition (color/style) sequences only
+SGR_ESCAPE = re.compile(r"\033\[[0-9;]*m")
+
+# Screen control sequences
+CURSOR_HOME = "\033[H"
+ERASE_SCREEN = "\033[2J"
+ERASE_LINE = "\033[K"
+ERASE_BELOW = "\033[J"
+RESET_STYLE = "\033[0m"
+
+
+def display_width(line: str) -> Optional[int]:
+    """
+    Columns a line occupies on a terminal.
+
+    Returns:
+        Width in columns, or None if the line contains control
+        characters or escapes whose effect on the cursor is unknown
+    """
+    plain = SGR_ESCAPE.sub("", line)
+    width = 0
+    for ch in plain:
+        if ch < " " or ch == "\x7f":
+            return None
+        if unicodedata.combining(ch):
+            continue
+        width += 2 if unicodedata.east_asian_width(ch) in ("W", "F") else 1
+    return width
+
+
+class Renderer:
+    """
+    Base class for output backends.
+
+    Everything the engine draws is appended to the current frame with
+    write(); flush() hands the whole frame to the backend in one piece.
+    Frames are flushed whenever the session waits for input.
+    """
+
+    def __init__(self):
+        self._frame: List[str] = []
+
+    def write(self, text: str):
+        """Append text to the current frame."""
+        self._frame.append(text)
+
+    def flush(self):
+        """Emit the current frame, if anything was drawn."""
+        if self._frame:
+            frame = "".join(self._frame)
+            self._frame.clear()
+            self.emit(frame)
+
+    def clear(self):
+        """Start a fresh screen."""
+        raise NotImplementedError("Subclasses must implement clear")
+
+    def echo(self, text: str):
+        """Note text the terminal echoed back while reading input."""
+        pass
+
+    def emit(self, frame: str):
+        """Write a complete frame to the backend."""
+        raise NotImplementedError("Subclasses must implement emit")
+
+
+class AnsiRenderer(Renderer):
+    """
+    Base class for renderers driving an ANSI terminal.
+
+    Screens are cleared in-process with escape sequences. The renderer
+    keeps a copy of the lines currently on screen, so when a cleared
+    screen is redrawn it repositions the cursor and rewrites only the
+    lines that changed (e.g. the question and prompt below an unchanged
+    header). Whenever the copy may not match the terminal - the screen
+    scrolled, a line wrapped, unknown control codes were written, the
+    terminal was resized or invalidate() was called - the next screen
+    is repainted in full.
+    """
+
+    def __init__(self, differential: bool = True, colors: bool = True):
+        """
+        Initialize the renderer.
+
+        Args:
+            differential: Redraw only changed lines instead of repainting
+            colors: Keep color and style codes (stripped if False)
+        """
+        super().__init__()
+        self.differential = differential
+        self.colors = colors
+        self._screen: Optional[List[str]] = None  # None: contents unknown
+        self._previous: Optional[List[str]] = None
+        self._cleared = False
+        self._size: Optional[Tuple[int, int]] = None  # size the screen was drawn at
+
+    def size(self) -> Tuple[int, int]:
+        """Terminal size as (columns, rows)."""
+        size = shutil.get_terminal_size()
+        return size.columns, size.lines
+
+    def invalidate(self):
+        """Forget what is on screen; the next screen is repainted in full."""
+        self._previous = None
+        if not self._cleared:
+            self._screen = None
+
+    def clear(self):
+        """Start a fresh screen; the old one is replaced on the next flush."""
+        # Anything drawn but not yet shown would be wiped at once; drop it
+        self._frame.clear()
+        if not self._cleared:
+            self._previous = self._screen
+        self._screen = [""]
+        self._cleared = True
+
+    def flush(self):
+        """Emit the current frame, redrawing the screen if it was cleared."""
+        if not self._frame and not self._cleared:
+            return
+
+        frame = "".join(self._frame)
+        self._frame.clear()
+
+        if self._cleared:
+            self._cleared = False
+            self._record(frame)
+            # A resized terminal has reflowed the old screen
+            size = self.size()
+            resized, self._size = size != self._size, size
+            if self._screen is None or self._previous is None or resized or not self.differential:
+                data = CURSOR_HOME + ERASE_SCREEN + frame
+            else:
+                data = self._redraw(self._previous, self._screen)
+            self._previous = None
+        else:
+            self._record(frame)
+            data = frame
+
+        if data and not self.colors:
+            data = SGR_ESCAPE.sub("", data)
+        if data:
+            self.emit(data)
+
+    def echo(self, text: str):
+        """Note input the terminal echoed, so the screen copy stays exact."""
+        self._record(text)
+
+    def _record(self, text: str):
+        """Add text written at the cursor to the copy of the screen."""
+        if self._screen is None or not text:
+            return
+        lines = text.split("\n")
+        self._screen[-1] += lines[0]
+        self._screen.extend(lines[1:])
+
+        columns, rows = self.size()
+        if len(self._screen) > rows:
+            self._screen = None
+            return
+        for line in self._screen[-len(lines):]:
+            width = display_width(line)
+            if width is None or width >= columns:
+                self._screen = None
+                return
+
+    def _redraw(self, old: List[str], new: List[str]) -> str:
+        """Escape sequences and text that turn the old screen into the new one."""
+        parts = []
+        style = ""       # SGR state in effect at the start of each line
+        in_run = False
+        last = len(new) - 1
+        for row, line in enumerate(new):
+            # The last line holds the cursor, so it is always rewritten
+            changed = row == last or row >= len(old) or old[row] != line
+            if changed:
+                if not in_run:
+                    parts.append(f"\033[{row + 1};1H{RESET_STYLE}{style}")
+                    in_run = True
+                parts.append(line)
+                if row != last:
+                    parts.append(ERASE_LINE + "\n")
+            else:
+                in_run = False
+            for code in SGR_ESCAPE.findall(line):
+                style = "" if code in (RESET_STYLE, "\033[m") else style + code
+        parts.append(ERASE_BELOW)
+        return "".join(parts)
+
+
+class TTYRenderer(AnsiRenderer):
+    """Writes each frame to a terminal with a single write call."""
+
+    def __init__(self, stream: Optional[TextIO] = None, differential: bool = True, colors: bool = True):
+        super().__init__(differential=differential, colors=colors)
+        self.stream = stream or sys.stdout
+        self.fd = self.stream.fileno()
+        self.encoding = getattr(self.stream, "encoding", None) or "utf-8"
+        self.ansi = _enable_ansi(self.fd)
+
+    def size(self) -> Tuple[int, int]:
+        try:
+            size = os.get_terminal_size(self.fd)
+        except OSError:
+            return super().size()
+        return size.columns, size.lines
+
+    def clear(self):
+        if self.ansi:
+            super().clear()
+            return
+        # Console without escape sequence support
+        self.flush()
+        os.system('cls')
+
+    def emit(self, frame: str):
+        # Anything print()ed outside the renderer must land first
+        self.stream.flush()
+        data = memoryview(frame.encode(self.encoding, errors="replace"))
+        while data:
+            written = os.write(self.fd, data)
+            data = data[written:]
+
+
+def _enable_ansi(fd: int) -> bool:
+    """Make sure the terminal on fd interprets ANSI escape sequences."""
+    if os.name != 'nt':
+        return True
+    try:
+        import ctypes
+        import msvcrt
+
+        kernel32 = ctypes.windll.kernel32
+        handle = msvcrt.get_osfhandle(fd)
+        mode = ctypes.c_uint32()
+        if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            return False
+        # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+        return bool(kernel32.SetConsoleMode(handle, mode.value | 0x0004))
+    except (ImportError, AttributeError, OSError):
+        return False
+
+
+class PlainTextRenderer(Renderer):
+    """
+    Writes frames to any text stream, e.g. a pipe, file or socket.
+
+    Screen clears become blank-line separators, and ANSI codes are
+    stripped unless strip_ansi is False.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, strip_ansi: bool = True):
+        super().__init__()
+        self.stream = stream or sys.stdout
+        self.strip_ansi = strip_ansi
+
+    def clear(self):
+        self.write("\n")
+
+    def emit(self, frame: str):
+        if self.strip_ansi:
+            frame = ANSI_ESCAPE.sub("", frame)
+        self.stream.write(frame)
+        self.stream.flush()
+
+
+class NullRenderer(Renderer):
+    """Discards output while counting frames and characters (for benchmarks)."""
+
+    def __init__(self):
+        super().__init__()
+        self.frames = 0
+        self.chars = 0
+
+    def clear(self):
+        pass
+
+    def emit(self, frame: str):
+        self.frames += 1
+        self.chars += len(frame)
+
+
+def default_renderer(colors: bool = True) -> Renderer:
+    """
+    Pick the renderer for the local terminal.
+
+    Args:
+        colors: Whether the terminal (or pipe) should get color codes
+    """
+    try:
+        if sys.stdout.isatty():
+            return TTYRenderer(sys.stdout, colors=colors)
+    except (AttributeError, ValueError, OSError):
+        pass
+    return PlainTextRenderer(sys.stdout, strip_ansi=not colors)
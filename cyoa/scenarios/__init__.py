@@ -1,10 +1,6 @@
 """Scenario modules for each exercise."""
 
-from .exercise1 import get_exercise as get_exercise1
-from .exercise2 import get_exercise as get_exercise2
-from .exercise3 import get_exercise as get_exercise3
-from .exercise4 import get_exercise as get_exercise4
-from .exercise5 import get_exercise as get_exercise5
+import importlib
 
 __all__ = [
     "get_exercise1",
@@ -13,3 +9,13 @@ __all__ = [
     "get_exercise4",
     "get_exercise5",
 ]
+
+
+def __getattr__(name):
+    # Import exercise modules only when their builder is first asked for
+    if name in __all__:
+        module = importlib.import_module(f".exercise{name[-1]}", __name__)
+        builder = module.get_exercise
+        globals()[name] = builder
+        return builder
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
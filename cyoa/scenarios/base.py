@@ -1,9 +1,13 @@
 """Base classes for scenarios and questions."""
 
+import hashlib
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Any, Callable
+from typing import List, Dict, Optional, Any, Callable, ClassVar, Tuple
 from enum import Enum
 
+from ..keywords import KeywordMatcher
+from ..ranking import RANKING_SCORERS, inverse_permutation
+
 
 class QuestionType(Enum):
     """Types of questions available."""
@@ -27,6 +31,20 @@ class Question:
     hint: Optional[str] = None
     points: int = 1
     question_type: QuestionType = field(default=QuestionType.FREE_TEXT)
+    _rubric_version: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    # Fields check_answer reads; subclasses add their own
+    RUBRIC_FIELDS: ClassVar[Tuple[str, ...]] = (
+        "correct_answer", "points", "feedback_correct", "feedback_incorrect",
+    )
+
+    @property
+    def rubric_version(self) -> str:
+        """Short hash of the fields that decide grading, computed on first use."""
+        if self._rubric_version is None:
+            rubric = (type(self).__name__,) + tuple(getattr(self, name) for name in self.RUBRIC_FIELDS)
+            self._rubric_version = hashlib.sha1(repr(rubric).encode("utf-8")).hexdigest()[:12]
+        return self._rubric_version
 
     def check_answer(self, answer: Any) -> tuple:
         """
@@ -57,13 +75,31 @@ class MultipleChoiceQuestion(Question):
 
 @dataclass
 class RankingQuestion(Question):
-    """Question where user ranks items in order."""
+    """
+    Question where user ranks items in order.
+
+    scoring picks the partial-credit policy from cyoa.ranking:
+    "position" (exact position matches), "kendall" (pairs in the right
+    order), "footrule" (total displacement) or "topk" (displacement
+    weighted towards the top ranks).
+    """
 
     items: List[str] = field(default_factory=list)
     num_ranks: int = 3
+    scoring: str = "position"
+    correct_positions: Dict[int, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    RUBRIC_FIELDS: ClassVar[Tuple[str, ...]] = Question.RUBRIC_FIELDS + ("scoring",)
 
     def __post_init__(self):
         self.question_type = QuestionType.RANKING
+        if self.scoring not in RANKING_SCORERS:
+            raise ValueError(
+                f"Unknown ranking scoring {self.scoring!r}; "
+                f"expected one of {', '.join(RANKING_SCORERS)}"
+            )
+        # Inverse permutation of the correct order: item -> position
+        self.correct_positions = inverse_permutation(self.correct_answer or [])
 
     def check_answer(self, answer: List[int]) -> tuple:
         """
@@ -74,14 +110,11 @@ class RankingQuestion(Question):
         if answer == self.correct_answer:
             return (True, self.points, self.feedback_correct)
 
-        # Calculate partial score based on position matches
-        correct_positions = sum(
-            1 for i, val in enumerate(answer)
-            if i < len(self.correct_answer) and val == self.correct_answer[i]
-        )
+        # Calculate partial score with the question's scoring policy
+        similarity = RANKING_SCORERS[self.scoring](answer, self.correct_answer, self.correct_positions)
 
-        if correct_positions > 0:
-            partial_score = (correct_positions / len(self.correct_answer)) * self.points
+        if similarity > 0:
+            partial_score = similarity * self.points
             feedback = f"Partially correct. {self.feedback_incorrect}"
             return (False, partial_score, feedback)
 
@@ -95,9 +128,24 @@ class FreeTextQuestion(Question):
     required_keywords: List[str] = field(default_factory=list)
     bonus_keywords: List[str] = field(default_factory=list)
     min_keywords: int = 2
+    whole_words: bool = False  # Match keywords only on word boundaries
+    _matcher: Optional[KeywordMatcher] = field(default=None, init=False, repr=False, compare=False)
+
+    RUBRIC_FIELDS: ClassVar[Tuple[str, ...]] = Question.RUBRIC_FIELDS + (
+        "required_keywords", "bonus_keywords", "min_keywords", "whole_words",
+    )
 
     def __post_init__(self):
         self.question_type = QuestionType.FREE_TEXT
+        if not all(self.required_keywords) or not all(self.bonus_keywords):
+            raise ValueError(f"Question {self.id!r} has an empty keyword")
+
+    @property
+    def keyword_matcher(self) -> KeywordMatcher:
+        """Matcher for required then bonus keywords, compiled on first use."""
+        if self._matcher is None:
+            self._matcher = KeywordMatcher(self.required_keywords + self.bonus_keywords, self.whole_words)
+        return self._matcher
 
     def check_answer(self, answer: str) -> tuple:
         """
@@ -105,19 +153,15 @@ class FreeTextQuestion(Question):
 
         Returns partial credit based on keywords found.
         """
-        answer_lower = answer.lower()
+        # One pass over the answer finds both required and bonus keywords
+        found = self.keyword_matcher.find(answer)
+        num_required = len(self.required_keywords)
 
         # Count required keywords found
-        required_found = sum(
-            1 for kw in self.required_keywords
-            if kw.lower() in answer_lower
-        )
+        required_found = sum(1 for i in found if i < num_required)
 
         # Count bonus keywords found
-        bonus_found = sum(
-            1 for kw in self.bonus_keywords
-            if kw.lower() in answer_lower
-        )
+        bonus_found = len(found) - required_found
 
         total_required = len(self.required_keywords)
 
@@ -136,7 +180,7 @@ class FreeTextQuestion(Question):
             # Partial credit
             ratio = required_found / total_required
             score = self.points * ratio
-            missing = [kw for kw in self.required_keywords if kw.lower() not in answer_lower]
+            missing = [kw for i, kw in enumerate(self.required_keywords) if i not in found]
             feedback = f"Good response, but consider also discussing: {', '.join(missing[:3])}"
             return (False, score, feedback)
 
@@ -148,26 +192,71 @@ class FreeTextQuestion(Question):
 
 @dataclass
 class ChecklistQuestion(Question):
-    """Question where user selects multiple correct options."""
+    """
+    Question where user selects multiple correct options.
+
+    Each option key is given a bit when the question is constructed, so
+    a set of selections is a single int mask and scoring is popcounts
+    of AND / AND-NOT. Progress stores answers as these masks.
+    """
 
     options: List[tuple] = field(default_factory=list)  # [(key, text), ...]
     correct_answers: List[str] = field(default_factory=list)
+    option_bits: Dict[str, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+    correct_mask: int = field(default=0, init=False, repr=False, compare=False)
+    options_mask: int = field(default=0, init=False, repr=False, compare=False)
+
+    # Option order decides the bits, so options are part of the rubric
+    RUBRIC_FIELDS: ClassVar[Tuple[str, ...]] = Question.RUBRIC_FIELDS + ("options", "correct_answers")
 
     def __post_init__(self):
         self.question_type = QuestionType.CHECKLIST
 
-    def check_answer(self, answers: List[str]) -> tuple:
-        """Check checklist answer."""
-        answers_upper = set(a.upper() for a in answers)
-        correct_upper = set(a.upper() for a in self.correct_answers)
+        for key, _ in self.options:
+            self.option_bits.setdefault(key.upper(), 1 << len(self.option_bits))
+        self.options_mask = (1 << len(self.option_bits)) - 1
+        # A correct answer missing from the options still counts towards the total
+        for key in self.correct_answers:
+            self.option_bits.setdefault(key.upper(), 1 << len(self.option_bits))
+        self.correct_mask = self.mask_of(self.correct_answers)[0]
 
-        if answers_upper == correct_upper:
+    def mask_of(self, selections: List[str]) -> tuple:
+        """
+        Encode option keys as a selection mask.
+
+        Returns:
+            Tuple of (mask, number of distinct keys that are not options)
+        """
+        mask = 0
+        unknown = set()
+        for selection in selections:
+            key = selection.upper()
+            bit = self.option_bits.get(key)
+            if bit is None:
+                unknown.add(key)
+            else:
+                mask |= bit
+        return (mask, len(unknown))
+
+    def selections_of(self, mask: int) -> List[str]:
+        """Decode a selection mask into option keys, in option order."""
+        return [key for key, bit in self.option_bits.items() if mask & bit]
+
+    def check_answer(self, answers) -> tuple:
+        """Check checklist answer, given as a selection mask or list of keys."""
+        if isinstance(answers, int):
+            mask, unknown = answers, 0
+        else:
+            mask, unknown = self.mask_of(answers)
+        correct_mask = self.correct_mask
+
+        if mask == correct_mask and not unknown:
             return (True, self.points, self.feedback_correct)
 
         # Partial credit
-        correct_selected = len(answers_upper & correct_upper)
-        incorrect_selected = len(answers_upper - correct_upper)
-        total_correct = len(correct_upper)
+        correct_selected = _popcount(mask & correct_mask)
+        incorrect_selected = _popcount(mask & ~correct_mask) + unknown
+        total_correct = _popcount(correct_mask)
 
         if correct_selected > 0 and incorrect_selected == 0:
             # Some correct, none wrong
@@ -184,6 +273,11 @@ class ChecklistQuestion(Question):
         return (False, 0, self.feedback_incorrect)
 
 
+def _popcount(mask: int) -> int:
+    """Number of set bits in a non-negative mask."""
+    return bin(mask).count("1")
+
+
 @dataclass
 class Scenario:
     """A scenario containing multiple questions."""
@@ -0,0 +1,93 @@
+"""Exercise registry: a light manifest, with exercises built on demand."""
+
+import importlib
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from .base import Exercise
+
+
+@dataclass(frozen=True)
+class ExerciseInfo:
+    """
+    Menu-level metadata for an exercise.
+
+    Has the id, number and title the menus need, so the full Exercise
+    (every Scenario and Question with their feedback text) is only
+    built by load() when the learner enters it.
+    """
+
+    id: str
+    number: int
+    title: str
+    question_count: int
+    total_points: int
+    module: str  # Module in cyoa.scenarios providing get_exercise()
+    # Builds the exercise instead of importing module (see cyoa.content)
+    loader: Optional[Callable[[], Exercise]] = field(default=None, compare=False, repr=False)
+
+    def load(self) -> Exercise:
+        """Import and build the full exercise (cached)."""
+        return load_exercise(self)
+
+
+# Keep in step with the exercise modules; check_manifest() verifies it.
+MANIFEST: List[ExerciseInfo] = [
+    ExerciseInfo("exercise1", 1, "CIA Triad Analysis", 10, 25, "exercise1"),
+    ExerciseInfo("exercise2", 2, "Threat Actor Analysis", 11, 26, "exercise2"),
+    ExerciseInfo("exercise3", 3, "Mission Impact Analysis", 13, 29, "exercise3"),
+    ExerciseInfo("exercise4", 4, "Ethical Scenarios", 15, 30, "exercise4"),
+    ExerciseInfo("exercise5", 5, "Comprehensive Scenario Assessment", 13, 32, "exercise5"),
+]
+
+_loaded: Dict[str, Exercise] = {}
+
+
+def load_exercise(info: ExerciseInfo) -> Exercise:
+    """
+    Build the exercise described by a manifest entry.
+
+    Each exercise is built once and then shared, so every session (and
+    the server's many sessions) reuse the same read-only objects.
+    """
+    if info.loader is not None:
+        return info.loader()
+
+    exercise = _loaded.get(info.id)
+    if exercise is None:
+        module = importlib.import_module(f"{__package__}.{info.module}")
+        exercise = module.get_exercise()
+        _loaded[info.id] = exercise
+    return exercise
+
+
+def load_all() -> List[Exercise]:
+    """Build every exercise in the manifest, in order."""
+    return [load_exercise(info) for info in MANIFEST]
+
+
+def describe(exercise: Exercise, module: str) -> ExerciseInfo:
+    """Manifest entry for a built exercise."""
+    return ExerciseInfo(
+        id=exercise.id,
+        number=exercise.number,
+        title=exercise.title,
+        question_count=exercise.get_total_questions(),
+        total_points=exercise.get_total_points(),
+        module=module,
+    )
+
+
+def check_manifest() -> List[str]:
+    """
+    Compare the manifest with the exercises it describes.
+
+    Returns:
+        Descriptions of mismatched entries (empty if up to date)
+    """
+    problems = []
+    for info in MANIFEST:
+        actual = describe(load_exercise(info), info.module)
+        if actual != info:
+            problems.append(f"{info.module}: manifest has {info}, exercise is {actual}")
+    return problems
@@ -0,0 +1,421 @@
+"""Asyncio terminal server hosting many learner sessions in one process."""
+
+import asyncio
+import contextlib
+import contextvars
+import os
+import re
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from . import ui
+from .engine import GameEngine
+from .index import ContentIndex
+from .progress import ProgressManager
+from .render import AnsiRenderer
+from .storage import ProgressStore, SQLiteStore, create_store
+from .scenarios.base import Exercise
+
+
+# Telnet commands (RFC 854) and the window size option (NAWS, RFC 1073)
+IAC, DONT, DO, WONT, WILL, SB, SE = 255, 254, 253, 252, 251, 250, 240
+NAWS = 31
+
+# Longest input line a client may send
+MAX_LINE = 64 * 1024
+
+_LEARNER_ID = re.compile(r"^[A-Za-z0-9_.-]{1,64}$")
+
+
+class SessionClosed(Exception):
+    """Raised when the remote side of a session disconnects."""
+
+
+class _TelnetParser:
+    """
+    Separates input data from telnet commands.
+
+    Option negotiation is dropped; window size reports (NAWS) update
+    size. An escaped IAC (0xff 0xff) is a data byte.
+    """
+
+    _DATA, _COMMAND, _OPTION, _SUB, _SUB_IAC = range(5)
+
+    # Smaller reports are ignored (0 means unknown)
+    MIN_COLUMNS = 20
+    MIN_ROWS = 5
+
+    def __init__(self):
+        self.size: Optional[Tuple[int, int]] = None  # (columns, rows) last reported
+        self._state = self._DATA
+        self._sub = bytearray()
+
+    def feed(self, chunk: bytes) -> bytes:
+        """Parse received bytes; returns the data bytes among them."""
+        if self._state == self._DATA and IAC not in chunk:
+            return chunk
+        data = bytearray()
+        for byte in chunk:
+            state = self._state
+            if state == self._DATA:
+                if byte == IAC:
+                    self._state = self._COMMAND
+                else:
+                    data.append(byte)
+            elif state == self._COMMAND:
+                if byte == IAC:
+                    data.append(IAC)
+                    self._state = self._DATA
+                elif byte in (WILL, WONT, DO, DONT):
+                    self._state = self._OPTION
+                elif byte == SB:
+                    self._sub.clear()
+                    self._state = self._SUB
+                else:
+                    self._state = self._DATA
+            elif state == self._OPTION:
+                self._state = self._DATA
+            elif state == self._SUB:
+                if byte == IAC:
+                    self._state = self._SUB_IAC
+                else:
+                    self._sub.append(byte)
+            else:  # IAC inside a subnegotiation
+                if byte == IAC:
+                    self._sub.append(IAC)
+                    self._state = self._SUB
+                else:
+                    if byte == SE:
+                        self._subnegotiation(bytes(self._sub))
+                    self._state = self._DATA
+        return bytes(data)
+
+    def _subnegotiation(self, sub: bytes):
+        if len(sub) == 5 and sub[0] == NAWS:
+            columns = sub[1] << 8 | sub[2]
+            rows = sub[3] << 8 | sub[4]
+            if columns >= self.MIN_COLUMNS and rows >= self.MIN_ROWS:
+                self.size = (columns, rows)
+
+
+class _StreamRenderer(AnsiRenderer):
+    """Renders frames onto an asyncio stream with telnet line endings."""
+
+    def __init__(self, writer: asyncio.StreamWriter, columns: int = 80, rows: int = 24):
+        # Remote clients get colors whatever the server's own stdout is
+        super().__init__(colors=True)
+        self.writer = writer
+        self.columns = columns
+        self.rows = rows
+
+    def size(self) -> Tuple[int, int]:
+        return self.columns, self.rows
+
+    def emit(self, frame: str):
+        self.writer.write(frame.replace("\n", "\r\n").encode("utf-8"))
+
+
+class DeferredStore(ProgressStore):
+    """
+    A learner's store whose writes run off the event loop.
+
+    Writes are queued in order and performed by drain(), which the
+    session awaits before it waits for its next line of input. They run
+    in a worker thread while the session's own coroutine is suspended,
+    so a slow fsync or commit holds up only that learner, and the
+    snapshot callable can safely read the session. Reads first perform
+    any queued writes.
+
+    The server is the only writer of a connected learner's progress, so
+    the fingerprint is constant and the live session is never reloaded.
+    """
+
+    def __init__(
+        self,
+        store: ProgressStore,
+        executor: Optional[Executor] = None,
+        lock: Optional[threading.Lock] = None
+    ):
+        """
+        Wrap a store.
+
+        Args:
+            store: The learner's store
+            executor: Where writes run (default: the loop's default executor)
+            lock: Held around every use of the store, for backends that
+                share one connection between learners
+        """
+        self.store = store
+        self.executor = executor
+        self.lock = lock or contextlib.nullcontext()
+        self._queue: List[Callable[[], Any]] = []
+        self._fingerprint = ("deferred", id(self))
+
+    @property
+    def warn(self):
+        return self.store.warn
+
+    @warn.setter
+    def warn(self, value):
+        self.store.warn = value
+
+    @property
+    def pending(self) -> int:
+        """Queued writes."""
+        return len(self._queue)
+
+    def _run(self, jobs: List[Callable[[], Any]]):
+        with self.lock:
+            for job in jobs:
+                job()
+
+    def run_pending(self):
+        """Perform queued writes in the calling thread."""
+        jobs, self._queue = self._queue, []
+        self._run(jobs)
+
+    async def drain(self):
+        """Perform queued writes in a worker thread."""
+        loop = asyncio.get_running_loop()
+        while self._queue:
+            jobs, self._queue = self._queue, []
+            # Warnings from the worker still reach this session's screen
+            context = contextvars.copy_context()
+            await loop.run_in_executor(self.executor, context.run, self._run, jobs)
+
+    def _read(self, method: Callable[[], Any]) -> Any:
+        self.run_pending()
+        with self.lock:
+            return method()
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        return self._read(self.store.load)
+
+    def load_timings(self) -> Optional[Dict[str, Any]]:
+        return self._read(self.store.load_timings)
+
+    def get_summary(self) -> Optional[Dict[str, Any]]:
+        return self._read(self.store.get_summary)
+
+    def fingerprint(self) -> Optional[tuple]:
+        return self._fingerprint
+
+    def save(self, data: Dict[str, Any]):
+        self._queue.append(partial(self.store.save, data))
+
+    def reset(self):
+        self._queue.append(self.store.reset)
+
+    def write_changes(self, session_id, changes, snapshot):
+        self._queue.append(partial(self.store.write_changes, session_id, changes, snapshot))
+
+    def save_timings(self, data: Dict[str, Any]):
+        self._queue.append(partial(self.store.save_timings, data))
+
+
+class RemoteIO:
+    """
+    Line I/O over an asyncio stream pair, one per connection.
+
+    Each frame is sent in one write when the session next waits for
+    input, so an idle learner holds no thread, only its buffers.
+    Screens are laid out for the client's window size, which telnet
+    clients report (NAWS); others get 80 columns.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.renderer = _StreamRenderer(writer)
+        self.store: Optional[DeferredStore] = None
+        self._telnet = _TelnetParser()
+        self._pending = bytearray()  # data received after the last full line
+
+    @property
+    def width(self) -> int:
+        """Columns of the client's terminal (see ui.get_terminal_width)."""
+        return self.renderer.columns
+
+    def request_window_size(self):
+        """Ask a telnet client to report its window size, now and on resize."""
+        self.writer.write(bytes([IAC, DO, NAWS]))
+
+    async def flush(self):
+        """Send the current frame to the client."""
+        self.renderer.flush()
+        await self.writer.drain()
+
+    async def readline(self, prompt: str = "") -> str:
+        """Show the prompt and wait for one line from the client."""
+        self.renderer.write(prompt)
+        await self.flush()
+        # The screen is up; write the progress it reflects while the learner reads
+        if self.store is not None:
+            await self.store.drain()
+
+        line = await self._read_line()
+        line = line.decode("utf-8", errors="replace").rstrip("\r\n\0")
+        # The client echoed the line locally
+        self.renderer.echo(line + "\n")
+        return line
+
+    async def _read_line(self) -> bytes:
+        """Receive up to and including the next newline, minus telnet commands."""
+        while True:
+            end = self._pending.find(b"\n")
+            if end >= 0:
+                line = bytes(self._pending[:end + 1])
+                del self._pending[:end + 1]
+                return line
+            if len(self._pending) > MAX_LINE:
+                raise SessionClosed()
+
+            chunk = await self.reader.read(4096)
+            if not chunk:
+                raise SessionClosed()
+            self._pending += self._telnet.feed(chunk)
+            if self._telnet.size is not None:
+                # Takes effect from the next screen, repainted in full
+                self.renderer.columns, self.renderer.rows = self._telnet.size
+
+
+class TrainingServer:
+    """
+    Serve the training lab to many concurrent line-oriented connections.
+
+    Every connection gets its own GameEngine and learner-specific
+    ProgressManager; all of them share one read-only set of Exercise
+    objects. Each answer is written through a DeferredStore, off the
+    event loop. SQLite writes share one connection, so they run one at
+    a time on a dedicated thread.
+    """
+
+    def __init__(
+        self,
+        exercises: List[Exercise],
+        data_dir: str = "data",
+        store: str = "json"
+    ):
+        """
+        Initialize the server.
+
+        Args:
+            exercises: Exercises shared by every session
+            data_dir: Directory holding progress files
+            store: Progress storage backend ("json" or "sqlite")
+        """
+        self.exercises = exercises
+        self.index = ContentIndex(exercises)
+        self.data_dir = data_dir
+        self.store = store
+        self.engines: Dict[str, GameEngine] = {}
+
+        # One connection shared by every learner in the database
+        self._conn = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock: Optional[threading.Lock] = None
+        if store == "sqlite":
+            self._conn = SQLiteStore.connect(
+                os.path.join(data_dir, "progress.db"), check_same_thread=False
+            )
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="progress")
+            self._lock = threading.Lock()
+
+    def create_engine(self, learner_id: str) -> GameEngine:
+        """Create a game engine bound to one learner's progress."""
+        if self._conn is not None:
+            kwargs = {"conn": self._conn}
+        else:
+            # One fsynced journal append per answer
+            kwargs = {"journal": True}
+        store = create_store(self.store, self.data_dir, learner_id=learner_id, **kwargs)
+        progress = ProgressManager(
+            self.data_dir,
+            learner_id=learner_id,
+            store=DeferredStore(store, executor=self._executor, lock=self._lock),
+            warn=ui.warn
+        )
+
+        return GameEngine(data_dir=self.data_dir, progress=progress, index=self.index)
+
+    async def login(self, io: RemoteIO) -> str:
+        """Ask the client for a learner ID that is not already connected."""
+        ui.clear_screen()
+        ui.print_header("CYBERSECURITY FOUNDATIONS", "Interactive Training Lab")
+
+        while True:
+            learner_id = (await io.readline("Learner ID: ")).strip()
+            if not _LEARNER_ID.match(learner_id):
+                ui.out(f"{ui.Colors.YELLOW}Use letters, digits, '.', '_' or '-' "
+                       f"(up to 64 characters).{ui.Colors.RESET}")
+            elif learner_id in self.engines:
+                ui.out(f"{ui.Colors.YELLOW}That learner is already connected.{ui.Colors.RESET}")
+            else:
+                return learner_id
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Run one learner session for the lifetime of a connection."""
+        io = RemoteIO(reader, writer)
+        ui.current_io.set(io)
+        io.request_window_size()
+
+        learner_id = None
+        try:
+            learner_id = await self.login(io)
+            engine = self.create_engine(learner_id)
+            self.engines[learner_id] = engine
+            io.store = engine.progress.store
+
+            await engine.main_loop()
+            await io.flush()
+        except (SessionClosed, ConnectionError):
+            pass
+        finally:
+            engine = self.engines.get(learner_id)
+            if engine is not None:
+                engine.progress.flush()
+                await engine.progress.store.drain()
+                self.engines.pop(learner_id, None)
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 2323):
+        """Accept connections until cancelled."""
+        server = await asyncio.start_server(self.handle, host, port)
+        addresses = ", ".join(
+            f"{sock.getsockname()[0]}:{sock.getsockname()[1]}" for sock in server.sockets
+        )
+        print(f"Serving training lab on {addresses} (Ctrl+C to stop)", flush=True)
+
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        """Write out every connected learner's progress."""
+        if self._executor is not None:
+            # Let writes already handed to the writer thread finish first
+            self._executor.shutdown(wait=True)
+        for engine in self.engines.values():
+            engine.progress.flush()
+            engine.progress.store.run_pending()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def serve(
+    exercises: List[Exercise],
+    host: str = "127.0.0.1",
+    port: int = 2323,
+    data_dir: str = "data",
+    store: str = "json"
+):
+    """Run the training server until interrupted."""
+    server = TrainingServer(exercises, data_dir=data_dir, store=store)
+    try:
+        asyncio.run(server.serve(host, port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
@@ -0,0 +1,760 @@
+"""Storage backends for progress persistence."""
+
+import json
+import os
+import re
+import shutil
+import sqlite3
+from typing import Any, Callable, Dict, List, Optional
+
+
+class StoreError(Exception):
+    """Raised when a store holds data that cannot be read."""
+
+
+class ProgressStore:
+    """
+    Base class for progress storage backends.
+
+    Stores exchange progress as plain dicts in the progress.json layout,
+    so backends never need to know about the progress dataclasses.
+
+    Individual changes are passed to ``write_changes`` as compact change
+    records::
+
+        {"op": "answer", "ex": ..., "sc": ..., "q": ..., "ans": ...,
+         "ok": ..., "s": ..., "n": ..., "t": ...}
+        {"op": "complete", "ex": ..., "sc": ..., "exc": ..., "t": ...}
+
+    together with a ``snapshot`` callable that builds the full document
+    on demand; backends that can persist a change cheaply never call it.
+
+    Latency sketches (see cyoa.latency) are stored next to the progress
+    as an opaque JSON document and survive reset().
+
+    Recoverable problems are reported through ``warn`` (print by
+    default), which a server can point at the learner's session.
+    """
+
+    warn: Callable[[str], None] = print
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Load the stored session, or None if there is none."""
+        raise NotImplementedError("Subclasses must implement load")
+
+    def save(self, data: Dict[str, Any]):
+        """Persist a full session document."""
+        raise NotImplementedError("Subclasses must implement save")
+
+    def reset(self):
+        """Delete all stored progress for this learner."""
+        raise NotImplementedError("Subclasses must implement reset")
+
+    def write_changes(
+        self,
+        session_id: str,
+        changes: List[Dict[str, Any]],
+        snapshot: Callable[[], Dict[str, Any]]
+    ):
+        """Persist a batch of change records in one write."""
+        self.save(snapshot())
+
+    def load_timings(self) -> Optional[Dict[str, Any]]:
+        """Load the stored latency sketches, or None if there are none."""
+        return None
+
+    def save_timings(self, data: Dict[str, Any]):
+        """Persist the latency sketches (not kept by default)."""
+
+    def fingerprint(self) -> Optional[tuple]:
+        """
+        Identify the stored state cheaply, without loading it.
+
+        Returns:
+            A value that changes whenever the stored data changes, or None
+            if the backend cannot tell (disables session caching)
+        """
+        return None
+
+    def get_summary(self) -> Optional[Dict[str, Any]]:
+        """
+        Get score and completion aggregates computed by the backend.
+
+        Returns:
+            Dict with total_score, completion_pct and exercises, or None
+            if the backend cannot compute them itself
+        """
+        return None
+
+
+def _fsync_dir(path: str):
+    """Flush a directory entry so a rename survives a crash."""
+    if os.name == 'nt':
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _safe_learner_id(learner_id: str) -> str:
+    """Make a learner id safe for use in a file name."""
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", learner_id)
+
+
+class JsonFileStore(ProgressStore):
+    """
+    Progress stored as one JSON document per learner.
+
+    In journal mode each answer is appended as one compact record to a
+    journal file; ``load`` replays the journal over the last snapshot and
+    every ``compact_every`` records the journal is folded back into a
+    snapshot.
+    """
+
+    def __init__(
+        self,
+        data_dir: str = "data",
+        learner_id: Optional[str] = None,
+        journal: bool = False,
+        compact_every: int = 50,
+        read_only: bool = False
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            data_dir: Directory holding progress files
+            learner_id: Learner whose progress is stored (None for the
+                single-learner progress.json)
+            journal: Append each answer to a journal instead of
+                rewriting the whole progress file
+            compact_every: Journal entries to accumulate before folding
+                them back into the snapshot
+            read_only: Only read: a torn journal tail is skipped rather
+                than cut off (it may be an append still in flight) and
+                writes raise StoreError
+        """
+        name = "progress"
+        if learner_id:
+            name = f"progress_{_safe_learner_id(learner_id)}"
+
+        self.data_dir = data_dir
+        self.path = os.path.join(data_dir, f"{name}.json")
+        self.backup_path = self.path + ".bak"
+        self.journal_path = os.path.join(data_dir, f"{name}.journal")
+        self.timings_path = os.path.join(data_dir, f"{name}.timings")
+        self.journal = journal
+        self.compact_every = compact_every
+        self.read_only = read_only
+        self._journal_entries = 0
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Load the snapshot and replay any journal entries over it.
+
+        Falls back to the previous generation if the current snapshot is
+        missing or unreadable.
+        """
+        data = None
+        for path in (self.path, self.backup_path):
+            if not os.path.exists(path):
+                continue
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+                break
+            except json.JSONDecodeError as e:
+                if path == self.backup_path:
+                    raise
+                self.warn(f"Warning: Progress file is corrupt ({e}); using previous copy")
+
+        if data is None:
+            return None
+
+        self._journal_entries = self._replay_journal(data)
+        return data
+
+    def save(self, data: Dict[str, Any]):
+        """
+        Atomically write a full snapshot.
+
+        The document is written to a temporary file and fsynced before
+        being renamed over the snapshot, so a crash leaves either the old
+        or the new snapshot intact. The replaced snapshot is kept as the
+        previous generation; the snapshot file itself is never missing.
+        """
+        self._check_writable()
+        os.makedirs(self.data_dir, exist_ok=True)
+
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+
+        # Keep the current snapshot as the previous generation without
+        # ever taking it away: link (or copy) it, then rename over the .bak
+        if os.path.exists(self.path):
+            backup_tmp = self.backup_path + ".tmp"
+            if os.path.exists(backup_tmp):
+                os.remove(backup_tmp)
+            try:
+                os.link(self.path, backup_tmp)
+            except OSError:
+                shutil.copy2(self.path, backup_tmp)
+            os.replace(backup_tmp, self.backup_path)
+        os.replace(tmp_path, self.path)
+        _fsync_dir(self.data_dir)
+
+        # The snapshot now contains everything the journal held
+        self._truncate_journal()
+
+    def reset(self):
+        """Delete the snapshot, its previous generation and the journal."""
+        self._check_writable()
+        for path in (self.path, self.backup_path):
+            if os.path.exists(path):
+                os.remove(path)
+        self._truncate_journal()
+
+    def write_changes(self, session_id, changes, snapshot):
+        """Append the changes to the journal, or rewrite the snapshot."""
+        self._check_writable()
+        # Journal entries are only meaningful on top of a snapshot
+        if not self.journal or not os.path.exists(self.path):
+            self.save(snapshot())
+            return
+
+        with open(self.journal_path, 'a') as f:
+            f.write("".join(
+                json.dumps(dict(change, sid=session_id), separators=(",", ":")) + "\n"
+                for change in changes
+            ))
+            f.flush()
+            os.fsync(f.fileno())
+
+        self._journal_entries += len(changes)
+        if self._journal_entries >= self.compact_every:
+            self.save(snapshot())
+
+    def load_timings(self) -> Optional[Dict[str, Any]]:
+        """Read the latency sketch file next to the snapshot."""
+        try:
+            with open(self.timings_path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except json.JSONDecodeError as e:
+            raise StoreError(f"{self.timings_path}: {e}") from e
+
+    def save_timings(self, data: Dict[str, Any]):
+        """Replace the latency sketch file (atomically, without fsync)."""
+        self._check_writable()
+        os.makedirs(self.data_dir, exist_ok=True)
+        tmp_path = self.timings_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, self.timings_path)
+
+    def fingerprint(self) -> Optional[tuple]:
+        """Stat the snapshot and journal: (mtime, size, inode) of each."""
+        result = []
+        for path in (self.path, self.journal_path):
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                result.append(None)
+            else:
+                result.append((st.st_mtime_ns, st.st_size, st.st_ino))
+        return tuple(result)
+
+    def _replay_journal(self, data: dict) -> int:
+        """
+        Apply journal records on top of a loaded snapshot.
+
+        Records carry absolute values, so replaying an entry that the
+        snapshot already contains is harmless. A torn record left at the
+        end by an interrupted append is truncated away, so the next
+        append is not glued onto it.
+
+        Returns:
+            Number of records applied
+        """
+        if not os.path.exists(self.journal_path):
+            return 0
+
+        applied = 0
+        good = 0  # byte offset just past the last complete record
+        torn = False
+        exercises = data.setdefault("exercises", {})
+        with open(self.journal_path, 'rb') as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("record without its newline")
+                    record = json.loads(line)
+                except ValueError:
+                    # A torn final line from an interrupted append
+                    torn = True
+                    break
+                good += len(line)
+
+                if record.get("sid") != data.get("session_id"):
+                    continue
+
+                ex = exercises.setdefault(record["ex"], {
+                    "exercise_id": record["ex"],
+                    "started": False,
+                    "completed": False,
+                    "scenarios": {}
+                })
+                sc = ex["scenarios"].setdefault(record["sc"], {
+                    "scenario_id": record["sc"],
+                    "started": False,
+                    "completed": False,
+                    "questions": {}
+                })
+
+                if record["op"] == "answer":
+                    ex["started"] = sc["started"] = True
+                    sc["questions"][record["q"]] = {
+                        "question_id": record["q"],
+                        "answered": True,
+                        "correct": record["ok"],
+                        "score": record["s"],
+                        "attempts": record["n"],
+                        "user_answer": record["ans"],
+                        "timestamp": record["t"]
+                    }
+                    data["resume"] = {"ex": record["ex"], "sc": record["sc"], "q": record["q"]}
+                elif record["op"] == "complete":
+                    sc["completed"] = True
+                    if record["exc"]:
+                        ex["completed"] = True
+
+                data["last_updated"] = record["t"]
+                applied += 1
+
+        if torn and not self.read_only:
+            # Cut the fragment off so later appends start on a clean line
+            self.warn(f"Warning: Discarding a torn record at the end of {self.journal_path}")
+            with open(self.journal_path, 'r+b') as f:
+                f.truncate(good)
+                f.flush()
+                os.fsync(f.fileno())
+
+        return applied
+
+    def _check_writable(self):
+        if self.read_only:
+            raise StoreError(f"{self.path} is opened read-only")
+
+    def _truncate_journal(self):
+        """Discard journal records that are now part of the snapshot."""
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self._journal_entries = 0
+
+
+class SQLiteStore(ProgressStore):
+    """
+    Progress for many learners in one SQLite database.
+
+    Each level of the progress tree lives in its own table keyed by
+    learner id. Recording an answer is a single-row upsert and summaries
+    are answered by aggregate queries.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            learner_id TEXT PRIMARY KEY,
+            session_id TEXT NOT NULL,
+            created TEXT NOT NULL,
+            last_updated TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS exercise_progress (
+            learner_id TEXT NOT NULL,
+            exercise_id TEXT NOT NULL,
+            started INTEGER NOT NULL DEFAULT 0,
+            completed INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (learner_id, exercise_id)
+        );
+        CREATE TABLE IF NOT EXISTS scenario_progress (
+            learner_id TEXT NOT NULL,
+            exercise_id TEXT NOT NULL,
+            scenario_id TEXT NOT NULL,
+            started INTEGER NOT NULL DEFAULT 0,
+            completed INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (learner_id, exercise_id, scenario_id)
+        );
+        CREATE TABLE IF NOT EXISTS question_progress (
+            learner_id TEXT NOT NULL,
+            exercise_id TEXT NOT NULL,
+            scenario_id TEXT NOT NULL,
+            question_id TEXT NOT NULL,
+            answered INTEGER NOT NULL DEFAULT 0,
+            correct INTEGER NOT NULL DEFAULT 0,
+            score REAL NOT NULL DEFAULT 0,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            user_answer TEXT,
+            timestamp TEXT,
+            PRIMARY KEY (learner_id, exercise_id, scenario_id, question_id)
+        );
+        CREATE INDEX IF NOT EXISTS idx_question_progress_question
+            ON question_progress (exercise_id, question_id);
+        CREATE TABLE IF NOT EXISTS timings (
+            learner_id TEXT PRIMARY KEY,
+            data TEXT NOT NULL
+        );
+    """
+
+    def __init__(
+        self,
+        path: str,
+        learner_id: Optional[str] = None,
+        conn: Optional[sqlite3.Connection] = None
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            path: SQLite database file
+            learner_id: Learner whose progress is stored
+            conn: Connection to share with other learners' stores
+                (see SQLiteStore.connect)
+        """
+        self.path = path
+        self.learner_id = learner_id or "default"
+        self.conn = conn or self.connect(path)
+
+        # (exercise_id, scenario_id) pairs already marked started on disk
+        self._started = set()
+        self._has_session = False
+
+    @classmethod
+    def connect(cls, path: str, check_same_thread: bool = True) -> sqlite3.Connection:
+        """
+        Open a database connection and make sure the schema exists.
+
+        Args:
+            path: SQLite database file
+            check_same_thread: Refuse use from other threads; pass False
+                only if every use of the connection is serialized
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(path, timeout=30, check_same_thread=check_same_thread)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(cls.SCHEMA)
+        return conn
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Assemble the learner's session from its rows."""
+        try:
+            return self._load()
+        except sqlite3.DatabaseError as e:
+            raise StoreError(str(e)) from e
+
+    def _load(self) -> Optional[Dict[str, Any]]:
+        learner = (self.learner_id,)
+        row = self.conn.execute(
+            "SELECT session_id, created, last_updated FROM sessions WHERE learner_id = ?",
+            learner
+        ).fetchone()
+        if row is None:
+            self._has_session = False
+            return None
+
+        data = {
+            "session_id": row[0],
+            "created": row[1],
+            "last_updated": row[2],
+            "exercises": {}
+        }
+        exercises = data["exercises"]
+
+        for ex_id, started, completed in self.conn.execute(
+            "SELECT exercise_id, started, completed FROM exercise_progress "
+            "WHERE learner_id = ?", learner
+        ):
+            exercises[ex_id] = self._exercise_dict(ex_id)
+            exercises[ex_id]["started"] = bool(started)
+            exercises[ex_id]["completed"] = bool(completed)
+
+        self._started = set()
+        for ex_id, sc_id, started, completed in self.conn.execute(
+            "SELECT exercise_id, scenario_id, started, completed FROM scenario_progress "
+            "WHERE learner_id = ?", learner
+        ):
+            ex = exercises.setdefault(ex_id, self._exercise_dict(ex_id))
+            ex["scenarios"][sc_id] = {
+                "scenario_id": sc_id,
+                "started": bool(started),
+                "completed": bool(completed),
+                "questions": {}
+            }
+            if started:
+                self._started.add((ex_id, sc_id))
+
+        for (ex_id, sc_id, q_id, answered, correct, score,
+             attempts, user_answer, timestamp) in self.conn.execute(
+            "SELECT exercise_id, scenario_id, question_id, answered, correct, score, "
+            "attempts, user_answer, timestamp FROM question_progress "
+            "WHERE learner_id = ?", learner
+        ):
+            ex = exercises.setdefault(ex_id, self._exercise_dict(ex_id))
+            sc = ex["scenarios"].setdefault(sc_id, {
+                "scenario_id": sc_id,
+                "started": True,
+                "completed": False,
+                "questions": {}
+            })
+            sc["questions"][q_id] = {
+                "question_id": q_id,
+                "answered": bool(answered),
+                "correct": bool(correct),
+                "score": score,
+                "attempts": attempts,
+                "user_answer": json.loads(user_answer) if user_answer is not None else None,
+                "timestamp": timestamp
+            }
+            # Answers do not touch the session row, so derive last_updated
+            if timestamp and timestamp > data["last_updated"]:
+                data["last_updated"] = timestamp
+
+        self._has_session = True
+        return data
+
+    @staticmethod
+    def _exercise_dict(exercise_id: str) -> dict:
+        return {
+            "exercise_id": exercise_id,
+            "started": False,
+            "completed": False,
+            "scenarios": {}
+        }
+
+    def save(self, data: Dict[str, Any]):
+        """Replace all of the learner's rows with a full session document."""
+        learner = self.learner_id
+        with self.conn:
+            self._delete_rows()
+            self.conn.execute(
+                "INSERT INTO sessions (learner_id, session_id, created, last_updated) "
+                "VALUES (?, ?, ?, ?)",
+                (learner, data["session_id"], data["created"], data["last_updated"])
+            )
+
+            self._started = set()
+            for ex_id, ex in data["exercises"].items():
+                self.conn.execute(
+                    "INSERT INTO exercise_progress (learner_id, exercise_id, started, completed) "
+                    "VALUES (?, ?, ?, ?)",
+                    (learner, ex_id, ex["started"], ex["completed"])
+                )
+                for sc_id, sc in ex["scenarios"].items():
+                    self.conn.execute(
+                        "INSERT INTO scenario_progress "
+                        "(learner_id, exercise_id, scenario_id, started, completed) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (learner, ex_id, sc_id, sc["started"], sc["completed"])
+                    )
+                    if sc["started"] and ex["started"]:
+                        self._started.add((ex_id, sc_id))
+                    self.conn.executemany(
+                        "INSERT INTO question_progress "
+                        "(learner_id, exercise_id, scenario_id, question_id, answered, "
+                        "correct, score, attempts, user_answer, timestamp) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        [
+                            (learner, ex_id, sc_id, q_id, q["answered"], q["correct"],
+                             q["score"], q["attempts"], json.dumps(q["user_answer"]),
+                             q["timestamp"])
+                            for q_id, q in sc["questions"].items()
+                        ]
+                    )
+
+        self._has_session = True
+
+    def reset(self):
+        """Delete all of the learner's rows."""
+        with self.conn:
+            self._delete_rows()
+        self._started = set()
+        self._has_session = False
+
+    def _delete_rows(self):
+        for table in ("sessions", "exercise_progress", "scenario_progress", "question_progress"):
+            self.conn.execute(f"DELETE FROM {table} WHERE learner_id = ?", (self.learner_id,))
+
+    def write_changes(self, session_id, changes, snapshot):
+        """Apply the changes as row upserts in one transaction."""
+        if not self._has_session:
+            self.save(snapshot())
+            return
+
+        with self.conn:
+            for change in changes:
+                if change["op"] == "answer":
+                    self._upsert_answer(change)
+                elif change["op"] == "complete":
+                    self._upsert_flag("scenario_progress", "completed", change["ex"], change["sc"])
+                    if change["exc"]:
+                        self._upsert_flag("exercise_progress", "completed", change["ex"])
+                    self.conn.execute(
+                        "UPDATE sessions SET last_updated = ? WHERE learner_id = ?",
+                        (change["t"], self.learner_id)
+                    )
+
+    def _upsert_answer(self, change: dict):
+        """Upsert a single question row."""
+        exercise_id = change["ex"]
+        scenario_id = change["sc"]
+        self.conn.execute(
+            "INSERT INTO question_progress "
+            "(learner_id, exercise_id, scenario_id, question_id, answered, "
+            "correct, score, attempts, user_answer, timestamp) "
+            "VALUES (?, ?, ?, ?, 1, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (learner_id, exercise_id, scenario_id, question_id) DO UPDATE SET "
+            "answered = excluded.answered, correct = excluded.correct, "
+            "score = excluded.score, attempts = excluded.attempts, "
+            "user_answer = excluded.user_answer, timestamp = excluded.timestamp",
+            (self.learner_id, exercise_id, scenario_id, change["q"], change["ok"],
+             change["s"], change["n"], json.dumps(change["ans"]), change["t"])
+        )
+
+        # Only the first answer in a scenario flips the started flags
+        if (exercise_id, scenario_id) not in self._started:
+            self._upsert_flag("exercise_progress", "started", exercise_id)
+            self._upsert_flag("scenario_progress", "started", exercise_id, scenario_id)
+            self._started.add((exercise_id, scenario_id))
+
+    def _upsert_flag(self, table: str, column: str, exercise_id: str, scenario_id: str = None):
+        keys = ["learner_id", "exercise_id"]
+        values = [self.learner_id, exercise_id]
+        if scenario_id is not None:
+            keys.append("scenario_id")
+            values.append(scenario_id)
+
+        self.conn.execute(
+            f"INSERT INTO {table} ({', '.join(keys)}, {column}) "
+            f"VALUES ({', '.join('?' * len(keys))}, 1) "
+            f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET {column} = 1",
+            values
+        )
+
+    def load_timings(self) -> Optional[Dict[str, Any]]:
+        """
+        Read the learner's latency sketches.
+
+        Databases written before timings were kept have no timings
+        table; they have no sketches rather than an error.
+        """
+        try:
+            row = self.conn.execute(
+                "SELECT data FROM timings WHERE learner_id = ?", (self.learner_id,)
+            ).fetchone()
+            return json.loads(row[0]) if row is not None else None
+        except sqlite3.OperationalError as e:
+            if not self._has_table("timings"):
+                return None
+            raise StoreError(str(e)) from e
+        except (sqlite3.DatabaseError, json.JSONDecodeError) as e:
+            raise StoreError(str(e)) from e
+
+    def _has_table(self, name: str) -> bool:
+        row = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+        ).fetchone()
+        return row is not None
+
+    def save_timings(self, data: Dict[str, Any]):
+        """Upsert the learner's latency sketches."""
+        try:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT INTO timings (learner_id, data) VALUES (?, ?) "
+                    "ON CONFLICT (learner_id) DO UPDATE SET data = excluded.data",
+                    (self.learner_id, json.dumps(data, separators=(",", ":")))
+                )
+        except sqlite3.DatabaseError as e:
+            raise StoreError(str(e)) from e
+
+    def fingerprint(self) -> Optional[tuple]:
+        """
+        Return SQLite's data_version for this connection.
+
+        Commits by other connections change it; our own do not, and file
+        stats are no help with WAL, where commits land in the -wal file.
+        """
+        return (self.conn.execute("PRAGMA data_version").fetchone()[0],)
+
+    def get_summary(self) -> Optional[Dict[str, Any]]:
+        """Compute scores and completion with aggregate queries."""
+        learner = (self.learner_id,)
+
+        exercises = {
+            ex_id: {
+                "started": bool(started),
+                "completed": bool(completed),
+                "score": 0.0,
+                "completion_pct": 0.0
+            }
+            for ex_id, started, completed in self.conn.execute(
+                "SELECT exercise_id, started, completed FROM exercise_progress "
+                "WHERE learner_id = ?", learner
+            )
+        }
+
+        total_questions = 0
+        total_answered = 0
+        total_score = 0.0
+        for ex_id, questions, answered, score in self.conn.execute(
+            "SELECT exercise_id, COUNT(*), SUM(answered), SUM(score) "
+            "FROM question_progress WHERE learner_id = ? GROUP BY exercise_id", learner
+        ):
+            ex = exercises.setdefault(ex_id, {"started": True, "completed": False})
+            ex["score"] = score
+            ex["completion_pct"] = answered / questions * 100
+            total_questions += questions
+            total_answered += answered
+            total_score += score
+
+        return {
+            "total_score": total_score,
+            "completion_pct": (
+                total_answered / total_questions * 100 if total_questions > 0 else 0.0
+            ),
+            "exercises": exercises,
+        }
+
+
+def create_store(
+    backend: str,
+    data_dir: str = "data",
+    learner_id: Optional[str] = None,
+    **kwargs
+) -> ProgressStore:
+    """
+    Create a progress store by name.
+
+    Args:
+        backend: "json" or "sqlite"
+        data_dir: Directory holding progress files
+        learner_id: Learner whose progress is stored
+        **kwargs: Extra options passed to the store
+
+    Returns:
+        The configured store
+    """
+    if backend == "json":
+        return JsonFileStore(data_dir, learner_id=learner_id, **kwargs)
+    if backend == "sqlite":
+        return SQLiteStore(
+            os.path.join(data_dir, "progress.db"), learner_id=learner_id, **kwargs
+        )
+    raise ValueError(f"Unknown progress store: {backend}")
@@ -0,0 +1,276 @@
+"""Opt-in tracing of hot paths: call counts, cumulative and self time per span."""
+
+import atexit
+import importlib
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# Functions and methods wrapped by enable(), as (module, attribute path)
+HOT_PATHS = [
+    ("cyoa.ui", "clear_screen"),
+    ("cyoa.ui", "wrap_text"),
+    ("cyoa.ui", "print_box"),
+    ("cyoa.ui", "flush"),
+    ("cyoa.render", "AnsiRenderer.flush"),
+    ("cyoa.scenarios.base", "MultipleChoiceQuestion.check_answer"),
+    ("cyoa.scenarios.base", "RankingQuestion.check_answer"),
+    ("cyoa.scenarios.base", "FreeTextQuestion.check_answer"),
+    ("cyoa.scenarios.base", "ChecklistQuestion.check_answer"),
+    ("cyoa.feedback", "evaluate_answer"),
+    ("cyoa.feedback", "display_feedback"),
+    ("cyoa.engine", "GameEngine.render_question"),
+    ("cyoa.progress", "ProgressManager.load_session"),
+    ("cyoa.progress", "ProgressManager.save_session"),
+    ("cyoa.progress", "ProgressManager.record_answer"),
+    ("cyoa.progress", "ProgressManager.flush"),
+    ("cyoa.storage", "JsonFileStore.save"),
+    ("cyoa.storage", "JsonFileStore.write_changes"),
+    ("cyoa.storage", "SQLiteStore.save"),
+    ("cyoa.storage", "SQLiteStore.write_changes"),
+]
+
+
+class Tracer:
+    """
+    Span statistics and trace events.
+
+    Each span records its inclusive (cumulative) time and its self
+    time, which excludes the time of spans nested inside it. Spans are
+    nested per thread. Trace events are kept for Chrome's trace viewer
+    (chrome://tracing, Perfetto) up to max_events; later events are
+    only counted, the statistics stay complete.
+    """
+
+    def __init__(self, max_events: int = 200000):
+        """
+        Initialize an empty tracer.
+
+        Args:
+            max_events: Trace events to keep for export
+        """
+        self.max_events = max_events
+        self.stats: Dict[str, List[int]] = {}  # name -> [calls, total ns, self ns]
+        self.events: List[Tuple[str, int, int, int]] = []  # (name, start ns, duration ns, thread)
+        self.dropped = 0
+        self.origin = time.perf_counter_ns()
+        self._local = threading.local()
+
+    def _stack(self) -> List[int]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def wrap(self, name: str, func: Callable) -> Callable:
+        """Return func timed as the span name."""
+        clock = time.perf_counter_ns
+
+        @wraps(func)
+        def traced(*args, **kwargs):
+            stack = self._stack()
+            stack.append(0)  # time spent in nested spans
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                nested = stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+                self.record(name, start, elapsed, nested)
+
+        return traced
+
+    def record(self, name: str, start: int, elapsed: int, nested: int = 0):
+        """
+        Record one finished span.
+
+        Args:
+            name: Span name
+            start: perf_counter_ns() when the span began
+            elapsed: Inclusive duration in nanoseconds
+            nested: Time spent in spans nested inside it
+        """
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = [0, 0, 0]
+        stats[0] += 1
+        stats[1] += elapsed
+        stats[2] += elapsed - nested
+        if len(self.events) < self.max_events:
+            self.events.append((name, start, elapsed, threading.get_ident()))
+        else:
+            self.dropped += 1
+
+    def report(self) -> List[Dict[str, Any]]:
+        """
+        Statistics per span, most self time first.
+
+        Returns:
+            List of {"name", "calls", "total_ms", "self_ms", "mean_us"}
+        """
+        rows = [
+            {
+                "name": name,
+                "calls": calls,
+                "total_ms": total / 1e6,
+                "self_ms": own / 1e6,
+                "mean_us": total / calls / 1e3,
+            }
+            for name, (calls, total, own) in self.stats.items()
+        ]
+        rows.sort(key=lambda row: row["self_ms"], reverse=True)
+        return rows
+
+    def table(self) -> List[str]:
+        """Lines of a human-readable report."""
+        width = max([len("span")] + [len(name) for name in self.stats])
+        lines = [f"{'span':<{width}} {'calls':>9} {'total ms':>11} {'self ms':>11} {'mean us':>10}"]
+        for row in self.report():
+            lines.append(
+                f"{row['name']:<{width}} {row['calls']:>9} {row['total_ms']:>11.2f} "
+                f"{row['self_ms']:>11.2f} {row['mean_us']:>10.2f}"
+            )
+        if self.dropped:
+            lines.append(f"({self.dropped} trace events beyond the first {self.max_events} not exported)")
+        return lines
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Trace events in Chrome's trace-event format (times in microseconds)."""
+        pid = os.getpid()
+        return {
+            "traceEvents": [
+                {
+                    "name": name,
+                    "cat": "cyoa",
+                    "ph": "X",
+                    "ts": (start - self.origin) / 1000,
+                    "dur": elapsed / 1000,
+                    "pid": pid,
+                    "tid": thread,
+                }
+                for name, start, elapsed, thread in self.events
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+
+_tracer: Optional[Tracer] = None
+_trace_path: Optional[str] = None
+_patched: List[Tuple[Any, str, Any, Any]] = []  # (owner, attribute, original, wrapper)
+
+
+def enabled() -> bool:
+    """Whether tracing is on."""
+    return _tracer is not None
+
+
+def get_tracer() -> Optional[Tracer]:
+    """The active tracer, or None when tracing is off."""
+    return _tracer
+
+
+def enable(
+    trace_path: Optional[str] = None,
+    hot_paths: Optional[List[Tuple[str, str]]] = None,
+    dump_at_exit: bool = True,
+    max_events: int = 200000,
+) -> Tracer:
+    """
+    Turn tracing on by wrapping the hot paths.
+
+    Nothing is wrapped until this is called, so tracing costs nothing
+    when it is off. Aliases of a wrapped function imported into other
+    cyoa modules (``from .feedback import evaluate_answer``) are
+    wrapped too.
+
+    Args:
+        trace_path: File for the Chrome trace-event JSON written by dump()
+        hot_paths: (module, attribute path) pairs to wrap (default: HOT_PATHS)
+        dump_at_exit: Dump at interpreter exit and on SIGUSR1 (where available)
+        max_events: Trace events to keep for export
+
+    Returns:
+        The active tracer
+    """
+    global _tracer, _trace_path
+    if _tracer is not None:
+        return _tracer
+    _tracer = Tracer(max_events=max_events)
+    _trace_path = trace_path
+    for module_name, path in (hot_paths if hot_paths is not None else HOT_PATHS):
+        _patch(_tracer, module_name, path)
+    if dump_at_exit:
+        atexit.register(dump)
+        if hasattr(signal, "SIGUSR1") and threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGUSR1, lambda signum, frame: dump())
+    return _tracer
+
+
+def disable():
+    """Restore the original functions and turn tracing off."""
+    global _tracer, _trace_path
+    for owner, attribute, original, wrapper in reversed(_patched):
+        if getattr(owner, attribute, None) is wrapper:
+            setattr(owner, attribute, original)
+    _patched.clear()
+    atexit.unregister(dump)
+    _tracer = None
+    _trace_path = None
+
+
+def _patch(tracer: Tracer, module_name: str, path: str):
+    """Wrap one function or method, and its aliases in loaded cyoa modules."""
+    owner = importlib.import_module(module_name)
+    *parents, attribute = path.split(".")
+    for parent in parents:
+        owner = getattr(owner, parent)
+    original = vars(owner).get(attribute)
+    if not callable(original):
+        print(f"Warning: Cannot trace {module_name}.{path}")
+        return
+    # Methods are named by class, functions by module ("ui.wrap_text")
+    name = path if parents else f"{module_name.rsplit('.', 1)[-1]}.{path}"
+    wrapper = tracer.wrap(name, original)
+    setattr(owner, attribute, wrapper)
+    _patched.append((owner, attribute, original, wrapper))
+    if parents:
+        return
+    for name, module in list(sys.modules.items()):
+        if module is None or not (name == "cyoa" or name.startswith("cyoa.")):
+            continue
+        for alias, value in list(vars(module).items()):
+            if value is original:
+                setattr(module, alias, wrapper)
+                _patched.append((module, alias, original, wrapper))
+
+
+def dump(stream=None):
+    """
+    Print the span table and write the Chrome trace file, if any.
+
+    Args:
+        stream: Where to print the table (default: stderr)
+    """
+    if _tracer is None:
+        return
+    stream = stream or sys.stderr
+    print("\nTrace report", file=stream)
+    for line in _tracer.table():
+        print(line, file=stream)
+    if _trace_path:
+        try:
+            tmp_path = _trace_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(_tracer.chrome_trace(), f)
+            os.replace(tmp_path, _trace_path)
+            print(f"Trace events written to {_trace_path}", file=stream)
+        except OSError as e:
+            print(f"Warning: Could not write trace file {_trace_path}: {e}", file=stream)
@@ -1,56 +1,60 @@
 """Terminal UI utilities for the CYOA application."""
 
+import io
 import os
+import signal
 import sys
 import textwrap
-from typing import List, Optional, Tuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Coroutine, Iterator, List, Optional, Tuple
+
+from .render import PlainTextRenderer, Renderer, default_renderer
 
 
 # ANSI Color Codes
 class Colors:
-    """ANSI color codes for terminal output."""
+    """
+    ANSI color codes for terminal output.
+
+    Frames always carry the codes; the session's renderer strips them
+    when its terminal shows no colors.
+    """
 
-    # Check if colors are supported
+    # Whether the local terminal shows colors
     ENABLED = sys.stdout.isatty() and os.name != 'nt' or os.environ.get('TERM')
 
-    if ENABLED:
-        RESET = "\033[0m"
-        BOLD = "\033[1m"
-        DIM = "\033[2m"
-        ITALIC = "\033[3m"
-        UNDERLINE = "\033[4m"
-
-        # Colors
-        BLACK = "\033[30m"
-        RED = "\033[31m"
-        GREEN = "\033[32m"
-        YELLOW = "\033[33m"
-        BLUE = "\033[34m"
-        MAGENTA = "\033[35m"
-        CYAN = "\033[36m"
-        WHITE = "\033[37m"
-
-        # Bright colors
-        BRIGHT_RED = "\033[91m"
-        BRIGHT_GREEN = "\033[92m"
-        BRIGHT_YELLOW = "\033[93m"
-        BRIGHT_BLUE = "\033[94m"
-        BRIGHT_MAGENTA = "\033[95m"
-        BRIGHT_CYAN = "\033[96m"
-        BRIGHT_WHITE = "\033[97m"
-
-        # Background colors
-        BG_RED = "\033[41m"
-        BG_GREEN = "\033[42m"
-        BG_YELLOW = "\033[43m"
-        BG_BLUE = "\033[44m"
-    else:
-        # No colors - empty strings
-        RESET = BOLD = DIM = ITALIC = UNDERLINE = ""
-        BLACK = RED = GREEN = YELLOW = BLUE = MAGENTA = CYAN = WHITE = ""
-        BRIGHT_RED = BRIGHT_GREEN = BRIGHT_YELLOW = BRIGHT_BLUE = ""
-        BRIGHT_MAGENTA = BRIGHT_CYAN = BRIGHT_WHITE = ""
-        BG_RED = BG_GREEN = BG_YELLOW = BG_BLUE = ""
+    RESET = "\033[0m"
+    BOLD = "\033[1m"
+    DIM = "\033[2m"
+    ITALIC = "\033[3m"
+    UNDERLINE = "\033[4m"
+
+    # Colors
+    BLACK = "\033[30m"
+    RED = "\033[31m"
+    GREEN = "\033[32m"
+    YELLOW = "\033[33m"
+    BLUE = "\033[34m"
+    MAGENTA = "\033[35m"
+    CYAN = "\033[36m"
+    WHITE = "\033[37m"
+
+    # Bright colors
+    BRIGHT_RED = "\033[91m"
+    BRIGHT_GREEN = "\033[92m"
+    BRIGHT_YELLOW = "\033[93m"
+    BRIGHT_BLUE = "\033[94m"
+    BRIGHT_MAGENTA = "\033[95m"
+    BRIGHT_CYAN = "\033[96m"
+    BRIGHT_WHITE = "\033[97m"
+
+    # Background colors
+    BG_RED = "\033[41m"
+    BG_GREEN = "\033[42m"
+    BG_YELLOW = "\033[43m"
+    BG_BLUE = "\033[44m"
 
 
 # Box drawing characters
@@ -74,67 +78,120 @@ class Box:
     DOUBLE_BOTTOM_RIGHT = "╝"
 
 
-# Terminal width
-def get_terminal_width() -> int:
-    """Get the current terminal width."""
-    try:
-        return os.get_terminal_size().columns
-    except OSError:
-        return 80  # Default fallback
+class TerminalIO:
+    """
+    Line I/O on the local terminal.
 
+    Output is collected by a Renderer and written one frame at a time.
+    Prompt functions are coroutines so the same engine code can serve a
+    remote session (see cyoa.server). Reading from the terminal never
+    suspends, so run_blocking can drive them without an event loop.
+    """
 
-def clear_screen():
-    """Clear the terminal screen."""
-    if os.name == 'nt':
-        os.system('cls')
-    else:
-        os.system('clear')
+    # Columns to lay out for; None asks the local terminal
+    width: Optional[int] = None
 
+    def __init__(self, renderer: Optional[Renderer] = None):
+        self._renderer = renderer
 
-def print_header(title: str, subtitle: Optional[str] = None):
-    """Print a styled header."""
-    width = min(get_terminal_width(), 70)
+    @property
+    def renderer(self) -> Renderer:
+        # Chosen on first use so it sees the stdout actually in effect
+        if self._renderer is None:
+            self._renderer = default_renderer(colors=bool(Colors.ENABLED))
+        return self._renderer
 
-    print()
-    print(f"{Colors.BRIGHT_CYAN}{Box.DOUBLE_HORIZONTAL * width}{Colors.RESET}")
+    async def readline(self, prompt: str = "") -> str:
+        """Read one line; raises EOFError/KeyboardInterrupt like input()."""
+        self.renderer.write(prompt)
+        self.renderer.flush()
+        line = input()
+        self.renderer.echo(line + "\n")
+        return line
 
-    # Center the title
-    padding = (width - len(title)) // 2
-    print(f"{Colors.BOLD}{Colors.BRIGHT_WHITE}{' ' * padding}{title}{Colors.RESET}")
 
-    if subtitle:
-        padding = (width - len(subtitle)) // 2
-        print(f"{Colors.DIM}{' ' * padding}{subtitle}{Colors.RESET}")
+# Line I/O for the current session; each server connection sets its own
+current_io: ContextVar = ContextVar("current_io", default=TerminalIO())
 
-    print(f"{Colors.BRIGHT_CYAN}{Box.DOUBLE_HORIZONTAL * width}{Colors.RESET}")
-    print()
 
+def run_blocking(coro: Coroutine) -> Any:
+    """Run an engine coroutine whose I/O never suspends (the local terminal)."""
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    coro.close()
+    raise RuntimeError("run_blocking() used with I/O that suspends; use asyncio instead")
 
-def print_subheader(title: str):
-    """Print a smaller section header."""
-    width = min(get_terminal_width(), 70)
 
-    print()
-    print(f"{Colors.CYAN}{title}{Colors.RESET}")
-    print(f"{Colors.DIM}{Box.HORIZONTAL * len(title)}{Colors.RESET}")
-    print()
+# Terminal width, cached once install_resize_handler() has hooked SIGWINCH
+_terminal_width: Optional[int] = None
+_resize_handler_installed = False
+_previous_resize_handler: Any = None
 
 
-def print_scenario_title(title: str):
-    """Print a scenario title with decorative line."""
-    width = min(get_terminal_width(), 70)
+def _on_resize(signum, frame):
+    """Forget the terminal width and layouts wrapped for the old size."""
+    global _terminal_width
+    _terminal_width = None
+    clear_layout_cache()
+    if callable(_previous_resize_handler):
+        _previous_resize_handler(signum, frame)
 
-    print()
-    print(f"{Colors.BOLD}{Colors.YELLOW}{title}{Colors.RESET}")
-    print(f"{Colors.DIM}{Box.HORIZONTAL * width}{Colors.RESET}")
-    print()
 
+def install_resize_handler() -> bool:
+    """
+    Cache the terminal width until the terminal is resized.
+
+    Hooks SIGWINCH, calling any handler installed before it. Call it
+    from the main thread of a program that owns the terminal; without
+    it the width is read on every call.
+
+    Returns:
+        True if the handler is installed
+    """
+    global _resize_handler_installed, _previous_resize_handler, _terminal_width
+    if _resize_handler_installed:
+        return True
+    if not hasattr(signal, "SIGWINCH"):
+        return False
+    try:
+        previous = signal.signal(signal.SIGWINCH, _on_resize)
+    except ValueError:
+        # Not the main thread
+        return False
+    _previous_resize_handler = previous
+    _resize_handler_installed = True
+    _terminal_width = None
+    return True
+
+
+def get_terminal_width() -> int:
+    """Get the width of the current session's terminal."""
+    global _terminal_width
+    width = current_io.get().width
+    if width is not None:
+        return width
+    if _terminal_width is not None:
+        return _terminal_width
+    try:
+        width = os.get_terminal_size().columns
+    except OSError:
+        width = 80  # Default fallback
+    if _resize_handler_installed:
+        _terminal_width = width
+    return width
+
+
+# Layout cache shared by wrap_text, print_box and print_model_answer.
+# Scenario text and feedback strings are the same for every question and
+# every session, so wrapped layouts are keyed by (text, width, indent).
+LAYOUT_CACHE_SIZE = 1024
 
-def wrap_text(text: str, width: Optional[int] = None, indent: int = 0) -> str:
-    """Wrap text to fit terminal width."""
-    if width is None:
-        width = min(get_terminal_width() - 4, 70)
 
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def _wrap_layout(text: str, width: int, indent: int) -> str:
+    """Wrap paragraphs of text; cached."""
     # Split on double newlines (paragraphs) first
     paragraphs = text.split('\n\n')
     wrapped_paragraphs = []
@@ -156,16 +213,9 @@ def wrap_text(text: str, width: Optional[int] = None, indent: int = 0) -> str:
     return '\n\n'.join(wrapped_paragraphs)
 
 
-def print_wrapped(text: str, indent: int = 0):
-    """Print text wrapped to terminal width."""
-    print(wrap_text(text, indent=indent))
-
-
-def print_box(content: str, color: str = Colors.WHITE, width: Optional[int] = None):
-    """Print content inside a box."""
-    if width is None:
-        width = min(get_terminal_width() - 4, 66)
-
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def _box_layout(content: str, color: str, width: int) -> Tuple[str, ...]:
+    """Lines of a box around content; cached."""
     lines = []
     # Split on double newlines for paragraphs
     paragraphs = content.split('\n\n')
@@ -183,58 +233,181 @@ def print_box(content: str, color: str = Colors.WHITE, width: Optional[int] = No
             lines.append('')
 
     # Draw box
-    print(f"{color}{Box.TOP_LEFT}{Box.HORIZONTAL * (width - 2)}{Box.TOP_RIGHT}{Colors.RESET}")
+    box = [f"{color}{Box.TOP_LEFT}{Box.HORIZONTAL * (width - 2)}{Box.TOP_RIGHT}{Colors.RESET}"]
 
     for line in lines:
         padding = width - 4 - len(line)
-        print(f"{color}{Box.VERTICAL}{Colors.RESET}  {line}{' ' * padding}  {color}{Box.VERTICAL}{Colors.RESET}")
+        box.append(f"{color}{Box.VERTICAL}{Colors.RESET}  {line}{' ' * padding}  {color}{Box.VERTICAL}{Colors.RESET}")
+
+    box.append(f"{color}{Box.BOTTOM_LEFT}{Box.HORIZONTAL * (width - 2)}{Box.BOTTOM_RIGHT}{Colors.RESET}")
+    return tuple(box)
+
+
+def layout_cache_info() -> dict:
+    """
+    Get layout cache statistics.
+
+    Returns:
+        Dictionary with hits, misses, hit_rate and size
+    """
+    hits = misses = size = 0
+    for cached in (_wrap_layout, _box_layout):
+        info = cached.cache_info()
+        hits += info.hits
+        misses += info.misses
+        size += info.currsize
+    lookups = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / lookups if lookups else 0.0,
+        "size": size,
+    }
+
+
+def clear_layout_cache():
+    """Drop all cached layouts and reset the counters."""
+    _wrap_layout.cache_clear()
+    _box_layout.cache_clear()
+
+
+def out(text: str = "", end: str = "\n"):
+    """Add a line to the current session's frame (use instead of print)."""
+    current_io.get().renderer.write(text + end)
+
+
+def warn(message: str):
+    """Show a warning on the current session's screen (use instead of print)."""
+    out(f"{Colors.YELLOW}{message}{Colors.RESET}")
+
+
+def flush():
+    """Write out the current session's frame."""
+    current_io.get().renderer.flush()
+
+
+@contextmanager
+def capture() -> Iterator[io.StringIO]:
+    """Collect everything drawn inside the block in a buffer instead of showing it."""
+    buffer = io.StringIO()
+    captured = TerminalIO(PlainTextRenderer(buffer, strip_ansi=False))
+    # Lay out for the session being captured from, not the local terminal
+    captured.width = current_io.get().width
+    token = current_io.set(captured)
+    try:
+        yield buffer
+    finally:
+        current_io.get().renderer.flush()
+        current_io.reset(token)
+
+
+def clear_screen():
+    """Clear the terminal screen."""
+    current_io.get().renderer.clear()
+
+
+def print_header(title: str, subtitle: Optional[str] = None):
+    """Print a styled header."""
+    width = min(get_terminal_width(), 70)
+
+    out()
+    out(f"{Colors.BRIGHT_CYAN}{Box.DOUBLE_HORIZONTAL * width}{Colors.RESET}")
+
+    # Center the title
+    padding = (width - len(title)) // 2
+    out(f"{Colors.BOLD}{Colors.BRIGHT_WHITE}{' ' * padding}{title}{Colors.RESET}")
+
+    if subtitle:
+        padding = (width - len(subtitle)) // 2
+        out(f"{Colors.DIM}{' ' * padding}{subtitle}{Colors.RESET}")
+
+    out(f"{Colors.BRIGHT_CYAN}{Box.DOUBLE_HORIZONTAL * width}{Colors.RESET}")
+    out()
+
+
+def print_subheader(title: str):
+    """Print a smaller section header."""
+    width = min(get_terminal_width(), 70)
+
+    out()
+    out(f"{Colors.CYAN}{title}{Colors.RESET}")
+    out(f"{Colors.DIM}{Box.HORIZONTAL * len(title)}{Colors.RESET}")
+    out()
+
+
+def print_scenario_title(title: str):
+    """Print a scenario title with decorative line."""
+    width = min(get_terminal_width(), 70)
+
+    out()
+    out(f"{Colors.BOLD}{Colors.YELLOW}{title}{Colors.RESET}")
+    out(f"{Colors.DIM}{Box.HORIZONTAL * width}{Colors.RESET}")
+    out()
+
+
+def wrap_text(text: str, width: Optional[int] = None, indent: int = 0) -> str:
+    """Wrap text to fit terminal width."""
+    if width is None:
+        width = min(get_terminal_width() - 4, 70)
+    return _wrap_layout(text, width, indent)
+
+
+def print_wrapped(text: str, indent: int = 0):
+    """Print text wrapped to terminal width."""
+    out(wrap_text(text, indent=indent))
+
+
+def print_box(content: str, color: str = Colors.WHITE, width: Optional[int] = None):
+    """Print content inside a box."""
+    if width is None:
+        width = min(get_terminal_width() - 4, 66)
 
-    print(f"{color}{Box.BOTTOM_LEFT}{Box.HORIZONTAL * (width - 2)}{Box.BOTTOM_RIGHT}{Colors.RESET}")
+    out("\n".join(_box_layout(content, color, width)))
 
 
 def print_success_box(content: str):
     """Print a green success box."""
-    print()
-    print(f"{Colors.BRIGHT_GREEN}  ✓ CORRECT!{Colors.RESET}")
-    print()
+    out()
+    out(f"{Colors.BRIGHT_GREEN}  ✓ CORRECT!{Colors.RESET}")
+    out()
     print_box(content, color=Colors.GREEN)
-    print()
+    out()
 
 
 def print_partial_box(content: str):
     """Print a yellow partial credit box."""
-    print()
-    print(f"{Colors.BRIGHT_YELLOW}  ~ PARTIALLY CORRECT{Colors.RESET}")
-    print()
+    out()
+    out(f"{Colors.BRIGHT_YELLOW}  ~ PARTIALLY CORRECT{Colors.RESET}")
+    out()
     print_box(content, color=Colors.YELLOW)
-    print()
+    out()
 
 
 def print_incorrect_box(content: str):
     """Print a red incorrect box."""
-    print()
-    print(f"{Colors.BRIGHT_RED}  ✗ NOT QUITE{Colors.RESET}")
-    print()
+    out()
+    out(f"{Colors.BRIGHT_RED}  ✗ NOT QUITE{Colors.RESET}")
+    out()
     print_box(content, color=Colors.RED)
-    print()
+    out()
 
 
 def print_info_box(content: str):
     """Print a blue info box."""
-    print()
+    out()
     print_box(content, color=Colors.CYAN)
-    print()
+    out()
 
 
 def print_model_answer(content: str):
     """Print a model answer section."""
-    print()
-    print(f"{Colors.DIM}{'─' * 40}{Colors.RESET}")
-    print(f"{Colors.BOLD}{Colors.CYAN}MODEL ANSWER:{Colors.RESET}")
-    print()
+    out()
+    out(f"{Colors.DIM}{'─' * 40}{Colors.RESET}")
+    out(f"{Colors.BOLD}{Colors.CYAN}MODEL ANSWER:{Colors.RESET}")
+    out()
     print_wrapped(content, indent=2)
-    print(f"{Colors.DIM}{'─' * 40}{Colors.RESET}")
-    print()
+    out(f"{Colors.DIM}{'─' * 40}{Colors.RESET}")
+    out()
 
 
 def print_menu(options: List[Tuple[str, str]], title: Optional[str] = None):
@@ -246,29 +419,29 @@ def print_menu(options: List[Tuple[str, str]], title: Optional[str] = None):
         title: Optional menu title
     """
     if title:
-        print(f"\n{Colors.BOLD}{title}{Colors.RESET}\n")
+        out(f"\n{Colors.BOLD}{title}{Colors.RESET}\n")
 
     for key, description in options:
-        print(f"  {Colors.BRIGHT_CYAN}[{key}]{Colors.RESET} {description}")
+        out(f"  {Colors.BRIGHT_CYAN}[{key}]{Colors.RESET} {description}")
 
-    print()
+    out()
 
 
 def print_question(number: int, text: str):
     """Print a question with number."""
-    print()
-    print(f"{Colors.BOLD}{Colors.WHITE}QUESTION {number}:{Colors.RESET} {text}")
-    print()
+    out()
+    out(f"{Colors.BOLD}{Colors.WHITE}QUESTION {number}:{Colors.RESET} {text}")
+    out()
 
 
 def print_options(options: List[Tuple[str, str]]):
     """Print multiple choice options."""
     for key, text in options:
-        print(f"  {Colors.BRIGHT_CYAN}[{key}]{Colors.RESET} {text}")
-    print()
+        out(f"  {Colors.BRIGHT_CYAN}[{key}]{Colors.RESET} {text}")
+    out()
 
 
-def get_input(prompt: str = "> ", valid_options: Optional[List[str]] = None) -> str:
+async def get_input(prompt: str = "> ", valid_options: Optional[List[str]] = None) -> str:
     """
     Get user input with optional validation.
 
@@ -281,7 +454,9 @@ def get_input(prompt: str = "> ", valid_options: Optional[List[str]] = None) ->
     """
     while True:
         try:
-            response = input(f"{Colors.BRIGHT_WHITE}{prompt}{Colors.RESET}").strip()
+            response = (await current_io.get().readline(
+                f"{Colors.BRIGHT_WHITE}{prompt}{Colors.RESET}"
+            )).strip()
 
             if valid_options is None:
                 return response
@@ -289,16 +464,16 @@ def get_input(prompt: str = "> ", valid_options: Optional[List[str]] = None) ->
             if response.upper() in [opt.upper() for opt in valid_options]:
                 return response.upper()
 
-            print(f"{Colors.YELLOW}Please enter one of: {', '.join(valid_options)}{Colors.RESET}")
+            out(f"{Colors.YELLOW}Please enter one of: {', '.join(valid_options)}{Colors.RESET}")
 
         except EOFError:
             return "Q"
         except KeyboardInterrupt:
-            print()
+            out()
             return "Q"
 
 
-def get_text_input(prompt: str, min_length: int = 10):
+async def get_text_input(prompt: str, min_length: int = 10):
     """
     Get multi-line text input from user.
 
@@ -309,14 +484,14 @@ def get_text_input(prompt: str, min_length: int = 10):
     Returns:
         The user's response, or "Q" if user quit
     """
-    print(f"{Colors.DIM}(Enter your response. Type 'DONE' on a new line when finished){Colors.RESET}")
-    print(f"{Colors.DIM}(Minimum {min_length} characters required){Colors.RESET}")
-    print()
+    out(f"{Colors.DIM}(Enter your response. Type 'DONE' on a new line when finished){Colors.RESET}")
+    out(f"{Colors.DIM}(Minimum {min_length} characters required){Colors.RESET}")
+    out()
 
     lines = []
     while True:
         try:
-            line = input()
+            line = await current_io.get().readline()
             if line.strip().upper() == "DONE":
                 break
             if line.strip().upper() == "Q" and not lines:
@@ -326,19 +501,19 @@ def get_text_input(prompt: str, min_length: int = 10):
         except EOFError:
             break
         except KeyboardInterrupt:
-            print()
+            out()
             return "Q"
 
     response = '\n'.join(lines).strip()
 
     if len(response) < min_length:
-        print(f"{Colors.YELLOW}Response too short. Please provide more detail.{Colors.RESET}")
-        return get_text_input(prompt, min_length)
+        out(f"{Colors.YELLOW}Response too short. Please provide more detail.{Colors.RESET}")
+        return await get_text_input(prompt, min_length)
 
     return response
 
 
-def get_ranking_input(items: List[str], ranks: int = 3):
+async def get_ranking_input(items: List[str], ranks: int = 3):
     """
     Get ranking input from user.
 
@@ -349,20 +524,22 @@ def get_ranking_input(items: List[str], ranks: int = 3):
     Returns:
         List of indices representing the ranking, or "Q" if user quit
     """
-    print(f"{Colors.DIM}(Enter the number of your choice for each rank){Colors.RESET}")
-    print()
+    out(f"{Colors.DIM}(Enter the number of your choice for each rank){Colors.RESET}")
+    out()
 
     # Display items with numbers
     for i, item in enumerate(items, 1):
-        print(f"  {Colors.CYAN}[{i}]{Colors.RESET} {item}")
-    print()
+        out(f"  {Colors.CYAN}[{i}]{Colors.RESET} {item}")
+    out()
 
     ranking = []
     for rank in range(1, ranks + 1):
         while True:
             try:
                 ordinal = {1: "1st", 2: "2nd", 3: "3rd"}.get(rank, f"{rank}th")
-                choice = input(f"{Colors.BRIGHT_WHITE}{ordinal} place: {Colors.RESET}").strip()
+                choice = (await current_io.get().readline(
+                    f"{Colors.BRIGHT_WHITE}{ordinal} place: {Colors.RESET}"
+                )).strip()
 
                 # Check for quit
                 if choice.upper() == "Q":
@@ -374,22 +551,22 @@ def get_ranking_input(items: List[str], ranks: int = 3):
                         ranking.append(idx)
                         break
                     elif idx in ranking:
-                        print(f"{Colors.YELLOW}Already selected. Choose another.{Colors.RESET}")
+                        out(f"{Colors.YELLOW}Already selected. Choose another.{Colors.RESET}")
                     else:
-                        print(f"{Colors.YELLOW}Enter a number between 1 and {len(items)}{Colors.RESET}")
+                        out(f"{Colors.YELLOW}Enter a number between 1 and {len(items)}{Colors.RESET}")
                 else:
-                    print(f"{Colors.YELLOW}Please enter a number.{Colors.RESET}")
+                    out(f"{Colors.YELLOW}Please enter a number.{Colors.RESET}")
             except (EOFError, KeyboardInterrupt):
-                print()
+                out()
                 return "Q"  # Treat interrupt as quit
 
     return ranking
 
 
-def wait_for_enter(message: str = "Press Enter to continue..."):
+async def wait_for_enter(message: str = "Press Enter to continue..."):
     """Wait for user to press Enter."""
     try:
-        input(f"\n{Colors.DIM}{message}{Colors.RESET}")
+        await current_io.get().readline(f"\n{Colors.DIM}{message}{Colors.RESET}")
     except (EOFError, KeyboardInterrupt):
         pass
 
@@ -401,13 +578,13 @@ def print_progress_bar(current: int, total: int, width: int = 30, label: str = "
     percent = (current / total * 100) if total > 0 else 0
 
     if label:
-        print(f"{label}: {Colors.CYAN}[{bar}]{Colors.RESET} {percent:.0f}% ({current}/{total})")
+        out(f"{label}: {Colors.CYAN}[{bar}]{Colors.RESET} {percent:.0f}% ({current}/{total})")
     else:
-        print(f"{Colors.CYAN}[{bar}]{Colors.RESET} {percent:.0f}% ({current}/{total})")
+        out(f"{Colors.CYAN}[{bar}]{Colors.RESET} {percent:.0f}% ({current}/{total})")
 
 
 def print_divider(char: str = "─", width: Optional[int] = None):
     """Print a horizontal divider."""
     if width is None:
         width = min(get_terminal_width() - 4, 70)
-    print(f"{Colors.DIM}{char * width}{Colors.RESET}")
+    out(f"{Colors.DIM}{char * width}{Colors.RESET}")
@@ -5,40 +5,177 @@ Cybersecurity Foundations - Interactive Training Lab
 A choose-your-own-adventure style training application for the
 Cyber Defense Infrastructure Support Specialist Course, Module 1.
 
-Run with: python main.py
+Run with: python main.py [--learner ID] [--store {json,sqlite}] [--content DIR]
+Grade answer files with: python main.py --batch answers.jsonl
+Serve many learners with: python main.py --serve 2323
+Summarize a cohort's progress with: python main.py --analytics DIR
+Analyze the question bank with: python main.py --item-analysis DIR
+Profile hot paths with: python main.py --trace trace.json
 """
 
+import argparse
 import os
+import signal
 import sys
 
 # Ensure we can import from the cyoa package
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from cyoa import ui
 from cyoa.engine import GameEngine
-from cyoa.scenarios import (
-    get_exercise1,
-    get_exercise2,
-    get_exercise3,
-    get_exercise4,
-    get_exercise5,
-)
+from cyoa.progress import ProgressManager
+from cyoa.storage import create_store
+from cyoa.scenarios.registry import MANIFEST, load_all
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Cybersecurity Foundations - Interactive Training Lab"
+    )
+    parser.add_argument(
+        "--learner",
+        help="learner ID whose progress to use (default: single-learner progress)"
+    )
+    parser.add_argument(
+        "--store",
+        choices=["json", "sqlite"],
+        default="json",
+        help="progress storage backend (default: json)"
+    )
+    parser.add_argument(
+        "--content",
+        metavar="DIR",
+        help="load exercises from JSON content files in DIR instead of the built-in ones"
+    )
+    parser.add_argument(
+        "--export-content",
+        metavar="DIR",
+        help="write the built-in exercises to DIR as JSON content files and exit"
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="ANSWERS",
+        help="grade a JSON-lines answers file headlessly and exit"
+    )
+    parser.add_argument(
+        "--analytics",
+        metavar="PATH",
+        help="report cohort statistics for the progress files or databases under PATH and exit"
+    )
+    parser.add_argument(
+        "--analytics-json",
+        metavar="FILE",
+        help="with --analytics or --item-analysis, also write the full report to FILE"
+    )
+    parser.add_argument(
+        "--item-analysis",
+        metavar="PATH",
+        help="report difficulty, discrimination and option choice rates for every "
+             "question from the progress under PATH and exit"
+    )
+    parser.add_argument(
+        "--serve",
+        metavar="PORT",
+        type=int,
+        help="serve learner sessions over TCP (e.g. telnet/nc) on PORT"
+    )
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="address to listen on with --serve (default: 127.0.0.1)"
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        default=os.environ.get("CYOA_TRACE"),
+        help="time hot paths, print a span report at exit (or on SIGUSR1) and write "
+             "Chrome trace events to FILE (default: $CYOA_TRACE)"
+    )
+    return parser.parse_args(argv)
 
 
 def main():
     """Main entry point for the application."""
+    args = parse_args()
+
+    if args.trace:
+        from cyoa import tracing
+        tracing.enable(args.trace)
+
     # Determine data directory (same directory as script)
     script_dir = os.path.dirname(os.path.abspath(__file__))
     data_dir = os.path.join(script_dir, "data")
 
+    if args.export_content:
+        from cyoa.content import export_exercises
+        for path in export_exercises(load_all(), args.export_content):
+            print(f"Wrote {path}")
+        return
+
+    # Exercise manifest; each exercise is built when first entered
+    library = None
+    if args.content:
+        from cyoa.content import ContentError, ContentLibrary
+        try:
+            library = ContentLibrary(args.content)
+            manifest = library.manifest()
+        except (OSError, ContentError) as e:
+            print(f"Error: Could not load content from {args.content}: {e}")
+            sys.exit(1)
+    else:
+        manifest = MANIFEST
+
+    if args.analytics:
+        from cyoa.analytics import run_analytics
+        from cyoa.index import ContentIndex
+        run_analytics(args.analytics, index=ContentIndex(manifest), output=args.analytics_json)
+        return
+
+    if args.item_analysis:
+        from cyoa.items import run_item_analysis
+        from cyoa.index import ContentIndex
+        run_item_analysis(args.item_analysis, ContentIndex(manifest), output=args.analytics_json)
+        return
+
+    if args.batch or args.serve:
+        exercises = [info.load() for info in manifest]
+
+        if args.batch:
+            from cyoa.batch import run_batch
+            report = run_batch(exercises, args.batch, data_dir=data_dir, store=args.store)
+            sys.exit(1 if report["errors"] else 0)
+
+        from cyoa.server import serve
+        serve(exercises, host=args.host, port=args.serve,
+              data_dir=data_dir, store=args.store)
+        return
+
+    if library is not None:
+        # Exercises load as the learner enters them; warn on the screen
+        library.warn = ui.warn
+
     # Create the game engine
-    engine = GameEngine(data_dir=data_dir)
+    # Every answer is written through before the next screen; with the
+    # JSON store that is one fsynced journal append per answer
+    store_options = {"journal": True} if args.store == "json" else {}
+    store = create_store(args.store, data_dir, learner_id=args.learner, **store_options)
+    # Store warnings go on the rendered screen; a bare print would
+    # desync the renderer's copy of it
+    progress = ProgressManager(data_dir, learner_id=args.learner, store=store, warn=ui.warn)
+    engine = GameEngine(data_dir=data_dir, progress=progress)
 
     # Register all exercises
-    engine.register_exercise(get_exercise1())
-    engine.register_exercise(get_exercise2())
-    engine.register_exercise(get_exercise3())
-    engine.register_exercise(get_exercise4())
-    engine.register_exercise(get_exercise5())
+    for info in manifest:
+        engine.register_exercise(info)
+
+    # Cache the terminal width until the window is resized
+    ui.install_resize_handler()
+
+    # Turn termination into a normal exit so timings get written
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, lambda signum, frame: sys.exit(0))
 
     # Run the game
     try:
@@ -46,6 +183,8 @@ def main():
     except KeyboardInterrupt:
         print("\n\nExiting... Your progress has been saved.")
         sys.exit(0)
+    finally:
+        progress.flush()
 
 
 if __name__ == "__main__":
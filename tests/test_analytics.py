@@ -0,0 +1,64 @@
+"""Tests for reading cohort progress into analytics."""
+
+import sqlite3
+
+from cyoa.analytics import analyze
+from cyoa.progress import ProgressManager
+from cyoa.storage import create_store
+
+
+def save_learner(data_dir, learner, backend="sqlite"):
+    store = create_store(backend, data_dir, learner_id=learner)
+    manager = ProgressManager(data_dir, learner_id=learner, store=store)
+    manager.new_session()
+    manager.record_answer("ex1", "ex1_sc1", "ex1_sc1_q1", "A", True, 10)
+    manager.save_session()
+    return store
+
+
+def test_sqlite_without_timings_table_counts_learner(tmp_path):
+    data_dir = str(tmp_path)
+    save_learner(data_dir, "alice").conn.close()
+    # A database from before timings were kept
+    conn = sqlite3.connect(str(tmp_path / "progress.db"))
+    conn.execute("DROP TABLE timings")
+    conn.commit()
+    conn.close()
+
+    report = analyze(data_dir, use_numpy=False)
+
+    assert report["errors"] == []
+    assert report["learners"] == 1
+    assert report["exercises"]["ex1"]["learners"] == 1
+
+
+def test_unreadable_timings_skip_learner_entirely(tmp_path):
+    data_dir = str(tmp_path)
+    save_learner(data_dir, "alice", backend="json")
+    (tmp_path / "progress_alice.timings").write_text("{not json")
+
+    report = analyze(data_dir, use_numpy=False)
+
+    assert len(report["errors"]) == 1
+    assert report["learners"] == 0
+
+
+def test_scan_leaves_live_journal_untouched(tmp_path):
+    data_dir = str(tmp_path)
+    store = create_store("json", data_dir, learner_id="alice", journal=True)
+    manager = ProgressManager(data_dir, learner_id="alice", store=store)
+    manager.new_session()
+    manager.save_session()
+    manager.record_answer("ex1", "ex1_sc1", "ex1_sc1_q1", "A", True, 10)
+    # The next answer is still being appended
+    with open(store.journal_path, "a") as f:
+        f.write('{"op":"answer","ex":"ex1"')
+    with open(store.journal_path, "rb") as f:
+        before = f.read()
+
+    report = analyze(data_dir, use_numpy=False)
+
+    assert report["errors"] == []
+    assert report["exercises"]["ex1"]["learners"] == 1
+    with open(store.journal_path, "rb") as f:
+        assert f.read() == before
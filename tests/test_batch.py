@@ -0,0 +1,182 @@
+"""Tests for headless batch grading."""
+
+import json
+
+import pytest
+
+from cyoa.batch import BatchError, BatchRunner, normalize_answer
+from cyoa.progress import ProgressManager
+from cyoa.scenarios.base import (
+    ChecklistQuestion,
+    FreeTextQuestion,
+    MultipleChoiceQuestion,
+    RankingQuestion,
+)
+from cyoa.scenarios.registry import load_all
+from cyoa.storage import create_store
+
+
+EXERCISES = load_all()
+QUESTIONS = [q for e in EXERCISES for s in e.scenarios for q in s.questions]
+
+
+def first(kind):
+    return next(q for q in QUESTIONS if isinstance(q, kind))
+
+
+def test_multiple_choice_is_trimmed_and_upper_cased():
+    question = first(MultipleChoiceQuestion)
+    key = question.options[0][0]
+    assert normalize_answer(question, f"  {key.lower()} ") == key.upper()
+
+
+@pytest.mark.parametrize("answer", ["Z", "", ["A"], 1, None])
+def test_multiple_choice_rejects_other_answers(answer):
+    with pytest.raises(BatchError):
+        normalize_answer(first(MultipleChoiceQuestion), answer)
+
+
+def test_checklist_becomes_a_mask():
+    question = first(ChecklistQuestion)
+    keys = [key for key, _ in question.options][:2]
+    mask = question.mask_of(keys)[0]
+
+    assert normalize_answer(question, keys) == mask
+    assert normalize_answer(question, [k.lower() for k in reversed(keys)]) == mask
+    # A comma-separated string is read like the interactive prompt's input
+    assert normalize_answer(question, f" {keys[0].lower()}, {keys[1]}, ") == mask
+
+
+@pytest.mark.parametrize("answer", [[], "", ",", ["Z"], "A,Z", {"A": True}, 3])
+def test_checklist_rejects_other_answers(answer):
+    with pytest.raises(BatchError):
+        normalize_answer(first(ChecklistQuestion), answer)
+
+
+def test_ranking_numbers_become_ints():
+    question = first(RankingQuestion)
+    ranking = list(range(1, question.num_ranks + 1))
+    assert normalize_answer(question, [str(n) for n in ranking]) == ranking
+
+
+def test_ranking_rejects_other_answers():
+    question = first(RankingQuestion)
+    good = list(range(1, question.num_ranks + 1))
+    bad = [
+        "1,2,3",
+        good[:-1],
+        good + [question.num_ranks + 1],
+        [good[0]] * question.num_ranks,
+        [0] + good[1:],
+        good[:-1] + [len(question.items) + 1],
+        good[:-1] + ["x"],
+        good[:-1] + [None],
+    ]
+    for answer in bad:
+        with pytest.raises(BatchError):
+            normalize_answer(question, answer)
+
+
+def test_free_text_is_trimmed():
+    question = FreeTextQuestion(id="q", text="", feedback_correct="", feedback_incorrect="",
+                                model_answer="", required_keywords=["tls"])
+    assert normalize_answer(question, "  use TLS \n") == "use TLS"
+    for answer in ["", "   ", None, ["tls"]]:
+        with pytest.raises(BatchError):
+            normalize_answer(question, answer)
+
+
+def correct_answer(question):
+    """The scripted form of a question's right answer."""
+    if isinstance(question, ChecklistQuestion):
+        return ",".join(question.correct_answers)
+    return question.correct_answer
+
+
+def wrong_answer(question):
+    """A scripted answer that earns less than full marks."""
+    if isinstance(question, MultipleChoiceQuestion):
+        return next(key for key, _ in question.options if key != question.correct_answer)
+    if isinstance(question, ChecklistQuestion):
+        return [next(key for key, _ in question.options if key not in question.correct_answers)]
+    return list(reversed(question.correct_answer))
+
+
+def write_answers(path, records, extra=()):
+    with open(path, "w") as f:
+        f.write("# scripted answers\n\n")
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+        for line in extra:
+            f.write(line + "\n")
+
+
+def load(tmp_path, store, learner):
+    manager = ProgressManager(
+        str(tmp_path), learner_id=learner,
+        store=create_store(store, str(tmp_path), learner_id=learner),
+    )
+    assert manager.load_session() is not None
+    return manager
+
+
+@pytest.mark.parametrize("store", ["json", "sqlite"])
+def test_run_completes_a_scenario_and_records_scores(tmp_path, store):
+    exercise = EXERCISES[0]
+    scenario = exercise.scenarios[0]
+    missed = scenario.questions[0]
+
+    records, expected = [], {}
+    for learner in ("alice", "bob"):
+        for question in scenario.questions:
+            answer = correct_answer(question)
+            if learner == "bob" and question is missed:
+                answer = wrong_answer(question)
+            records.append({"learner": learner, "question": question.id, "answer": answer})
+            normalized = normalize_answer(question, answer)
+            expected[learner, question.id] = question.check_answer(normalized)[:2]
+
+    path = tmp_path / "answers.jsonl"
+    write_answers(path, records, extra=[
+        "not json",
+        json.dumps({"learner": "alice", "question": "no_such_question", "answer": "A"}),
+        json.dumps({"learner": "alice", "answer": "A"}),
+    ])
+
+    # One session open at a time: evicted learners must be written out
+    report = BatchRunner(EXERCISES, data_dir=str(tmp_path), store=store, max_open=1).run(str(path))
+
+    assert report["answers"] == len(records)
+    assert report["learners"] == 2
+    # The comment, blank line and records come before the bad lines
+    bad = [f"line {n}" for n in range(len(records) + 3, len(records) + 6)]
+    assert [error.split(":")[0] for error in report["errors"]] == bad
+    assert report["errors"][1].endswith("'no_such_question'")
+
+    for learner in ("alice", "bob"):
+        progress = load(tmp_path, store, learner).get_scenario_progress(exercise.id, scenario.id)
+        assert progress.completed
+        for question in scenario.questions:
+            record = progress.questions[question.id]
+            assert (record.correct, record.score) == pytest.approx(expected[learner, question.id])
+        assert progress.get_score() == pytest.approx(
+            sum(expected[learner, q.id][1] for q in scenario.questions)
+        )
+
+    assert expected["alice", missed.id] == (True, missed.points)
+    assert expected["bob", missed.id][1] < missed.points
+
+
+def test_partly_answered_scenario_is_not_completed(tmp_path):
+    exercise = EXERCISES[0]
+    scenario = exercise.scenarios[0]
+    question = scenario.questions[0]
+    path = tmp_path / "answers.jsonl"
+    write_answers(path, [{"learner": "alice", "question": question.id, "answer": correct_answer(question)}])
+
+    report = BatchRunner(EXERCISES, data_dir=str(tmp_path)).run(str(path))
+
+    assert report["errors"] == []
+    progress = load(tmp_path, "json", "alice").get_scenario_progress(exercise.id, scenario.id)
+    assert not progress.completed
+    assert progress.questions[question.id].score == question.points
@@ -0,0 +1,172 @@
+"""Tests for JSON content files and the compiled content cache."""
+
+import json
+import os
+
+import pytest
+
+from cyoa import content, ui
+from cyoa.content import ContentLibrary, export_exercises, exercise_to_dict
+from cyoa.scenarios.registry import load_all
+
+
+@pytest.fixture
+def content_dir(tmp_path):
+    export_exercises(load_all(), str(tmp_path))
+    return tmp_path
+
+
+def corrupt_blob(library, exercise_id, data):
+    """Overwrite the start of an exercise's cached blob."""
+    for source in library.header()["sources"].values():
+        if source["entry"][0] == exercise_id:
+            with open(library.cache_path, "r+b") as f:
+                f.seek(source["offset"])
+                f.write(data)
+            return
+    raise KeyError(exercise_id)
+
+
+@pytest.mark.parametrize("data", [b"\x00" * 16, b"\x80\x05N."], ids=["garbage", "not-an-exercise"])
+def test_corrupt_blob_is_recompiled(content_dir, capsys, data):
+    expected = exercise_to_dict(load_all()[1])
+    corrupt_blob(ContentLibrary(str(content_dir)), expected["id"], data)
+
+    assert exercise_to_dict(ContentLibrary(str(content_dir)).load(expected["id"])) == expected
+    assert "corrupt" in capsys.readouterr().out
+
+    # The cache entry was rewritten
+    assert exercise_to_dict(ContentLibrary(str(content_dir)).load(expected["id"])) == expected
+    assert capsys.readouterr().out == ""
+
+
+def test_corrupt_blob_warning_goes_to_session_screen(content_dir, capsys):
+    exercise_id = load_all()[0].id
+    corrupt_blob(ContentLibrary(str(content_dir)), exercise_id, b"\x00" * 16)
+
+    with ui.capture() as screen:
+        ContentLibrary(str(content_dir), warn=ui.warn).load(exercise_id)
+
+    assert "corrupt" in screen.getvalue()
+    assert capsys.readouterr().out == ""
+
+
+@pytest.mark.parametrize("data", [
+    b"\x80\x09",                          # unsupported pickle protocol (ValueError)
+    b"X\x02\x00\x00\x00\xff\xfe.",          # invalid UTF-8 (UnicodeDecodeError)
+], ids=["protocol", "unicode"])
+def test_corrupt_header_is_recompiled(content_dir, data):
+    library = ContentLibrary(str(content_dir))
+    library.header()
+    with open(library.cache_path, "r+b") as f:
+        f.seek(8)
+        f.write(data)
+
+    manifest = ContentLibrary(str(content_dir)).manifest()
+    assert [info.id for info in manifest] == [e.id for e in load_all()]
+
+
+def test_header_size_beyond_the_file_is_recompiled(content_dir):
+    library = ContentLibrary(str(content_dir))
+    library.header()
+    with open(library.cache_path, "r+b") as f:
+        f.write(b"\xff" * 8)
+
+    assert len(ContentLibrary(str(content_dir)).manifest()) == len(load_all())
+
+
+def test_truncated_cache_is_recompiled(content_dir):
+    library = ContentLibrary(str(content_dir))
+    library.header()
+    with open(library.cache_path, "r+b") as f:
+        f.seek(0, 2)
+        f.truncate(f.tell() - 100)
+
+    library = ContentLibrary(str(content_dir))
+    last = library.manifest()[-1]
+    assert exercise_to_dict(last.load()) == exercise_to_dict(load_all()[-1])
+
+
+def test_round_trip_matches_built_in_exercises(content_dir):
+    library = ContentLibrary(str(content_dir))
+    originals = load_all()
+
+    assert [info.id for info in library.manifest()] == [e.id for e in originals]
+    for original, loaded in zip(originals, library.load_all()):
+        assert exercise_to_dict(loaded) == exercise_to_dict(original)
+        for mine, theirs in zip(
+            (q for s in loaded.scenarios for q in s.questions),
+            (q for s in original.scenarios for q in s.questions),
+        ):
+            answer = getattr(theirs, "correct_answers", theirs.correct_answer)
+            assert mine.check_answer(answer) == theirs.check_answer(answer)
+
+    # A second library reads the compiled cache and gets the same exercises
+    cached = ContentLibrary(str(content_dir)).load_all()
+    assert [exercise_to_dict(e) for e in cached] == [exercise_to_dict(e) for e in originals]
+
+
+def test_manifest_matches_exercises(content_dir):
+    for info in ContentLibrary(str(content_dir)).manifest():
+        exercise = info.load()
+        questions = [q for s in exercise.scenarios for q in s.questions]
+        assert info.question_count == len(questions)
+        assert info.total_points == sum(q.points for q in questions)
+
+
+def rewrite(path, **changes):
+    with open(path) as f:
+        data = json.load(f)
+    data.update(changes)
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+
+def test_edited_file_is_recompiled(content_dir):
+    ContentLibrary(str(content_dir)).header()
+    path = content_dir / "exercise2.json"
+    rewrite(path, title="Renamed")
+    os.utime(path, ns=(0, 10**9))
+
+    library = ContentLibrary(str(content_dir))
+    titles = {info.id: info.title for info in library.manifest()}
+    assert titles["exercise2"] == "Renamed"
+    assert library.load("exercise2").title == "Renamed"
+    assert library.load("exercise1").title == load_all()[0].title
+
+
+def test_touched_file_keeps_its_compiled_blob(content_dir, monkeypatch):
+    ContentLibrary(str(content_dir)).header()
+    os.utime(content_dir / "exercise3.json", ns=(0, 10**9))
+
+    def no_parsing(data):
+        raise AssertionError("an unchanged file was parsed again")
+
+    monkeypatch.setattr(content, "exercise_from_dict", no_parsing)
+    library = ContentLibrary(str(content_dir))
+    assert library.load("exercise3").id == "exercise3"
+    # The new stats were recorded, so the next startup needs no hashing either
+    assert ContentLibrary(str(content_dir)).header() == library.header()
+
+
+def test_added_and_removed_files_change_the_manifest(content_dir):
+    ContentLibrary(str(content_dir)).header()
+    os.remove(content_dir / "exercise5.json")
+    extra = exercise_to_dict(load_all()[0])
+    extra.update(id="exercise9", number=9, title="Extra")
+    with open(content_dir / "extra.json", "w") as f:
+        json.dump(extra, f)
+
+    ids = [info.id for info in ContentLibrary(str(content_dir)).manifest()]
+    assert ids == ["exercise1", "exercise2", "exercise3", "exercise4", "exercise9"]
+
+
+def test_cache_from_another_version_is_ignored(content_dir, monkeypatch):
+    ContentLibrary(str(content_dir)).header()
+    monkeypatch.setattr(content, "CACHE_VERSION", content.CACHE_VERSION + 1)
+    calls = []
+    real = content.exercise_from_dict
+    monkeypatch.setattr(content, "exercise_from_dict", lambda data: calls.append(1) or real(data))
+
+    assert len(ContentLibrary(str(content_dir)).manifest()) == 5
+    assert len(calls) == 5
@@ -0,0 +1,220 @@
+"""Tests for the grading and feedback-frame caches."""
+
+import dataclasses
+import io
+
+import pytest
+
+from cyoa import ui
+from cyoa.feedback import (
+    _LRUCache,
+    canonical_answer,
+    clear_grade_cache,
+    display_feedback,
+    evaluate_answer,
+    grade_cache_info,
+)
+from cyoa.render import ANSI_ESCAPE, PlainTextRenderer
+from cyoa.scenarios.base import (
+    ChecklistQuestion,
+    FreeTextQuestion,
+    MultipleChoiceQuestion,
+    RankingQuestion,
+)
+from cyoa.scenarios.registry import load_all
+
+
+QUESTIONS = [q for e in load_all() for s in e.scenarios for q in s.questions]
+
+
+def first(kind):
+    return next(q for q in QUESTIONS if isinstance(q, kind))
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    clear_grade_cache()
+    yield
+    clear_grade_cache()
+
+
+class CountingQuestion(MultipleChoiceQuestion):
+    """A multiple choice question that counts how often it is graded."""
+
+    def check_answer(self, answer):
+        self.graded += 1
+        return super().check_answer(answer)
+
+
+def counting(question, **changes):
+    fields = {f.name: getattr(question, f.name) for f in dataclasses.fields(question) if f.init}
+    fields.update(changes)
+    counted = CountingQuestion(**fields)
+    counted.graded = 0
+    return counted
+
+
+def test_lru_evicts_least_recently_used():
+    cache = _LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the oldest
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.info() == {"hits": 3, "misses": 1, "hit_rate": 0.75, "size": 2}
+
+
+def test_lru_put_refreshes_an_existing_key():
+    cache = _LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("a", 10)
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 10
+
+
+def test_lru_clear_resets_counters():
+    cache = _LRUCache(2)
+    cache.put("a", 1)
+    cache.get("a")
+    cache.get("b")
+    cache.clear()
+    assert cache.info() == {"hits": 0, "misses": 0, "hit_rate": 0.0, "size": 0}
+
+
+def test_repeated_answer_is_graded_once():
+    question = counting(first(MultipleChoiceQuestion))
+    key = question.options[0][0]
+
+    result = evaluate_answer(question, key)
+    # Case does not change the grade, so it shares the entry
+    assert evaluate_answer(question, key.lower()) == result
+    assert evaluate_answer(question, key) == result
+
+    assert question.graded == 1
+    assert grade_cache_info()["grades"]["hits"] == 2
+
+
+def test_grading_field_change_misses():
+    question = counting(first(MultipleChoiceQuestion))
+    key = question.correct_answer
+    assert evaluate_answer(question, key)[1] == question.points
+
+    regraded = counting(question, points=question.points + 5)
+    assert evaluate_answer(regraded, key)[1] == question.points + 5
+    assert regraded.graded == 1
+
+    # Reworded text grades the same and reuses the entry
+    reworded = counting(question, text="Reworded", hint="Another hint")
+    evaluate_answer(reworded, key)
+    assert reworded.graded == 0
+
+
+def test_checklist_keys_and_mask_share_an_entry():
+    question = first(ChecklistQuestion)
+    keys = list(question.correct_answers)
+    mask, unknown = question.mask_of(keys)
+    assert not unknown
+
+    assert canonical_answer(question, keys) == mask
+    assert canonical_answer(question, list(reversed(keys))) == mask
+    assert canonical_answer(question, mask) == mask
+    assert evaluate_answer(question, keys) == evaluate_answer(question, mask)
+    assert grade_cache_info()["grades"]["size"] == 1
+
+
+@pytest.mark.parametrize("kind,answer", [
+    (FreeTextQuestion, "any text at all"),
+    (MultipleChoiceQuestion, None),
+    (MultipleChoiceQuestion, 1),
+    (ChecklistQuestion, ["A", "not an option"]),
+    (ChecklistQuestion, ["A", 2]),
+    (ChecklistQuestion, "A"),
+    (RankingQuestion, [1, "2"]),
+    (RankingQuestion, [1, True]),
+    (RankingQuestion, (1, 2)),
+])
+def test_uncacheable_answers_are_left_out(kind, answer):
+    if kind is FreeTextQuestion:
+        question = FreeTextQuestion(id="q", text="", feedback_correct="", feedback_incorrect="",
+                                    model_answer="", required_keywords=["tls"])
+    else:
+        question = first(kind)
+    assert canonical_answer(question, answer) is None
+
+    try:
+        evaluate_answer(question, answer)
+    except (AttributeError, TypeError):
+        pass  # Malformed answers fail in check_answer, not in the cache
+    assert grade_cache_info()["grades"] == {"hits": 0, "misses": 0, "hit_rate": 0.0, "size": 0}
+
+
+def test_ranking_answer_is_a_tuple_key():
+    question = first(RankingQuestion)
+    answer = list(range(1, question.num_ranks + 1))
+    assert canonical_answer(question, answer) == tuple(answer)
+
+
+class SessionIO(ui.TerminalIO):
+    """A session of a fixed width whose output is collected in a buffer."""
+
+    def __init__(self, width):
+        self.buffer = io.StringIO()
+        super().__init__(PlainTextRenderer(self.buffer, strip_ansi=False))
+        self.width = width
+
+
+def shown(width, *args, **kwargs):
+    session = SessionIO(width)
+    token = ui.current_io.set(session)
+    try:
+        display_feedback(*args, **kwargs)
+        ui.flush()
+    finally:
+        ui.current_io.reset(token)
+    return session.buffer.getvalue()
+
+
+def widest_line(text):
+    return max(len(ANSI_ESCAPE.sub("", line)) for line in text.splitlines())
+
+
+def test_repeated_feedback_is_served_from_the_frame_cache():
+    frame = shown(60, True, 10, "Well done.", "Model.")
+    assert shown(60, True, 10, "Well done.", "Model.") == frame
+    # The score only picks the outcome; any full score shares the frame
+    assert shown(60, True, 5, "Well done.", "Model.") == frame
+    assert grade_cache_info()["frames"]["hits"] == 2
+
+
+def test_frames_are_keyed_by_outcome_and_text():
+    correct = shown(60, True, 10, "Feedback.")
+    partial = shown(60, False, 4, "Feedback.")
+    incorrect = shown(60, False, 0, "Feedback.")
+    other = shown(60, True, 10, "Other feedback.")
+
+    assert len({correct, partial, incorrect, other}) == 4
+    assert grade_cache_info()["frames"] == {"hits": 0, "misses": 4, "hit_rate": 0.0, "size": 4}
+
+
+def test_hidden_model_answer_shares_the_frame_without_one():
+    without = shown(60, False, 0, "Feedback.")
+    assert shown(60, False, 0, "Feedback.", "Model.", show_model=False) == without
+    assert "Model." not in without
+    assert grade_cache_info()["frames"]["hits"] == 1
+
+
+def test_frames_are_laid_out_for_the_session_width():
+    text = "word " * 40
+    narrow = shown(40, True, 10, text)
+    wide = shown(100, True, 10, text)
+
+    assert narrow != wide
+    assert widest_line(narrow) <= 40
+    assert widest_line(wide) > 40
+    assert shown(40, True, 10, text) == narrow
+    assert grade_cache_info()["frames"]["size"] == 2
@@ -0,0 +1,66 @@
+"""Tests that grade_batch agrees with check_answer on every built-in question,
+and that rubric versions follow the fields grading reads."""
+
+import dataclasses
+import itertools
+
+import pytest
+
+from cyoa.grading import grade_batch, np
+from cyoa.scenarios.base import ChecklistQuestion, MultipleChoiceQuestion, RankingQuestion
+from cyoa.scenarios.registry import load_all
+
+
+QUESTIONS = [q for e in load_all() for s in e.scenarios for q in s.questions]
+
+MODES = [False] + ([True] if np is not None else [])
+
+
+def answers_for(question):
+    """Every answer a learner could give, plus a few malformed ones."""
+    if isinstance(question, MultipleChoiceQuestion):
+        keys = [key for key, _ in question.options]
+        return keys + [key.lower() for key in keys] + ["", "Z"]
+    if isinstance(question, ChecklistQuestion):
+        keys = [key for key, _ in question.options]
+        subsets = [
+            list(combo)
+            for size in range(len(keys) + 1)
+            for combo in itertools.combinations(keys, size)
+        ]
+        masks = list(range(question.options_mask + 1))
+        return subsets + masks + [["Z"], [keys[0], keys[0]], [k.lower() for k in keys[:2]]]
+    if isinstance(question, RankingQuestion):
+        items = range(1, len(question.items) + 1)
+        full = [list(p) for p in itertools.permutations(items, question.num_ranks)]
+        return full + [[1], [], [1, 1, 1], [0, 5, 9]]
+    raise AssertionError(f"unexpected question type {type(question).__name__}")
+
+
+@pytest.mark.parametrize("use_numpy", MODES, ids=lambda v: "numpy" if v else "python")
+@pytest.mark.parametrize("question", QUESTIONS, ids=lambda q: q.id)
+def test_grade_batch_matches_check_answer(question, use_numpy):
+    answers = answers_for(question)
+    correct, scores = grade_batch(question, answers, use_numpy=use_numpy)
+
+    assert len(correct) == len(scores) == len(answers)
+    for answer, batch_correct, batch_score in zip(answers, correct, scores):
+        expected_correct, expected_score, _ = question.check_answer(answer)
+        assert bool(batch_correct) == expected_correct, answer
+        assert float(batch_score) == pytest.approx(expected_score), answer
+
+
+def test_every_question_type_is_covered():
+    kinds = {type(q) for q in QUESTIONS}
+    assert {MultipleChoiceQuestion, ChecklistQuestion, RankingQuestion} <= kinds
+
+
+def test_rubric_version_tracks_grading_fields():
+    question = next(q for q in QUESTIONS if isinstance(q, ChecklistQuestion))
+    version = question.rubric_version
+
+    reworded = dataclasses.replace(question, text="Reworded", hint="New hint", model_answer="New")
+    assert reworded.rubric_version == version
+
+    regraded = dataclasses.replace(question, correct_answers=question.correct_answers[:1], points=question.points + 1)
+    assert regraded.rubric_version != version
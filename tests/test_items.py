@@ -0,0 +1,33 @@
+"""Tests for building the item matrix from learner progress."""
+
+import math
+
+from cyoa.index import ContentIndex
+from cyoa.items import ItemMatrix
+from cyoa.progress import ProgressManager
+from cyoa.scenarios.registry import load_all
+from cyoa.storage import create_store
+
+
+def test_load_leaves_live_journal_untouched(tmp_path):
+    data_dir = str(tmp_path)
+    store = create_store("json", data_dir, learner_id="alice", journal=True)
+    manager = ProgressManager(data_dir, learner_id="alice", store=store)
+    manager.new_session()
+    manager.save_session()
+    manager.record_answer("exercise1", "1a", "1a_q1", "C", True, 10)
+    # The next answer is still being appended
+    with open(store.journal_path, "a") as f:
+        f.write('{"op":"answer","ex":"exercise1"')
+    with open(store.journal_path, "rb") as f:
+        before = f.read()
+
+    matrix = ItemMatrix(ContentIndex(load_all()))
+    errors = matrix.load(data_dir)
+
+    assert errors == []
+    assert matrix.learners == 1
+    column = matrix.columns["1a_q1"]
+    assert not math.isnan(matrix.scores[column])
+    with open(store.journal_path, "rb") as f:
+        assert f.read() == before
@@ -0,0 +1,125 @@
+"""Tests for the Aho-Corasick keyword matcher and free-text grading."""
+
+import random
+import re
+
+import pytest
+
+from cyoa.content import ContentError, question_from_dict
+from cyoa.keywords import KeywordMatcher
+from cyoa.scenarios.base import FreeTextQuestion
+
+
+def found(keywords, text, whole_words=False):
+    matcher = KeywordMatcher(keywords, whole_words)
+    return sorted(matcher.keywords[i] for i in matcher.find(text))
+
+
+def test_overlapping_keywords_share_failure_links():
+    # The classic example: "she" ends inside "hers", "he" inside both
+    assert found(["he", "she", "his", "hers"], "ushers") == ["he", "hers", "she"]
+
+
+def test_failure_link_recovers_a_keyword_inside_a_dead_end():
+    # "abc" leads nowhere once "e" arrives; "bc" must still be found
+    assert found(["abcd", "bc"], "abce") == ["bc"]
+    assert found(["aab", "ab"], "aaab") == ["aab", "ab"]
+
+
+def test_matching_is_case_insensitive():
+    assert found(["TLS", "Firewall"], "the firewall blocks tls") == ["Firewall", "TLS"]
+
+
+def test_substring_matching_by_default():
+    assert found(["encrypt"], "data was encrypted") == ["encrypt"]
+
+
+@pytest.mark.parametrize("text,matches", [
+    ("encrypted", False),
+    ("encrypt.", True),
+    ("(encrypt)", True),
+    ("pre_encrypt", False),
+    ("encrypt2", False),
+    ("encrypt", True),
+])
+def test_whole_words_boundaries(text, matches):
+    assert found(["encrypt"], text, whole_words=True) == (["encrypt"] if matches else [])
+
+
+def test_whole_words_skips_a_bad_occurrence_for_a_good_one():
+    assert found(["key"], "keys and a key", whole_words=True) == ["key"]
+
+
+def test_split_keeps_keyword_order():
+    matcher = KeywordMatcher(["b", "a", "c"])
+    assert matcher.split("c b") == (["b", "c"], ["a"])
+
+
+def test_empty_keywords_are_rejected():
+    with pytest.raises(ValueError):
+        KeywordMatcher(["tls", ""])
+    with pytest.raises(ValueError):
+        FreeTextQuestion(id="q", text="", feedback_correct="", feedback_incorrect="",
+                         model_answer="", required_keywords=["tls", ""])
+    with pytest.raises(ContentError):
+        question_from_dict({"type": "free_text", "id": "q", "text": "", "feedback_correct": "",
+                            "feedback_incorrect": "", "model_answer": "", "bonus_keywords": [""]})
+
+
+def random_text(rng, alphabet, length):
+    return "".join(rng.choice(alphabet) for _ in range(length))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_naive_search(seed):
+    rng = random.Random(seed)
+    alphabet = "abAB_ .-"
+    for _ in range(50):
+        keywords = [random_text(rng, alphabet, rng.randint(1, 4)) for _ in range(rng.randint(1, 8))]
+        text = random_text(rng, alphabet, rng.randint(0, 40))
+        lower = text.lower()
+
+        substring = {i for i, kw in enumerate(keywords) if kw.lower() in lower}
+        assert KeywordMatcher(keywords).find(text) == substring
+
+        whole = {
+            i for i, kw in enumerate(keywords)
+            if re.search(r"\b" + re.escape(kw.lower()) + r"\b", lower)
+        }
+        assert KeywordMatcher(keywords, whole_words=True).find(text) == whole
+
+
+def naive_check_answer(question, answer):
+    """FreeTextQuestion.check_answer as it was before the matcher."""
+    answer_lower = answer.lower()
+    required_found = sum(1 for kw in question.required_keywords if kw.lower() in answer_lower)
+    bonus_found = sum(1 for kw in question.bonus_keywords if kw.lower() in answer_lower)
+    total_required = len(question.required_keywords)
+    if total_required == 0:
+        return (True, question.points, question.feedback_correct)
+    if required_found >= total_required:
+        bonus_score = min(bonus_found * 0.1, 0.3)
+        score = min(question.points * (1 + bonus_score), question.points)
+        return (True, score, "Excellent response! " + question.feedback_correct)
+    elif required_found >= question.min_keywords:
+        score = question.points * required_found / total_required
+        missing = [kw for kw in question.required_keywords if kw.lower() not in answer_lower]
+        return (False, score, f"Good response, but consider also discussing: {', '.join(missing[:3])}")
+    return (False, 0, question.feedback_incorrect)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_free_text_grading_matches_old_loop(seed):
+    rng = random.Random(seed)
+    words = ["tls", "cert", "key", "encrypt", "hash", "salt", "Firewall", "log"]
+    for _ in range(30):
+        question = FreeTextQuestion(
+            id="q", text="", feedback_correct="Right.", feedback_incorrect="Wrong.",
+            model_answer="", points=rng.choice([5, 10]),
+            required_keywords=rng.sample(words, rng.randint(0, 5)),
+            bonus_keywords=rng.sample(words, rng.randint(0, 3)),
+            min_keywords=rng.randint(1, 3),
+        )
+        for _ in range(10):
+            answer = " ".join(rng.choice(words + ["the", "encrypted", "TLS"]) for _ in range(rng.randint(0, 8)))
+            assert question.check_answer(answer) == pytest.approx(naive_check_answer(question, answer))
@@ -0,0 +1,140 @@
+"""Tests for the quantile sketches behind latency statistics."""
+
+import json
+import math
+import random
+
+import pytest
+
+from cyoa.latency import LatencyStats, QuantileSketch
+
+
+QUANTILES = [0, 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 0.99, 1]
+
+
+def exact(values, q):
+    """The sample the sketch's rank rule picks, from the sorted values."""
+    ordered = sorted(values)
+    return ordered[math.floor(q * (len(ordered) - 1))]
+
+
+def samples(seed, n=5000):
+    """Think-time-like values: lognormal seconds, a few zeros."""
+    rng = random.Random(seed)
+    return [0.0 if rng.random() < 0.02 else rng.lognormvariate(0, 1.5) for _ in range(n)]
+
+
+def assert_within(sketch, values, accuracy, quantiles=QUANTILES):
+    for q in quantiles:
+        expected = exact(values, q)
+        assert sketch.quantile(q) == pytest.approx(expected, rel=accuracy * (1 + 1e-9), abs=1e-12), q
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("accuracy", [0.01, 0.05])
+def test_quantiles_within_relative_accuracy(seed, accuracy):
+    values = samples(seed)
+    sketch = QuantileSketch(accuracy)
+    for value in values:
+        sketch.add(value)
+
+    assert sketch.count == len(values)
+    assert sketch.mean() == pytest.approx(sum(values) / len(values))
+    assert_within(sketch, values, accuracy)
+
+
+def test_empty_sketch():
+    sketch = QuantileSketch()
+    assert sketch.quantile(0.5) is None
+    assert sketch.mean() is None
+
+
+def test_merge_equals_one_sketch_of_all_values():
+    parts = [samples(seed, 1000) for seed in range(4)]
+    merged = QuantileSketch()
+    for part in parts:
+        sketch = QuantileSketch()
+        for value in part:
+            sketch.add(value)
+        merged.merge(sketch)
+
+    whole = QuantileSketch()
+    for value in sum(parts, []):
+        whole.add(value)
+
+    assert merged.buckets == whole.buckets
+    assert (merged.count, merged.zeros, merged.min, merged.max) == (whole.count, whole.zeros, whole.min, whole.max)
+    assert_within(merged, sum(parts, []), 0.01)
+
+
+def test_merge_rejects_different_accuracy():
+    with pytest.raises(ValueError):
+        QuantileSketch(0.01).merge(QuantileSketch(0.02))
+
+
+def test_round_trip_through_json():
+    sketch = QuantileSketch()
+    for value in samples(7, 500):
+        sketch.add(value)
+
+    restored = QuantileSketch.from_dict(json.loads(json.dumps(sketch.to_dict())))
+
+    assert restored.to_dict() == sketch.to_dict()
+    for q in QUANTILES:
+        assert restored.quantile(q) == sketch.quantile(q)
+
+
+def test_collapse_keeps_high_quantiles_accurate():
+    # Values over many orders of magnitude need far more buckets than allowed
+    rng = random.Random(3)
+    values = [10 ** rng.uniform(-6, 3) for _ in range(20000)]
+    sketch = QuantileSketch(0.01, max_buckets=200)
+    for value in values:
+        sketch.add(value)
+
+    unlimited = QuantileSketch(0.01, max_buckets=10 ** 6)
+    for value in values:
+        unlimited.add(value)
+    assert len(unlimited.buckets) > 200
+
+    assert len(sketch.buckets) <= 200
+    assert sum(sketch.buckets.values()) == sketch.count == len(values)
+    # Only the lowest buckets were folded together: the top keeps its
+    # accuracy and the low end is overestimated, never underestimated
+    assert_within(sketch, values, 0.01, quantiles=[0.9, 0.95, 0.99, 1])
+    for q in (0.01, 0.1, 0.5):
+        assert sketch.quantile(q) >= exact(values, q) * 0.99
+
+
+def test_merge_collapses_past_the_bucket_limit():
+    low, high = QuantileSketch(max_buckets=50), QuantileSketch(max_buckets=50)
+    for n in range(40):
+        low.add(1e-3 * 1.05 ** n)
+        high.add(1e3 * 1.05 ** n)
+
+    low.merge(high)
+
+    assert len(low.buckets) <= 50
+    assert low.count == 80
+    assert low.quantile(1) == pytest.approx(high.max, rel=0.01)
+
+
+def test_latency_stats_round_trip_and_merge():
+    first, second = LatencyStats(), LatencyStats()
+    for n, value in enumerate(samples(11, 200)):
+        (first if n % 2 else second).add(f"q{n % 3}", "think", value)
+        first.add("q0", "grade", value / 1000)
+
+    restored = LatencyStats.from_dict(json.loads(json.dumps(first.to_dict())))
+    assert restored.summary() == first.summary()
+
+    restored.merge(second)
+    assert restored.phase("think").count == 200
+    assert set(restored.phase_summary()) == {"think", "grade"}
+
+
+def test_latency_stats_rejects_unknown_format():
+    with pytest.raises(ValueError):
+        LatencyStats.from_dict({"format": 99})
+    with pytest.raises(ValueError):
+        LatencyStats.from_dict({"format": 1, "accuracy": 0.01, "questions": {"q": {"think": {}}}})
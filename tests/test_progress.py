@@ -0,0 +1,122 @@
+"""Tests for ProgressManager's aggregate counters and slotted question records."""
+
+import json
+import random
+
+import pytest
+
+from cyoa.progress import ProgressManager, QuestionProgress, check_aggregates
+from cyoa.storage import create_store
+
+
+STORES = [
+    ("json", {}),
+    ("json", {"journal": True, "compact_every": 7}),
+    ("sqlite", {}),
+]
+
+
+def manager_for(tmp_path, backend, options):
+    store = create_store(backend, str(tmp_path), learner_id="learner", **options)
+    return ProgressManager(str(tmp_path), learner_id="learner", store=store)
+
+
+def play(manager, rng, steps):
+    """Random answers, re-answers and scenario completions."""
+    for _ in range(steps):
+        ex = f"ex{rng.randrange(3)}"
+        sc = f"{ex}_sc{rng.randrange(3)}"
+        if rng.random() < 0.15:
+            manager.mark_scenario_complete(ex, sc)
+        else:
+            question = f"{sc}_q{rng.randrange(4)}"
+            score = rng.choice([0, 0.25, 0.5, 1, 2.5, 10])
+            manager.record_answer(ex, sc, question, rng.choice("ABCD"), score > 1, score)
+        check_aggregates(manager.session)
+
+
+@pytest.mark.parametrize("backend,options", STORES, ids=["json", "journal", "sqlite"])
+@pytest.mark.parametrize("seed", range(5))
+def test_counters_match_recomputation(tmp_path, backend, options, seed):
+    rng = random.Random(seed)
+    manager = manager_for(tmp_path, backend, options)
+    manager.new_session()
+    manager.save_session()
+    play(manager, rng, 60)
+
+    reloaded = manager_for(tmp_path, backend, options)
+    session = reloaded.load_session()
+    check_aggregates(session)
+    assert session.answered_count == manager.session.answered_count
+    assert session.total_score == pytest.approx(manager.session.total_score)
+
+    # Keep going on the reloaded session
+    play(reloaded, rng, 30)
+
+
+def test_check_aggregates_raises_on_drift(tmp_path):
+    manager = manager_for(tmp_path, "json", {})
+    manager.new_session()
+    play(manager, random.Random(0), 10)
+
+    manager.session.answered_count += 1
+    with pytest.raises(AssertionError, match="session answered_count"):
+        check_aggregates(manager.session)
+
+
+TIMESTAMPS = [
+    None,
+    "2026-10-18T13:47:34.123456",
+    "2026-10-18T13:47:34",
+    "1969-12-31T23:59:59.999999",
+    "2026-10-18T13:47:34+02:00",
+    "2026-10-18T13:47:34.5-05:30",
+    "2026-10-18T13:47:34Z",
+    "2026-10-18",
+    "not a time",
+]
+
+
+@pytest.mark.parametrize("answered", [False, True])
+@pytest.mark.parametrize("correct", [False, True])
+def test_flags_pack_and_toggle_independently(answered, correct):
+    q = QuestionProgress("q1", answered=answered, correct=correct)
+    assert (q.answered, q.correct) == (answered, correct)
+
+    q.answered = not answered
+    assert (q.answered, q.correct) == (not answered, correct)
+    q.correct = not correct
+    assert (q.answered, q.correct) == (not answered, not correct)
+
+
+@pytest.mark.parametrize("timestamp", TIMESTAMPS)
+def test_timestamps_come_back_unchanged(timestamp):
+    q = QuestionProgress("q1", timestamp=timestamp)
+    assert q.timestamp == timestamp
+    q.timestamp = timestamp
+    assert q.timestamp == timestamp
+
+
+def test_naive_timestamps_are_packed_and_others_kept_as_strings():
+    assert isinstance(QuestionProgress("q", timestamp=TIMESTAMPS[1])._ts, int)
+    # Offsets and "Z" would not survive the round trip through microseconds
+    for timestamp in TIMESTAMPS[4:]:
+        assert QuestionProgress("q", timestamp=timestamp)._ts == timestamp
+
+
+def test_records_round_trip_through_saved_progress(tmp_path):
+    manager = manager_for(tmp_path, "json", {})
+    manager.new_session()
+    for n, timestamp in enumerate(TIMESTAMPS):
+        manager.record_answer("ex1", "ex1_sc1", f"q{n}", ["A", n], n % 2 == 0, n / 2)
+        manager.session.exercises["ex1"].scenarios["ex1_sc1"].questions[f"q{n}"].timestamp = timestamp
+    manager.session.exercises["ex1"].scenarios["ex1_sc1"].questions["q0"].answered = False
+
+    data = json.loads(json.dumps(manager._session_to_dict()))
+    session = manager._session_from_dict(data)
+
+    before = manager.session.exercises["ex1"].scenarios["ex1_sc1"].questions
+    after = session.exercises["ex1"].scenarios["ex1_sc1"].questions
+    assert after == before
+    assert [q.timestamp for q in after.values()] == TIMESTAMPS
+    assert [(q.answered, q.correct) for q in after.values()] == [(q.answered, q.correct) for q in before.values()]
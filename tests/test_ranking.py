@@ -0,0 +1,102 @@
+"""Tests for the ranking partial-credit scorers."""
+
+import itertools
+import random
+
+import pytest
+
+from cyoa.ranking import (
+    RANKING_SCORERS,
+    count_inversions,
+    footrule_score,
+    inverse_permutation,
+    kendall_score,
+    position_score,
+    weighted_topk_score,
+)
+from cyoa.scenarios.base import RankingQuestion
+
+
+def score(scorer, answer, correct):
+    return scorer(answer, correct, inverse_permutation(correct))
+
+
+def brute_force_inversions(sequence):
+    return sum(
+        1 for i, j in itertools.combinations(range(len(sequence)), 2) if sequence[i] > sequence[j]
+    )
+
+
+def test_count_inversions_matches_brute_force():
+    rng = random.Random(7)
+    for length in range(12):
+        for _ in range(20):
+            sequence = [rng.randrange(6) for _ in range(length)]
+            assert count_inversions(sequence) == brute_force_inversions(sequence)
+
+
+def test_inverse_permutation_keeps_first_occurrence():
+    assert inverse_permutation([3, 1, 3, 2]) == {3: 0, 1: 1, 2: 3}
+
+
+@pytest.mark.parametrize("scorer", RANKING_SCORERS.values(), ids=RANKING_SCORERS.keys())
+def test_scores_are_fractions_and_perfect_is_one(scorer):
+    correct = [3, 1, 4, 2, 5]
+    assert score(scorer, correct, correct) == pytest.approx(1.0)
+    assert score(scorer, [], []) == 0.0
+    for answer in itertools.permutations(correct):
+        assert 0.0 <= score(scorer, list(answer), correct) <= 1.0
+    for answer in ([], [9, 9], [3], [1, 1, 1, 1, 1]):
+        assert 0.0 <= score(scorer, answer, correct) <= 1.0
+
+
+def test_position_score():
+    assert score(position_score, [1, 2, 3, 4], [1, 2, 4, 3]) == 0.5
+    assert score(position_score, [2, 1], [1, 2]) == 0.0
+
+
+def test_kendall_score():
+    correct = [1, 2, 3, 4]
+    assert score(kendall_score, [4, 3, 2, 1], correct) == 0.0
+    # One of six pairs swapped
+    assert score(kendall_score, [2, 1, 3, 4], correct) == pytest.approx(5 / 6)
+    # Half the items, in order
+    assert score(kendall_score, [1, 2], correct) == pytest.approx(0.5)
+    # Repeats and unknown items earn nothing extra
+    assert score(kendall_score, [1, 1, 9, 2], correct) == pytest.approx(0.5)
+
+
+def test_footrule_score():
+    correct = [1, 2, 3, 4]
+    assert score(footrule_score, [4, 3, 2, 1], correct) == 0.0
+    # Two items each one place off: displacement 2 of a maximum 8
+    assert score(footrule_score, [2, 1, 3, 4], correct) == pytest.approx(0.75)
+
+
+def test_weighted_topk_favours_the_top():
+    correct = [1, 2, 3, 4, 5]
+    top_swapped = score(weighted_topk_score, [2, 1, 3, 4, 5], correct)
+    bottom_swapped = score(weighted_topk_score, [1, 2, 3, 5, 4], correct)
+    assert top_swapped < bottom_swapped < 1.0
+    assert score(weighted_topk_score, [], correct) == 0.0
+
+
+@pytest.mark.parametrize("scoring", RANKING_SCORERS)
+def test_question_uses_its_scorer(scoring):
+    question = RankingQuestion(
+        id="q", text="Rank", feedback_correct="", feedback_incorrect="", model_answer="",
+        correct_answer=[3, 1, 2], items=["a", "b", "c"], scoring=scoring, points=4,
+    )
+    assert question.check_answer([3, 1, 2])[:2] == (True, 4)
+    expected = RANKING_SCORERS[scoring]([1, 3, 2], [3, 1, 2], question.correct_positions)
+    correct, points, _ = question.check_answer([1, 3, 2])
+    assert not correct
+    assert points == pytest.approx(expected * 4)
+
+
+def test_unknown_scoring_is_rejected():
+    with pytest.raises(ValueError, match="Unknown ranking scoring"):
+        RankingQuestion(
+            id="q", text="Rank", feedback_correct="", feedback_incorrect="", model_answer="",
+            correct_answer=[1, 2], items=["a", "b"], scoring="bogus",
+        )
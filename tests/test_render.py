@@ -0,0 +1,140 @@
+"""Tests for AnsiRenderer's differential redraw and its full-repaint fallbacks."""
+
+import pytest
+
+from cyoa.render import (
+    CURSOR_HOME,
+    ERASE_BELOW,
+    ERASE_LINE,
+    ERASE_SCREEN,
+    RESET_STYLE,
+    AnsiRenderer,
+)
+
+
+FULL = CURSOR_HOME + ERASE_SCREEN
+
+
+class CapturedRenderer(AnsiRenderer):
+    """An ANSI terminal of a fixed size whose output is kept in a list."""
+
+    def __init__(self, columns=40, rows=10, **kwargs):
+        super().__init__(**kwargs)
+        self.columns = columns
+        self.rows = rows
+        self.emitted = []
+
+    def size(self):
+        return self.columns, self.rows
+
+    def emit(self, frame):
+        self.emitted.append(frame)
+
+
+def draw(renderer, text):
+    """Clear, draw a screen and return what was sent to the terminal."""
+    renderer.clear()
+    renderer.write(text)
+    renderer.flush()
+    return renderer.emitted[-1]
+
+
+@pytest.fixture
+def screen():
+    renderer = CapturedRenderer()
+    draw(renderer, "Header\nOld question\n> ")
+    return renderer
+
+
+def test_first_frame_is_painted_in_full():
+    renderer = CapturedRenderer()
+    assert draw(renderer, "Header\n> ") == FULL + "Header\n> "
+
+
+def test_only_changed_lines_are_rewritten(screen):
+    data = draw(screen, "Header\nNew question\n> ")
+    assert data == f"\033[2;1H{RESET_STYLE}New question{ERASE_LINE}\n> {ERASE_BELOW}"
+
+
+def test_unchanged_runs_are_skipped_and_cursor_line_is_rewritten():
+    renderer = CapturedRenderer()
+    draw(renderer, "A\nB\nC\nD\n> ")
+    data = draw(renderer, "A\nX\nC\nY\n> ")
+    assert data == (
+        f"\033[2;1H{RESET_STYLE}X{ERASE_LINE}\n"
+        f"\033[4;1H{RESET_STYLE}Y{ERASE_LINE}\n> {ERASE_BELOW}"
+    )
+
+
+def test_style_open_at_line_start_is_restored():
+    renderer = CapturedRenderer()
+    draw(renderer, "\033[33mHeader\nOld\033[0m\n> ")
+    data = draw(renderer, "\033[33mHeader\nNew\033[0m\n> ")
+    assert data.startswith(f"\033[2;1H{RESET_STYLE}\033[33mNew")
+
+
+def test_shorter_screen_erases_what_is_below(screen):
+    data = draw(screen, "Header\n> ")
+    assert data == f"\033[2;1H{RESET_STYLE}> {ERASE_BELOW}"
+
+
+def test_echoed_input_is_part_of_the_screen(screen):
+    screen.echo("answer\n")
+    data = draw(screen, "Header\nOld question\n> ")
+    # The prompt line now differs from "> answer" and the echoed newline's line is gone
+    assert data == f"\033[3;1H{RESET_STYLE}> {ERASE_BELOW}"
+
+
+def test_flush_without_clear_writes_at_the_cursor(screen):
+    screen.write("more\n")
+    screen.flush()
+    assert screen.emitted[-1] == "more\n"
+
+
+def test_resize_repaints_in_full(screen):
+    screen.columns = 60
+    assert draw(screen, "Header\nNew question\n> ").startswith(FULL)
+    # The size is remembered; the next screen is differential again
+    assert not draw(screen, "Header\nOther question\n> ").startswith(FULL)
+
+
+def test_frame_longer_than_screen_repaints_next_screen(screen):
+    draw(screen, "\n".join(f"line {n}" for n in range(screen.rows + 2)))
+    assert draw(screen, "Header\n> ").startswith(FULL)
+
+
+def test_line_as_wide_as_screen_repaints_next_screen(screen):
+    draw(screen, "x" * screen.columns + "\n> ")
+    assert draw(screen, "Header\n> ").startswith(FULL)
+
+
+def test_unknown_control_codes_repaint_next_screen(screen):
+    draw(screen, "Header\n\033[2Aup\n> ")
+    assert draw(screen, "Header\n> ").startswith(FULL)
+
+
+def test_invalidate_repaints_next_screen(screen):
+    screen.invalidate()
+    assert draw(screen, "Header\nOld question\n> ").startswith(FULL)
+
+
+def test_invalidate_after_clear_repaints_that_screen(screen):
+    screen.clear()
+    screen.invalidate()
+    screen.write("Header\nOld question\n> ")
+    screen.flush()
+    assert screen.emitted[-1].startswith(FULL)
+
+
+def test_non_differential_always_repaints():
+    renderer = CapturedRenderer(differential=False)
+    draw(renderer, "Header\n> ")
+    assert draw(renderer, "Header\n> ") == FULL + "Header\n> "
+
+
+def test_colors_are_stripped_for_a_terminal_without_them():
+    renderer = CapturedRenderer(colors=False)
+    draw(renderer, "\033[33mHeader\033[0m\n> ")
+    assert renderer.emitted[-1] == FULL + "Header\n> "
+    data = draw(renderer, "\033[33mHeader\033[0m\n\033[1mNew\033[0m\n> ")
+    assert "\033[" not in data.replace("\033[2;1H", "").replace(ERASE_LINE, "").replace(ERASE_BELOW, "")
@@ -0,0 +1,125 @@
+"""Tests for the resume cursor and GameEngine.resume_point."""
+
+import pytest
+
+from cyoa.engine import GameEngine
+from cyoa.index import ContentIndex
+from cyoa.progress import ProgressManager
+from cyoa.scenarios.registry import load_all
+from cyoa.storage import create_store
+
+
+EXERCISES = load_all()
+INDEX = ContentIndex(EXERCISES)
+BACKENDS = {
+    "json": ("json", {}),
+    "journal": ("json", {"journal": True, "compact_every": 1000}),
+    "sqlite": ("sqlite", {}),
+}
+
+
+def manager_for(tmp_path, name):
+    backend, options = BACKENDS[name]
+    store = create_store(backend, str(tmp_path), learner_id="alice", **options)
+    return ProgressManager(str(tmp_path), learner_id="alice", store=store)
+
+
+def engine_for(manager):
+    return GameEngine(progress=manager, index=INDEX)
+
+
+def answer(manager, exercise, scenario_pos, question_pos):
+    scenario = exercise.scenarios[scenario_pos]
+    question = scenario.questions[question_pos]
+    manager.record_answer(exercise.id, scenario.id, question.id, "A", True, question.points)
+
+
+def reloaded(tmp_path, name):
+    manager = manager_for(tmp_path, name)
+    assert manager.load_session() is not None
+    return manager
+
+
+def test_no_cursor_without_answers(tmp_path):
+    manager = manager_for(tmp_path, "json")
+    manager.new_session()
+    assert engine_for(manager).resume_point() is None
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_cursor_survives_reload(tmp_path, name):
+    exercise = EXERCISES[1]
+    manager = manager_for(tmp_path, name)
+    manager.new_session()
+    manager.save_session()
+    answer(manager, exercise, 0, 0)
+    answer(manager, exercise, 0, 1)
+    manager.flush()
+
+    session = reloaded(tmp_path, name).session
+    scenario = exercise.scenarios[0]
+    assert session.resume == (exercise.id, scenario.id, scenario.questions[1].id)
+    point = engine_for(reloaded(tmp_path, name)).resume_point()
+    assert point == (exercise, 0, 2)
+
+
+def test_journal_replay_rebuilds_cursor(tmp_path):
+    exercise = EXERCISES[0]
+    manager = manager_for(tmp_path, "journal")
+    manager.new_session()
+    manager.save_session()
+    answer(manager, exercise, 0, 0)
+    # The snapshot predates the answer; only the journal has it
+    with open(manager.store.path) as f:
+        assert '"resume"' not in f.read()
+
+    point = engine_for(reloaded(tmp_path, "journal")).resume_point()
+    assert point == (exercise, 0, 1)
+
+
+def test_sqlite_rebuilds_cursor_from_latest_answer(tmp_path):
+    exercise = EXERCISES[2]
+    manager = manager_for(tmp_path, "sqlite")
+    manager.new_session()
+    manager.save_session()
+    answer(manager, exercise, 0, 0)
+    answer(manager, exercise, 1, 0)
+
+    # SQLite keeps no cursor; the most recent answer stands in for it
+    scenario = exercise.scenarios[1]
+    assert reloaded(tmp_path, "sqlite").session.resume == (exercise.id, scenario.id, scenario.questions[0].id)
+    assert engine_for(reloaded(tmp_path, "sqlite")).resume_point() == (exercise, 1, 1)
+
+
+def test_skips_questions_answered_out_of_order(tmp_path):
+    exercise = EXERCISES[0]
+    manager = manager_for(tmp_path, "json")
+    manager.new_session()
+    first = exercise.scenarios[0]
+    for position in range(1, len(first.questions)):
+        answer(manager, exercise, 0, position)
+    answer(manager, exercise, 0, 0)
+
+    # The rest of the first scenario is answered; resume in the next one
+    assert engine_for(manager).resume_point() == (exercise, 1, 0)
+
+
+def test_completed_exercise_has_no_resume_point(tmp_path):
+    exercise = EXERCISES[3]
+    manager = manager_for(tmp_path, "sqlite")
+    manager.new_session()
+    manager.save_session()
+    for scenario_pos, scenario in enumerate(exercise.scenarios):
+        for question_pos in range(len(scenario.questions)):
+            answer(manager, exercise, scenario_pos, question_pos)
+        manager.mark_scenario_complete(exercise.id, scenario.id)
+
+    assert engine_for(manager).resume_point() is None
+    assert engine_for(reloaded(tmp_path, "sqlite")).resume_point() is None
+
+
+def test_cursor_into_changed_content_is_ignored(tmp_path):
+    manager = manager_for(tmp_path, "json")
+    manager.new_session()
+    manager.record_answer(EXERCISES[0].id, "gone", "gone_q1", "A", True, 1)
+    assert engine_for(manager).resume_point() is None
@@ -0,0 +1,134 @@
+"""Tests for the server: off-loop progress writes and remote terminals."""
+
+import asyncio
+import os
+import threading
+
+from cyoa import ui
+from cyoa.progress import ProgressManager
+from cyoa.server import DO, IAC, NAWS, SB, SE, WILL, DeferredStore, RemoteIO, _TelnetParser
+from cyoa.storage import JsonFileStore
+
+
+class RecordingStore(JsonFileStore):
+    """A JSON store that notes which thread performed each write."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.write_threads = []
+
+    def write_changes(self, session_id, changes, snapshot):
+        self.write_threads.append(threading.get_ident())
+        super().write_changes(session_id, changes, snapshot)
+
+
+def test_writes_wait_for_drain_and_run_off_the_loop(tmp_path):
+    inner = RecordingStore(str(tmp_path), learner_id="alice", journal=True)
+    manager = ProgressManager(str(tmp_path), store=DeferredStore(inner))
+    manager.new_session()
+
+    async def session():
+        manager.record_answer("ex1", "ex1_sc1", "q1", "A", True, 1)
+        manager.record_answer("ex1", "ex1_sc1", "q2", "B", False, 0)
+        assert inner.write_threads == []
+        assert manager.store.pending == 2
+        await manager.store.drain()
+
+    asyncio.run(session())
+    assert len(inner.write_threads) == 2
+    assert threading.get_ident() not in inner.write_threads
+
+    reloaded = ProgressManager(str(tmp_path), learner_id="alice")
+    assert reloaded.load_session().answered_count == 2
+
+
+def test_reads_perform_queued_writes_first(tmp_path):
+    inner = JsonFileStore(str(tmp_path))
+    store = DeferredStore(inner)
+    store.save({"session_id": "s", "exercises": {}})
+    assert not os.path.exists(inner.path)
+
+    assert store.load()["session_id"] == "s"
+    assert store.pending == 0
+
+
+def test_warnings_reach_the_session_screen(tmp_path, capsys):
+    inner = JsonFileStore(str(tmp_path))
+    inner.save({"session_id": "s", "exercises": {}})
+    inner.save({"session_id": "s", "exercises": {}})
+    with open(inner.path, "w") as f:
+        f.write("{torn")
+
+    manager = ProgressManager(str(tmp_path), store=DeferredStore(inner), warn=ui.warn)
+    with ui.capture() as screen:
+        assert manager.load_session() is not None
+
+    assert "Progress file is corrupt" in screen.getvalue()
+    assert capsys.readouterr().out == ""
+
+
+class FakeWriter:
+    """Collects what a session sends to its client."""
+
+    def __init__(self):
+        self.sent = bytearray()
+
+    def write(self, data):
+        self.sent += data
+
+    async def drain(self):
+        pass
+
+
+def naws(columns, rows):
+    return bytes([IAC, SB, NAWS, columns >> 8, columns & 0xff, rows >> 8, rows & 0xff, IAC, SE])
+
+
+def test_telnet_parser_drops_commands_and_reads_window_size():
+    parser = _TelnetParser()
+    stream = bytes([IAC, WILL, NAWS]) + b"ab" + naws(132, 43) + b"c" + bytes([IAC, IAC]) + b"\r\n"
+    # Byte by byte, so every command is split across reads
+    data = b"".join(parser.feed(stream[i:i + 1]) for i in range(len(stream)))
+    assert data == b"abc\xff\r\n"
+    assert parser.size == (132, 43)
+
+    parser.feed(naws(0, 0))
+    assert parser.size == (132, 43)
+
+
+def remote_session(*chunks):
+    reader = asyncio.StreamReader()
+    for chunk in chunks:
+        reader.feed_data(chunk)
+    reader.feed_eof()
+    return RemoteIO(reader, FakeWriter())
+
+
+def test_session_lays_out_for_the_client_width():
+    text = "word " * 40
+
+    async def session():
+        io = remote_session(naws(40, 20) + b"alice\r\n")
+        ui.current_io.set(io)
+        assert ui.get_terminal_width() == 80
+        io.request_window_size()
+        assert await io.readline("Learner ID: ") == "alice"
+        assert io.width == ui.get_terminal_width() == 40
+        return io.writer.sent, ui.wrap_text(text)
+
+    sent, wrapped = asyncio.run(session())
+    assert sent.startswith(bytes([IAC, DO, NAWS]))
+    assert max(len(line) for line in wrapped.splitlines()) <= 36
+
+
+def test_session_gets_colors_whatever_the_server_terminal(monkeypatch):
+    monkeypatch.setattr(ui.Colors, "ENABLED", False)
+
+    async def session():
+        io = remote_session(b"x\n")
+        ui.current_io.set(io)
+        ui.warn("careful")
+        await io.flush()
+        return io.writer.sent
+
+    assert b"\033[33mcareful" in asyncio.run(session())
@@ -0,0 +1,151 @@
+"""Tests for the JSON progress store: journal replay and crash recovery."""
+
+import json
+import os
+
+import pytest
+
+from cyoa.progress import ProgressManager
+from cyoa.storage import JsonFileStore, StoreError
+
+
+def answer(manager, n):
+    manager.record_answer("ex1", "ex1_sc1", f"q{n}", "A", True, 1)
+
+
+def reload(data_dir):
+    manager = ProgressManager(data_dir, journal=True)
+    assert manager.load_session() is not None
+    return manager
+
+
+@pytest.fixture
+def journaled(tmp_path):
+    manager = ProgressManager(str(tmp_path), journal=True, compact_every=1000)
+    manager.new_session()
+    manager.save_session()
+    return manager
+
+
+def test_journal_replays_over_snapshot(journaled, tmp_path):
+    for n in range(5):
+        answer(journaled, n)
+    assert os.path.exists(journaled.store.journal_path)
+
+    session = reload(str(tmp_path)).session
+    assert session.answered_count == 5
+    assert session.resume == ("ex1", "ex1_sc1", "q4")
+
+
+def test_torn_tail_then_append_then_reload(journaled, tmp_path):
+    for n in range(3):
+        answer(journaled, n)
+    # A crash in the middle of an append
+    with open(journaled.store.journal_path, "a") as f:
+        f.write('{"op":"answer","ex":"ex1","sc":"ex1_sc1","q":"q')
+
+    manager = reload(str(tmp_path))
+    assert manager.session.answered_count == 3
+    for n in range(3, 6):
+        answer(manager, n)
+
+    assert reload(str(tmp_path)).session.answered_count == 6
+
+
+def test_complete_record_without_newline_is_discarded(journaled, tmp_path):
+    answer(journaled, 0)
+    with open(journaled.store.journal_path, "a") as f:
+        f.write(json.dumps({"op": "answer"}))
+
+    manager = reload(str(tmp_path))
+    answer(manager, 1)
+    assert reload(str(tmp_path)).session.answered_count == 2
+
+
+def test_read_only_load_leaves_torn_tail_in_place(journaled, tmp_path):
+    for n in range(2):
+        answer(journaled, n)
+    # An append still in flight in another process
+    with open(journaled.store.journal_path, "a") as f:
+        f.write('{"op":"answer","ex":"ex1"')
+    with open(journaled.store.journal_path, "rb") as f:
+        before = f.read()
+
+    store = JsonFileStore(str(tmp_path), read_only=True)
+    data = store.load()
+
+    assert sum(len(sc["questions"]) for sc in data["exercises"]["ex1"]["scenarios"].values()) == 2
+    with open(journaled.store.journal_path, "rb") as f:
+        assert f.read() == before
+    with pytest.raises(StoreError):
+        store.save(data)
+
+
+def test_save_keeps_previous_generation(tmp_path):
+    store = JsonFileStore(str(tmp_path))
+    store.save({"session_id": "a", "exercises": {}})
+    store.save({"session_id": "b", "exercises": {}})
+
+    with open(store.path) as f:
+        assert json.load(f)["session_id"] == "b"
+    with open(store.backup_path) as f:
+        assert json.load(f)["session_id"] == "a"
+
+
+def test_crash_before_rename_leaves_snapshot_in_place(tmp_path, monkeypatch):
+    store = JsonFileStore(str(tmp_path))
+    store.save({"session_id": "a", "exercises": {}})
+
+    real_replace = os.replace
+
+    def crash_on_snapshot(src, dst):
+        if dst == store.path:
+            raise OSError("simulated crash")
+        real_replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", crash_on_snapshot)
+    with pytest.raises(OSError):
+        store.save({"session_id": "b", "exercises": {}})
+    monkeypatch.undo()
+
+    assert os.path.exists(store.path)
+    assert store.load()["session_id"] == "a"
+
+
+def test_corrupt_snapshot_falls_back_to_backup(tmp_path):
+    store = JsonFileStore(str(tmp_path))
+    store.save({"session_id": "a", "exercises": {}})
+    store.save({"session_id": "b", "exercises": {}})
+    with open(store.path, "w") as f:
+        f.write("{not json")
+
+    assert store.load()["session_id"] == "a"
+
+
+def test_journal_is_compacted_into_snapshot(tmp_path):
+    manager = ProgressManager(str(tmp_path), journal=True, compact_every=4)
+    manager.new_session()
+    manager.save_session()
+    for n in range(4):
+        answer(manager, n)
+
+    assert not os.path.exists(manager.store.journal_path)
+    with open(manager.store.path) as f:
+        questions = json.load(f)["exercises"]["ex1"]["scenarios"]["ex1_sc1"]["questions"]
+    assert sorted(questions) == ["q0", "q1", "q2", "q3"]
+
+    answer(manager, 4)
+    assert reload(str(tmp_path)).session.answered_count == 5
+
+
+def test_records_from_another_session_are_ignored(journaled, tmp_path):
+    answer(journaled, 0)
+    with open(journaled.store.journal_path, "a") as f:
+        f.write(json.dumps({
+            "op": "answer", "ex": "ex1", "sc": "ex1_sc1", "q": "stale", "ans": "A",
+            "ok": True, "s": 1, "n": 1, "t": "2000-01-01T00:00:00", "sid": "old-session",
+        }) + "\n")
+
+    session = reload(str(tmp_path)).session
+    assert session.answered_count == 1
+    assert "stale" not in session.exercises["ex1"].scenarios["ex1_sc1"].questions
@@ -0,0 +1,114 @@
+"""Tests that the JSON and SQLite stores keep the same progress."""
+
+import random
+
+import pytest
+
+from cyoa.progress import ProgressManager
+from cyoa.scenarios.registry import load_all
+from cyoa.storage import create_store
+
+
+BACKENDS = {
+    "json": {},
+    "journal": {"journal": True, "compact_every": 5},
+    "sqlite": {},
+}
+
+
+def manager_for(tmp_path, name, learner="alice"):
+    backend = "sqlite" if name == "sqlite" else "json"
+    data_dir = str(tmp_path / name)
+    store = create_store(backend, data_dir, learner_id=learner, **BACKENDS[name])
+    return ProgressManager(data_dir, learner_id=learner, store=store)
+
+
+def play(managers, seed):
+    """Apply the same answers and completions to every manager."""
+    rng = random.Random(seed)
+    questions = [
+        (e.id, s.id, q) for e in load_all() for s in e.scenarios for q in s.questions
+    ]
+    for manager in managers:
+        manager.new_session()
+        manager.save_session()
+    for _ in range(80):
+        ex_id, sc_id, question = rng.choice(questions)
+        if rng.random() < 0.1:
+            for manager in managers:
+                manager.mark_scenario_complete(ex_id, sc_id)
+            continue
+        answer = rng.choice([
+            "B", ["A", "C"], [3, 1, 2], "free text answer", None,
+        ])
+        correct = rng.random() < 0.5
+        score = rng.choice([0, 0.5, 1, question.points])
+        for manager in managers:
+            manager.record_answer(ex_id, sc_id, question.id, answer, correct, score)
+    for manager in managers:
+        manager.flush()
+
+
+def normalized(session):
+    """Progress content, without ids and timestamps that differ per store."""
+    return {
+        ex_id: {
+            "started": ex.started,
+            "completed": ex.completed,
+            "scenarios": {
+                sc_id: {
+                    "started": sc.started,
+                    "completed": sc.completed,
+                    "questions": {
+                        q_id: (q.answered, q.correct, q.score, q.attempts, q.user_answer)
+                        for q_id, q in sc.questions.items()
+                    },
+                }
+                for sc_id, sc in ex.scenarios.items()
+            },
+        }
+        for ex_id, ex in session.exercises.items()
+    }
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_stores_reload_the_same_progress(tmp_path, seed):
+    live = [manager_for(tmp_path, name) for name in BACKENDS]
+    play(live, seed)
+
+    reloaded = [manager_for(tmp_path, name).load_session() for name in BACKENDS]
+    expected = normalized(live[0].session)
+    for name, session in zip(BACKENDS, reloaded):
+        assert normalized(session) == expected, name
+        assert session.answered_count == live[0].session.answered_count
+        assert session.total_score == pytest.approx(live[0].session.total_score)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_stores_report_the_same_summary(tmp_path, seed):
+    live = [manager_for(tmp_path, name) for name in BACKENDS]
+    play(live, seed)
+
+    summaries = [manager_for(tmp_path, name) for name in BACKENDS]
+    for manager in summaries:
+        manager.load_session()
+    expected = summaries[0].get_summary()
+    for name, manager in zip(BACKENDS, summaries):
+        summary = manager.get_summary()
+        assert summary.keys() == expected.keys(), name
+        assert summary["total_score"] == pytest.approx(expected["total_score"]), name
+        assert summary["completion_pct"] == pytest.approx(expected["completion_pct"]), name
+        assert summary["exercises"].keys() == expected["exercises"].keys(), name
+        for ex_id, ex in expected["exercises"].items():
+            assert summary["exercises"][ex_id] == pytest.approx(ex), (name, ex_id)
+
+
+def test_learners_are_kept_apart(tmp_path):
+    for name in ("json", "sqlite"):
+        alice, bob = manager_for(tmp_path, name, "alice"), manager_for(tmp_path, name, "bob")
+        for manager in (alice, bob):
+            manager.new_session()
+            manager.save_session()
+        alice.record_answer("exercise1", "1a", "1a_q1", "A", True, 1)
+        assert manager_for(tmp_path, name, "bob").load_session().answered_count == 0
+        assert manager_for(tmp_path, name, "alice").load_session().answered_count == 1
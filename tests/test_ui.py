@@ -0,0 +1,40 @@
+"""Tests for the terminal width cache and its SIGWINCH handler."""
+
+import signal
+
+import pytest
+
+from cyoa import ui
+
+
+pytestmark = pytest.mark.skipif(not hasattr(signal, "SIGWINCH"), reason="no SIGWINCH")
+
+
+@pytest.fixture
+def host_handler(monkeypatch):
+    """A SIGWINCH handler owned by the host program; restored afterwards."""
+    calls = []
+    original = signal.signal(signal.SIGWINCH, lambda signum, frame: calls.append(signum))
+    monkeypatch.setattr(ui, "_terminal_width", None)
+    monkeypatch.setattr(ui, "_resize_handler_installed", False)
+    monkeypatch.setattr(ui, "_previous_resize_handler", None)
+    yield calls
+    signal.signal(signal.SIGWINCH, original)
+
+
+def test_width_lookup_leaves_signal_handlers_alone(host_handler):
+    handler = signal.getsignal(signal.SIGWINCH)
+    ui.get_terminal_width()
+    assert signal.getsignal(signal.SIGWINCH) is handler
+    assert ui._terminal_width is None
+
+
+def test_installed_handler_chains_to_previous(host_handler):
+    assert ui.install_resize_handler()
+    ui.get_terminal_width()
+    assert ui._terminal_width is not None
+
+    ui._on_resize(signal.SIGWINCH, None)
+
+    assert ui._terminal_width is None
+    assert host_handler == [signal.SIGWINCH]